@@ -0,0 +1,135 @@
+"""initial schema
+
+Revision ID: 0001_initial_schema
+Revises: 
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('role', sa.Enum('ADMIN', 'AGENT', 'OWNER', 'TENANT', name='userrole'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'properties',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('type', sa.Enum('APARTMENT', 'HOUSE', 'OFFICE', 'COMMERCIAL', name='propertytype'), nullable=False),
+        sa.Column('status', sa.Enum('AVAILABLE', 'RENTED', 'SOLD', 'MAINTENANCE', name='propertystatus'), nullable=True),
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('city', sa.String(), nullable=False),
+        sa.Column('postal_code', sa.String(), nullable=False),
+        sa.Column('country', sa.String(), nullable=False),
+        sa.Column('surface_area', sa.Float(), nullable=False),
+        sa.Column('number_of_rooms', sa.Integer(), nullable=True),
+        sa.Column('number_of_bathrooms', sa.Integer(), nullable=True),
+        sa.Column('floor', sa.Integer(), nullable=True),
+        sa.Column('has_parking', sa.Boolean(), nullable=True),
+        sa.Column('has_elevator', sa.Boolean(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('deposit', sa.Float(), nullable=True),
+        sa.Column('monthly_charges', sa.Float(), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_properties_id', 'properties', ['id'])
+
+    op.create_table(
+        'contracts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.Enum('RENTAL', 'SALE', name='contracttype'), nullable=False),
+        sa.Column('status', sa.Enum('ACTIVE', 'EXPIRED', 'TERMINATED', 'PENDING', name='contractstatus'), nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=True),
+        sa.Column('rent_amount', sa.Float(), nullable=True),
+        sa.Column('deposit_amount', sa.Float(), nullable=True),
+        sa.Column('payment_day', sa.Integer(), nullable=True),
+        sa.Column('terms', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.ForeignKeyConstraint(['tenant_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_contracts_id', 'contracts', ['id'])
+
+    op.create_table(
+        'payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('type', sa.Enum('RENT', 'DEPOSIT', 'CHARGES', 'MAINTENANCE', 'OTHER', name='paymenttype'), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'PAID', 'OVERDUE', 'CANCELLED', name='paymentstatus'), nullable=True),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('paid_date', sa.Date(), nullable=True),
+        sa.Column('reference', sa.String(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('contract_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['contract_id'], ['contracts.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_payments_id', 'payments', ['id'])
+
+    op.create_table(
+        'maintenance_requests',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('type', sa.Enum('REPAIR', 'RENOVATION', 'INSPECTION', 'EMERGENCY', 'OTHER', name='maintenancetype'), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='maintenancestatus'), nullable=True),
+        sa.Column('request_date', sa.Date(), nullable=False),
+        sa.Column('completion_date', sa.Date(), nullable=True),
+        sa.Column('cost', sa.Float(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('requested_by_id', sa.Integer(), nullable=False),
+        sa.Column('assigned_to_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id']),
+        sa.ForeignKeyConstraint(['requested_by_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['assigned_to_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_maintenance_requests_id', 'maintenance_requests', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_maintenance_requests_id', table_name='maintenance_requests')
+    op.drop_table('maintenance_requests')
+    op.drop_index('ix_payments_id', table_name='payments')
+    op.drop_table('payments')
+    op.drop_index('ix_contracts_id', table_name='contracts')
+    op.drop_table('contracts')
+    op.drop_index('ix_properties_id', table_name='properties')
+    op.drop_table('properties')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
+    for enum_name in (
+        'maintenancestatus', 'maintenancetype', 'paymentstatus', 'paymenttype',
+        'contractstatus', 'contracttype', 'propertystatus', 'propertytype', 'userrole',
+    ):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
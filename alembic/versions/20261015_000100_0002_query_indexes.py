@@ -0,0 +1,60 @@
+"""composite indexes for service query patterns
+
+Revision ID: 0002_query_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-15 00:01:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_query_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+PENDING_ONLY = sa.text("status = 'PENDING'")
+
+# (nom, table, colonnes, options)
+INDEXES = [
+    ('ix_properties_owner_id_status_type', 'properties', ['owner_id', 'status', 'type'], {}),
+    ('ix_contracts_tenant_id_status', 'contracts', ['tenant_id', 'status'], {}),
+    ('ix_contracts_property_id_status', 'contracts', ['property_id', 'status'], {}),
+    ('ix_payments_contract_id', 'payments', ['contract_id'], {}),
+    ('ix_payments_status_due_date', 'payments', ['status', 'due_date'], {}),
+    ('ix_payments_pending_due_date', 'payments', ['due_date'],
+     {'postgresql_where': PENDING_ONLY, 'sqlite_where': PENDING_ONLY}),
+    ('ix_maintenance_requests_property_id', 'maintenance_requests', ['property_id'], {}),
+    ('ix_maintenance_requests_status_created_at', 'maintenance_requests', ['status', 'created_at'], {}),
+    ('ix_maintenance_requests_status_priority', 'maintenance_requests', ['status', 'priority'], {}),
+    ('ix_maintenance_requests_status_type', 'maintenance_requests', ['status', 'type'], {}),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('maintenance_requests') as batch_op:
+        batch_op.add_column(
+            sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+        )
+
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY ne bloque pas les écritures sur les tables volumineuses
+        with op.get_context().autocommit_block():
+            for name, table, columns, options in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, **options)
+    else:
+        for name, table, columns, options in INDEXES:
+            op.create_index(name, table, columns, **options)
+
+
+def downgrade() -> None:
+    for name, table, _columns, _options in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table('maintenance_requests') as batch_op:
+        batch_op.drop_column('created_at')
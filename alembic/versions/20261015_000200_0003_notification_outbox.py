@@ -0,0 +1,48 @@
+"""notification outbox
+
+Revision ID: 0003_notification_outbox
+Revises: 0002_query_indexes
+Create Date: 2026-10-15 00:02:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_notification_outbox'
+down_revision = '0002_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('channel', sa.Enum('EMAIL', 'SMS', name='notificationchannel'), nullable=False),
+        sa.Column('recipient', sa.String(), nullable=False),
+        sa.Column('subject', sa.String(), nullable=True),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('idempotency_key', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'SENT', 'DEAD', name='outboxstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+    )
+    op.create_index('ix_notification_outbox_id', 'notification_outbox', ['id'])
+    op.create_index(
+        'ix_notification_outbox_status_next_attempt_at', 'notification_outbox', ['status', 'next_attempt_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_outbox_status_next_attempt_at', table_name='notification_outbox')
+    op.drop_index('ix_notification_outbox_id', table_name='notification_outbox')
+    op.drop_table('notification_outbox')
+    for enum_name in ('outboxstatus', 'notificationchannel'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
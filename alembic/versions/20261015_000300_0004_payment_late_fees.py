@@ -0,0 +1,38 @@
+"""payment late fees
+
+Revision ID: 0004_payment_late_fees
+Revises: 0003_notification_outbox
+Create Date: 2026-10-15 00:03:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_payment_late_fees'
+down_revision = '0003_notification_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # ALTER TYPE ... ADD VALUE ne peut pas s'exécuter dans une transaction avant PostgreSQL 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE paymenttype ADD VALUE IF NOT EXISTS 'LATE_FEE'")
+
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.add_column(sa.Column('late_fee_for_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_payments_late_fee_for_id_payments', 'payments', ['late_fee_for_id'], ['id']
+        )
+        batch_op.create_index('ix_payments_late_fee_for_id', ['late_fee_for_id'], unique=True)
+
+
+def downgrade() -> None:
+    # PostgreSQL ne permet pas de retirer une valeur d'enum : LATE_FEE est conservée
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.drop_index('ix_payments_late_fee_for_id')
+        batch_op.drop_constraint('fk_payments_late_fee_for_id_payments', type_='foreignkey')
+        batch_op.drop_column('late_fee_for_id')
@@ -0,0 +1,28 @@
+"""outbox sending status
+
+Revision ID: 0005_outbox_sending_status
+Revises: 0004_payment_late_fees
+Create Date: 2026-10-16 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_outbox_sending_status'
+down_revision = '0004_payment_late_fees'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # ALTER TYPE ... ADD VALUE ne peut pas s'exécuter dans une transaction avant PostgreSQL 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE outboxstatus ADD VALUE IF NOT EXISTS 'SENDING'")
+
+
+def downgrade() -> None:
+    # PostgreSQL ne permet pas de retirer une valeur d'enum : SENDING est conservée ;
+    # les notifications réservées repassent en attente
+    op.execute("UPDATE notification_outbox SET status = 'PENDING' WHERE status = 'SENDING'")
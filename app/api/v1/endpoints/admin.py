@@ -0,0 +1,48 @@
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.profiling import profile_store
+from app.services.auth import AuthService
+from app.models.user import UserRole
+from app.schemas.user import Principal
+
+router = APIRouter()
+
+def require_admin(
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+) -> Principal:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+async def list_profiles(current_user: Principal = Depends(require_admin)):
+    """Liste les routes profilées et leur nombre d'échantillons."""
+    return await run_in_threadpool(profile_store.summary)
+
+@router.get("/profiles/download", response_class=PlainTextResponse)
+async def download_profiles(
+    route: Optional[str] = None,
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Télécharge les profils agrégés de tous les workers au format « folded »
+    (flamegraph.pl, speedscope), pour une route (ex. "GET /api/v1/properties/")
+    ou pour toutes.
+    """
+    profile = await run_in_threadpool(profile_store.load, route)
+    if route and not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    filename = f"{profile_store.slug(route) if route else 'profiles'}.folded"
+    return PlainTextResponse(
+        "".join(f"{stack} {count}\n" for stack, count in profile.most_common()),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,21 +1,23 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.services.auth import AuthService
-from app.schemas.user import User, UserCreate, UserUpdate, UserWithToken
+from app.schemas.user import Principal, User, UserCreate, UserUpdate, UserWithToken
 
 router = APIRouter()
 
 @router.post("/token", response_model=UserWithToken)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = AuthService.authenticate_user(form_data.username, form_data.password, db)
+    user = await AuthService.authenticate_user_async(
+        db, email=form_data.username, password=form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,7 +26,7 @@ async def login_for_access_token(
         )
     
     access_token = AuthService.create_access_token(
-        data={"sub": user.id},
+        data={"sub": str(user.id)},
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     
@@ -37,20 +39,20 @@ async def login_for_access_token(
 @router.post("/register", response_model=User)
 async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return AuthService.create_user(user_data, db)
+    return await AuthService.create_user_async(db, user_data=user_data)
 
 @router.get("/me", response_model=User)
 async def read_users_me(
-    current_user: User = Depends(AuthService.get_current_user)
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     return current_user
 
 @router.put("/me", response_model=User)
 async def update_user_me(
     user_data: UserUpdate,
-    current_user: User = Depends(AuthService.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(AuthService.get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return AuthService.update_user(current_user.id, user_data, db) 
\ No newline at end of file
+    return await AuthService.update_user_async(db, user_id=current_user.id, user_data=user_data) 
\ No newline at end of file
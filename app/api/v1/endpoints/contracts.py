@@ -1,17 +1,33 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.services.auth import AuthService
-from app.services.contract import ContractService
+from app.core.database import get_async_db
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import Includes, Relation, batch_response, item_response, page_response
+from app.services.auth import USER_SUMMARY_ROWS, AuthService
+from app.services.bulk_import import BulkImportService, import_format, spool_upload
+from app.services.contract import CONTRACT_ROWS, ContractService
+from app.services.payment import PAYMENT_ROWS
+from app.services.property import PROPERTY_ROWS
+from app.services.scoping import AccessScope
 from app.schemas.contract import Contract, ContractCreate, ContractUpdate
-from app.models.user import User, UserRole
+from app.models.user import UserRole
+from app.schemas.user import Principal
+from app.schemas.batch import BatchRequest, BatchResult
+from app.schemas.bulk_import import ImportReport
 from app.models.contract import ContractStatus
 
 router = APIRouter()
 contract_service = ContractService()
 
+# Ressources liées disponibles pour `include=`
+CONTRACT_RELATIONS = {
+    "property": Relation(PROPERTY_ROWS, "property_id"),
+    "tenant": Relation(USER_SUMMARY_ROWS, "tenant_id"),
+    "payments": Relation(PAYMENT_ROWS, "id", remote="contract_id", many=True),
+}
+
 @router.get("/", response_model=List[Contract])
 async def read_contracts(
     skip: int = 0,
@@ -19,27 +35,37 @@ async def read_contracts(
     property_id: Optional[int] = None,
     tenant_id: Optional[int] = None,
     status: Optional[ContractStatus] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    # Filter by tenant_id if user is a tenant
-    if current_user.role == UserRole.TENANT:
-        tenant_id = current_user.id
-    
-    return contract_service.get_contracts(
-        db=db,
+    includes = Includes(CONTRACT_RELATIONS, include)
+    rows = CONTRACT_ROWS.select(fields, extra=includes.keys)
+    page = await contract_service.get_contracts_page_async(
+        db,
         skip=skip,
         limit=limit,
         property_id=property_id,
         tenant_id=tenant_id,
-        status=status
+        status=status,
+        scope=AccessScope.of(current_user),
+        cursor=cursor,
+        sort=sort,
+        include_total=include_total,
+        columns=rows.columns
     )
+    await includes.load_async(db, page.items, AccessScope.of(current_user))
+    return page_response(page, rows, includes)
 
 @router.post("/", response_model=Contract, status_code=status.HTTP_201_CREATED)
 async def create_contract(
     contract_data: ContractCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can create contracts
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -47,15 +73,66 @@ async def create_contract(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return contract_service.create_contract(contract_data, db)
+    return await contract_service.create_contract_async(db, contract_data=contract_data)
+
+@router.post("/import", response_model=ImportReport)
+async def import_contracts(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    # Only admin and agent can import contracts
+    if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    format = import_format(request.headers.get("content-type"))
+    with await spool_upload(request.stream()) as source:
+        return await BulkImportService.import_contracts_async(db, source=source, format=format)
+
+@router.get("/export")
+async def export_contracts(
+    format: ExportFormat = ExportFormat.CSV,
+    property_id: Optional[int] = None,
+    tenant_id: Optional[int] = None,
+    status: Optional[ContractStatus] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    chunks = contract_service.export_contracts(
+        db, format, fields=CONTRACT_ROWS.select(fields).fields,
+        property_id=property_id, tenant_id=tenant_id, status=status,
+        scope=AccessScope.of(current_user)
+    )
+    return export_response(chunks, format, "contracts")
+
+@router.post("/batch", response_model=BatchResult[Contract])
+async def read_contracts_batch(
+    batch_data: BatchRequest,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    includes = Includes(CONTRACT_RELATIONS, include)
+    rows = CONTRACT_ROWS.select(fields, extra=includes.keys)
+    batch = await AccessScope.of(current_user).fetch_async(db, rows=rows, ids=batch_data.ids)
+    await includes.load_async(db, batch.rows, AccessScope.of(current_user))
+    return batch_response(batch, rows, includes)
 
 @router.get("/{contract_id}", response_model=Contract)
 async def read_contract(
     contract_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    contract = contract_service.get_contract(contract_id, db)
+    includes = Includes(CONTRACT_RELATIONS, include)
+    rows = CONTRACT_ROWS.select(fields, extra=("tenant_id",) + includes.keys)
+    contract = await contract_service.get_contract_async(db, contract_id=contract_id, columns=rows.columns)
     
     # Check if user has access to this contract
     if current_user.role == UserRole.TENANT and contract.tenant_id != current_user.id:
@@ -64,14 +141,15 @@ async def read_contract(
             detail="Not enough permissions"
         )
     
-    return contract
+    await includes.load_async(db, [contract], AccessScope.of(current_user))
+    return item_response(contract, rows, includes)
 
 @router.put("/{contract_id}", response_model=Contract)
 async def update_contract(
     contract_id: int,
     contract_data: ContractUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can update contracts
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -79,7 +157,9 @@ async def update_contract(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    updated_contract = contract_service.update_contract(db, contract_id, contract_data)
+    updated_contract = await contract_service.update_contract_async(
+        db, contract_id=contract_id, contract_data=contract_data
+    )
     if not updated_contract:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,8 +170,8 @@ async def update_contract(
 @router.post("/{contract_id}/terminate", response_model=Contract)
 async def terminate_contract(
     contract_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can terminate contracts
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -99,12 +179,12 @@ async def terminate_contract(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return contract_service.terminate_contract(contract_id, db)
+    return await contract_service.terminate_contract_async(db, contract_id=contract_id)
 
 @router.get("/expiring", response_model=List[Contract])
 async def get_expiring_contracts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can view expiring contracts
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -112,4 +192,4 @@ async def get_expiring_contracts(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return contract_service.check_contract_expiration(db) 
\ No newline at end of file
+    return await contract_service.check_contract_expiration_async(db) 
\ No newline at end of file
@@ -1,21 +1,34 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.services.auth import AuthService
-from app.services.maintenance import MaintenanceService
+from app.core.database import get_async_db
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import Includes, Relation, batch_response, item_response, page_response
+from app.services.auth import USER_SUMMARY_ROWS, AuthService
+from app.services.maintenance import MAINTENANCE_ROWS, MaintenanceService
+from app.services.property import PROPERTY_ROWS
+from app.services.scoping import AccessScope
 from app.schemas.maintenance import (
     MaintenanceRequest,
     MaintenanceRequestCreate,
     MaintenanceRequestUpdate
 )
-from app.models.user import User, UserRole
+from app.models.user import UserRole
+from app.schemas.user import Principal
+from app.schemas.batch import BatchRequest, BatchResult
 from app.models.maintenance import MaintenanceStatus
 
 router = APIRouter()
 maintenance_service = MaintenanceService()
 
+# Ressources liées disponibles pour `include=`
+MAINTENANCE_RELATIONS = {
+    "property": Relation(PROPERTY_ROWS, "property_id"),
+    "requested_by": Relation(USER_SUMMARY_ROWS, "requested_by_id"),
+    "assigned_to": Relation(USER_SUMMARY_ROWS, "assigned_to_id"),
+}
+
 @router.get("/", response_model=List[MaintenanceRequest])
 async def read_maintenance_requests(
     skip: int = 0,
@@ -24,71 +37,109 @@ async def read_maintenance_requests(
     status: Optional[MaintenanceStatus] = None,
     type: Optional[str] = None,
     priority: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    # If user is a tenant, only show their requests
-    if current_user.role == UserRole.TENANT:
-        # Get all properties for this tenant
-        tenant_properties = [c.property_id for c in current_user.tenant_contracts]
-        if not tenant_properties:
-            return []
-        return maintenance_service.get_maintenance_requests(
-            db=db,
-            skip=skip,
-            limit=limit,
-            property_id=property_id if property_id in tenant_properties else None,
-            status=status,
-            type=type,
-            priority=priority
-        )
-    
-    return maintenance_service.get_maintenance_requests(
-        db=db,
+    includes = Includes(MAINTENANCE_RELATIONS, include)
+    rows = MAINTENANCE_ROWS.select(fields, extra=includes.keys)
+    page = await maintenance_service.get_maintenance_requests_page_async(
+        db,
         skip=skip,
         limit=limit,
         property_id=property_id,
         status=status,
         type=type,
-        priority=priority
+        priority=priority,
+        scope=AccessScope.of(current_user),
+        cursor=cursor,
+        sort=sort,
+        include_total=include_total,
+        columns=rows.columns
     )
+    await includes.load_async(db, page.items, AccessScope.of(current_user))
+    return page_response(page, rows, includes)
 
 @router.post("/", response_model=MaintenanceRequest, status_code=status.HTTP_201_CREATED)
 async def create_maintenance_request(
     request_data: MaintenanceRequestCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Set the requester to the current user if not specified
     if not request_data.requested_by_id:
         request_data.requested_by_id = current_user.id
     
-    return maintenance_service.create_maintenance_request(request_data, db)
+    return await maintenance_service.create_maintenance_request_async(db, request_data=request_data)
+
+@router.get("/export")
+async def export_maintenance_requests(
+    format: ExportFormat = ExportFormat.CSV,
+    property_id: Optional[int] = None,
+    status: Optional[MaintenanceStatus] = None,
+    type: Optional[str] = None,
+    priority: Optional[int] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    chunks = maintenance_service.export_maintenance_requests(
+        db, format, fields=MAINTENANCE_ROWS.select(fields).fields,
+        property_id=property_id, status=status, type=type,
+        priority=priority, scope=AccessScope.of(current_user)
+    )
+    return export_response(chunks, format, "maintenance_requests")
+
+@router.post("/batch", response_model=BatchResult[MaintenanceRequest])
+async def read_maintenance_requests_batch(
+    batch_data: BatchRequest,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    includes = Includes(MAINTENANCE_RELATIONS, include)
+    rows = MAINTENANCE_ROWS.select(fields, extra=includes.keys)
+    batch = await AccessScope.of(current_user).fetch_async(db, rows=rows, ids=batch_data.ids)
+    await includes.load_async(db, batch.rows, AccessScope.of(current_user))
+    return batch_response(batch, rows, includes)
 
 @router.get("/{request_id}", response_model=MaintenanceRequest)
 async def read_maintenance_request(
     request_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    request = maintenance_service.get_maintenance_request(request_id, db)
+    includes = Includes(MAINTENANCE_RELATIONS, include)
+    rows = MAINTENANCE_ROWS.select(fields, extra=("property_id",) + includes.keys)
+    request = await maintenance_service.get_maintenance_request_async(
+        db, request_id=request_id, columns=rows.columns
+    )
     
     # Check if user has access to this request
     if current_user.role == UserRole.TENANT:
-        if request.property_id not in [c.property_id for c in current_user.tenant_contracts]:
+        tenant_properties = current_user.tenant_property_ids
+        if request.property_id not in tenant_properties:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
             )
     
-    return request
+    await includes.load_async(db, [request], AccessScope.of(current_user))
+    return item_response(request, rows, includes)
 
 @router.put("/{request_id}", response_model=MaintenanceRequest)
 async def update_maintenance_request(
     request_id: int,
     request_data: MaintenanceRequestUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can update maintenance requests
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -96,7 +147,9 @@ async def update_maintenance_request(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    updated_request = maintenance_service.update_maintenance_request(request_id, request_data, db)
+    updated_request = await maintenance_service.update_maintenance_request_async(
+        db, request_id=request_id, request_data=request_data
+    )
     if not updated_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,8 +161,8 @@ async def update_maintenance_request(
 async def complete_maintenance_request(
     request_id: int,
     cost: float,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can complete maintenance requests
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -117,12 +170,14 @@ async def complete_maintenance_request(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return MaintenanceService.complete_maintenance_request(request_id, cost, db)
+    return await MaintenanceService.complete_maintenance_request_async(
+        db, request_id=request_id, cost=cost
+    )
 
 @router.get("/high-priority", response_model=List[MaintenanceRequest])
 async def get_high_priority_requests(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can view high priority requests
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -130,12 +185,12 @@ async def get_high_priority_requests(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return MaintenanceService.get_high_priority_requests(db)
+    return await MaintenanceService.get_high_priority_requests_async(db)
 
 @router.get("/emergency", response_model=List[MaintenanceRequest])
 async def get_emergency_requests(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can view emergency requests
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -143,4 +198,4 @@ async def get_emergency_requests(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return MaintenanceService.get_emergency_requests(db) 
\ No newline at end of file
+    return await MaintenanceService.get_emergency_requests_async(db) 
\ No newline at end of file
@@ -1,16 +1,29 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import Includes, Relation, batch_response, item_response, page_response
 from app.services.auth import AuthService
-from app.services.payment import PaymentService
+from app.services.bulk_import import BulkImportService, import_format, spool_upload
+from app.services.contract import CONTRACT_ROWS
+from app.services.payment import PAYMENT_ROWS, PaymentService
+from app.services.scoping import AccessScope
 from app.schemas.payment import Payment, PaymentCreate, PaymentUpdate
-from app.models.user import User, UserRole
+from app.models.user import UserRole
+from app.schemas.user import Principal
+from app.schemas.batch import BatchRequest, BatchResult
+from app.schemas.bulk_import import ImportReport
 from app.models.payment import PaymentStatus
 
 router = APIRouter()        
 
+# Ressources liées disponibles pour `include=`
+PAYMENT_RELATIONS = {
+    "contract": Relation(CONTRACT_ROWS, "contract_id"),
+}
+
 @router.get("/", response_model=List[Payment])
 async def read_payments(
     skip: int = 0,
@@ -18,38 +31,37 @@ async def read_payments(
     contract_id: Optional[int] = None,
     status: Optional[PaymentStatus] = None,
     type: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    # If user is a tenant, only show their payments
-    if current_user.role == UserRole.TENANT:
-        # Get all contracts for this tenant
-        tenant_contracts = [c.id for c in current_user.tenant_contracts]
-        if not tenant_contracts:
-            return []
-        return PaymentService.get_payments(
-            db=db,
-            skip=skip,
-            limit=limit,
-            contract_id=contract_id if contract_id in tenant_contracts else None,
-            status=status,
-            type=type
-        )
-    
-    return PaymentService.get_payments(
-        db=db,
+    includes = Includes(PAYMENT_RELATIONS, include)
+    rows = PAYMENT_ROWS.select(fields, extra=includes.keys)
+    page = await PaymentService.get_payments_page_async(
+        db,
         skip=skip,
         limit=limit,
         contract_id=contract_id,
         status=status,
-        type=type
+        type=type,
+        scope=AccessScope.of(current_user),
+        cursor=cursor,
+        sort=sort,
+        include_total=include_total,
+        columns=rows.columns
     )
+    await includes.load_async(db, page.items, AccessScope.of(current_user))
+    return page_response(page, rows, includes)
 
 @router.post("/", response_model=Payment, status_code=status.HTTP_201_CREATED)
 async def create_payment(
     payment_data: PaymentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can create payments
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -57,32 +69,83 @@ async def create_payment(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return PaymentService.create_payment(payment_data, db)
+    return await PaymentService.create_payment_async(db, payment_data=payment_data)
+
+@router.post("/import", response_model=ImportReport)
+async def import_payments(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    # Only admin and agent can import payments
+    if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    format = import_format(request.headers.get("content-type"))
+    with await spool_upload(request.stream()) as source:
+        return await BulkImportService.import_payments_async(db, source=source, format=format)
+
+@router.get("/export")
+async def export_payments(
+    format: ExportFormat = ExportFormat.CSV,
+    contract_id: Optional[int] = None,
+    status: Optional[PaymentStatus] = None,
+    type: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    chunks = PaymentService.export_payments(
+        db, format, fields=PAYMENT_ROWS.select(fields).fields, contract_id=contract_id,
+        status=status, type=type, scope=AccessScope.of(current_user)
+    )
+    return export_response(chunks, format, "payments")
+
+@router.post("/batch", response_model=BatchResult[Payment])
+async def read_payments_batch(
+    batch_data: BatchRequest,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    includes = Includes(PAYMENT_RELATIONS, include)
+    rows = PAYMENT_ROWS.select(fields, extra=includes.keys)
+    batch = await AccessScope.of(current_user).fetch_async(db, rows=rows, ids=batch_data.ids)
+    await includes.load_async(db, batch.rows, AccessScope.of(current_user))
+    return batch_response(batch, rows, includes)
 
 @router.get("/{payment_id}", response_model=Payment)
 async def read_payment(
     payment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    payment = PaymentService.get_payment(payment_id, db)
+    includes = Includes(PAYMENT_RELATIONS, include)
+    rows = PAYMENT_ROWS.select(fields, extra=("contract_id",) + includes.keys)
+    payment = await PaymentService.get_payment_async(db, payment_id=payment_id, columns=rows.columns)
     
     # Check if user has access to this payment
     if current_user.role == UserRole.TENANT:
-        if payment.contract.tenant_id != current_user.id:
+        if payment.contract_id not in current_user.tenant_contract_ids:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
             )
     
-    return payment
+    await includes.load_async(db, [payment], AccessScope.of(current_user))
+    return item_response(payment, rows, includes)
 
 @router.put("/{payment_id}", response_model=Payment)
 async def update_payment(
     payment_id: int,
     payment_data: PaymentUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can update payments
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -90,7 +153,9 @@ async def update_payment(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    updated_payment = PaymentService.update_payment(payment_id, payment_data, db)
+    updated_payment = await PaymentService.update_payment_async(
+        db, payment_id=payment_id, payment_data=payment_data
+    )
     if not updated_payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,8 +166,8 @@ async def update_payment(
 @router.post("/{payment_id}/mark-paid", response_model=Payment)
 async def mark_payment_as_paid(
     payment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can mark payments as paid
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -110,12 +175,12 @@ async def mark_payment_as_paid(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return PaymentService.mark_payment_as_paid(payment_id, db)
+    return await PaymentService.mark_payment_as_paid_async(db, payment_id=payment_id)
 
 @router.get("/overdue", response_model=List[Payment])
 async def get_overdue_payments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can view overdue payments
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -123,13 +188,13 @@ async def get_overdue_payments(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return PaymentService.check_overdue_payments(db)
+    return await PaymentService.check_overdue_payments_async(db)
 
 @router.post("/contract/{contract_id}/generate-rent", response_model=List[Payment])
 async def generate_rent_payments(
     contract_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can generate rent payments
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -137,4 +202,4 @@ async def generate_rent_payments(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return PaymentService.generate_rent_payments(contract_id, db) 
\ No newline at end of file
+    return await PaymentService.generate_rent_payments_async(db, contract_id=contract_id) 
\ No newline at end of file
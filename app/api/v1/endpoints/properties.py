@@ -1,12 +1,19 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Query, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.export import ExportFormat, export_response
+from app.core.serialization import batch_response, item_response, page_response
 from app.services.auth import AuthService
-from app.services.property import PropertyService
+from app.services.bulk_import import BulkImportService, import_format, spool_upload
+from app.services.property import PROPERTY_ROWS, PropertyService
+from app.services.scoping import AccessScope
 from app.schemas.property import Property, PropertyCreate, PropertyUpdate
-from app.models.user import User, UserRole
+from app.models.user import UserRole
+from app.schemas.user import Principal
+from app.schemas.batch import BatchRequest, BatchResult
+from app.schemas.bulk_import import ImportReport
 from app.models.property import PropertyStatus
 from app.models.contract import Contract, ContractStatus
 
@@ -20,25 +27,35 @@ async def read_properties(
     owner_id: Optional[int] = None,
     status: Optional[PropertyStatus] = None,
     type: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    return property_service.get_properties(
-        db=db,
+    rows = PROPERTY_ROWS.select(fields)
+    page = await property_service.get_properties_page_async(
+        db,
         skip=skip,
         limit=limit,
         owner_id=owner_id,
         status=status,
         type=type,
         user_role=current_user.role,
-        user_id=current_user.id
+        user_id=current_user.id,
+        cursor=cursor,
+        sort=sort,
+        include_total=include_total,
+        columns=rows.columns
     )
+    return page_response(page, rows)
 
 @router.post("/", response_model=Property, status_code=status.HTTP_201_CREATED)
 async def create_property(
     property_data: PropertyCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can create properties
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -46,33 +63,85 @@ async def create_property(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return property_service.create_property(property_data, db)
+    return await property_service.create_property_async(db, property_data=property_data)
+
+@router.post("/import", response_model=ImportReport)
+async def import_properties(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    # Only admin and agent can import properties
+    if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    format = import_format(request.headers.get("content-type"))
+    with await spool_upload(request.stream()) as source:
+        return await BulkImportService.import_properties_async(db, source=source, format=format)
+
+@router.get("/export")
+async def export_properties(
+    format: ExportFormat = ExportFormat.CSV,
+    owner_id: Optional[int] = None,
+    status: Optional[PropertyStatus] = None,
+    type: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    chunks = property_service.export_properties(
+        db,
+        format,
+        fields=PROPERTY_ROWS.select(fields).fields,
+        owner_id=owner_id,
+        status=status,
+        type=type,
+        user_role=current_user.role,
+        user_id=current_user.id
+    )
+    return export_response(chunks, format, "properties")
+
+@router.post("/batch", response_model=BatchResult[Property])
+async def read_properties_batch(
+    batch_data: BatchRequest,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
+):
+    rows = PROPERTY_ROWS.select(fields)
+    batch = await AccessScope.of(current_user).fetch_async(db, rows=rows, ids=batch_data.ids)
+    return batch_response(batch, rows)
 
 @router.get("/{property_id}", response_model=Property)
 async def read_property(
     property_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
-    property = property_service.get_property(
+    rows = PROPERTY_ROWS.select(fields, extra=("owner_id",))
+    property = await property_service.get_property_async(
+        db,
         property_id=property_id,
-        db=db,
         user_role=current_user.role,
-        user_id=current_user.id
+        user_id=current_user.id,
+        columns=rows.columns
     )
     if not property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Property not found"
         )
-    return property
+    return item_response(property, rows)
 
 @router.put("/{property_id}", response_model=Property)
 async def update_property(
     property_id: int,
     property_data: PropertyUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can update properties
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -80,7 +149,9 @@ async def update_property(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    updated_property = property_service.update_property(db, property_id, property_data)
+    updated_property = await property_service.update_property_async(
+        db, property_id=property_id, property_data=property_data
+    )
     if not updated_property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -91,8 +162,8 @@ async def update_property(
 @router.delete("/{property_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_property(
     property_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin can delete properties
     if current_user.role != UserRole.ADMIN:
@@ -100,18 +171,14 @@ async def delete_property(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    if not property_service.delete_property(db, property_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Property not found"
-        )
+    await property_service.delete_property_async(db, property_id=property_id)
 
 @router.patch("/{property_id}/status", response_model=Property)
 async def update_property_status(
     property_id: int,
     status: PropertyStatus,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(AuthService.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(AuthService.get_current_user_async)
 ):
     # Only admin and agent can update property status
     if current_user.role not in [UserRole.ADMIN, UserRole.AGENT]:
@@ -119,4 +186,6 @@ async def update_property_status(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return property_service.update_property_status(property_id, status, db) 
\ No newline at end of file
+    return await property_service.update_property_status_async(
+        db, property_id=property_id, status=status
+    ) 
\ No newline at end of file
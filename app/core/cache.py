@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+V = TypeVar("V")
+
+class TTLCache(Generic[V]):
+    """
+    Cache mémoire borné (LRU) dont les entrées expirent après un délai.
+    
+    Le cache est propre au processus : chaque worker uvicorn possède le sien,
+    la durée de vie des entrées borne donc l'écart entre workers.
+    """
+    
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialise le cache.
+        
+        Args:
+            max_size: Nombre maximal d'entrées avant éviction de la plus ancienne
+            ttl: Durée de vie d'une entrée en secondes
+            timer: Horloge utilisée pour l'expiration (injectable pour les tests)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key: Hashable) -> Optional[V]:
+        """Retourne la valeur associée à la clé, ou None si absente ou expirée."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: V) -> None:
+        """Enregistre une valeur, en évinçant l'entrée la moins récemment utilisée si besoin."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Supprime une entrée du cache."""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+    
+    def clear(self) -> None:
+        """Vide le cache et remet les statistiques à zéro."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques d'utilisation du cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+# Cache des utilisateurs authentifiés, indexé par identifiant d'utilisateur
+principal_cache: TTLCache = TTLCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
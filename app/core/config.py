@@ -30,6 +30,16 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Hachage des mots de passe (bcrypt)
+    PASSWORD_HASH_ROUNDS: int = 12  # 4 minimum, à réduire pour les tests
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" ou "process"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64  # au-delà, réponse 503
+    
+    # Cache des utilisateurs authentifiés
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000  # 0 pour désactiver
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     
@@ -60,6 +70,24 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
     
+    # URL asynchrone (par défaut dérivée de SQLALCHEMY_DATABASE_URI avec asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Pool de connexions (par worker uvicorn)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # secondes, -1 pour désactiver
+    DB_POOL_TIMEOUT: int = 30  # secondes d'attente d'une connexion libre
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = pas de limite (PostgreSQL uniquement)
+    DB_ECHO: bool = False
+    
+    # Planificateur
+    SCHEDULER_BATCH_SIZE: int = 500  # lignes chargées par lot dans les tâches planifiées
+    SCHEDULER_MAX_WORKERS: int = 2  # tâches simultanées (une session chacune), < DB_POOL_SIZE
+    SCHEDULER_JOB_MAX_INSTANCES: int = 1  # exécutions simultanées d'une même tâche
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 300
+    
     # Email
     SMTP_TLS: bool = True
     SMTP_PORT: Optional[int] = None
@@ -68,16 +96,81 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     EMAILS_FROM_EMAIL: Optional[EmailStr] = None
     EMAILS_FROM_NAME: Optional[str] = None
+    SMTP_POOL_SIZE: int = 4  # connexions SMTP persistantes simultanées
+    SMTP_TIMEOUT: float = 10.0
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100  # renouvelle la connexion au-delà
+    SMTP_IDLE_TIMEOUT: float = 60.0  # secondes avant de rouvrir une connexion inactive
+    
+    # Envois groupés de notifications
+    NOTIFICATION_BULK_WORKERS: int = 4
+    NOTIFICATION_BULK_BATCH_SIZE: int = 50  # emails envoyés par emprunt de connexion
+    
+    # Outbox des notifications
+    OUTBOX_BATCH_SIZE: int = 200  # notifications réservées et livrées par lot
+    OUTBOX_LEASE_SECONDS: int = 300  # durée de réservation d'un lot, au-delà il est repris
+    OUTBOX_EMAIL_CONCURRENCY: int = 4
+    OUTBOX_SMS_CONCURRENCY: int = 4
+    OUTBOX_MAX_ATTEMPTS: int = 5  # au-delà, lettre morte
+    OUTBOX_RETRY_BACKOFF_SECONDS: float = 60.0  # doublé à chaque tentative
+    OUTBOX_RETRY_BACKOFF_MAX_SECONDS: float = 3600.0
+    OUTBOX_DISPATCH_INTERVAL_SECONDS: int = 30
+    OUTBOX_DISPATCH_IN_SCHEDULER: bool = True  # False si un dispatcher autonome tourne
     
     # Fichiers
     UPLOAD_DIR: Path = Path("uploads")
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "pdf"]
+
+    # Imports en masse (CSV ou NDJSON)
+    IMPORT_CHUNK_SIZE: int = 1000  # lignes validées, vérifiées et insérées par transaction
+    IMPORT_MAX_SIZE: int = 200 * 1024 * 1024  # 200MB
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000  # au-delà, seules les lignes en erreur sont comptées
+
+    # Exports en continu (CSV ou NDJSON)
+    EXPORT_BATCH_SIZE: int = 1000  # lignes lues par aller-retour sur le curseur serveur
+
+    # Lectures groupées par identifiants (POST /{ressource}/batch)
+    BATCH_MAX_IDS: int = 500
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_DIR: Path = Path("logs")
+    LOG_JSON: bool = True  # une ligne JSON par enregistrement
+    REQUEST_ID_HEADER: str = "X-Request-ID"
+    # Proportion des requêtes journalisées par route (ex. {"/api/v1/properties/": 0.1}) ;
+    # les erreurs et les requêtes lentes sont toujours journalisées
+    LOG_SAMPLING_RATES: Dict[str, float] = {}
+    LOG_SLOW_REQUEST_MS: float = 1000.0
+
+    # Métriques (format texte Prometheus)
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/metrics"
+
+    # Budgets de requêtes SQL par requête HTTP (développement et CI)
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_STRICT: bool = False  # lève QueryBudgetExceeded au lieu de journaliser
+    # Par modèle de route, toutes méthodes confondues. Pire cas mesuré : principal
+    # absent du cache (2 requêtes), `include_total` et toutes les relations `include=`
+    QUERY_BUDGETS: Dict[str, int] = {
+        "/api/v1/properties/": 4,
+        "/api/v1/properties/{property_id}": 5,
+        "/api/v1/contracts/": 7,
+        "/api/v1/contracts/{contract_id}": 6,
+        "/api/v1/payments/": 5,
+        "/api/v1/payments/{payment_id}": 5,
+        "/api/v1/maintenance/": 7,
+        "/api/v1/maintenance/{request_id}": 6,
+    }
+    QUERY_BUDGET_DEFAULT: Optional[int] = None  # routes sans budget propre
+    QUERY_REPEAT_THRESHOLD: int = 5  # exécutions d'une même forme de requête signalant un N+1
+
+    # Profilage par échantillonnage (piles au format « folded », une série par route)
+    PROFILING_SAMPLE_RATE: float = 0.0  # proportion des requêtes profilées
+    PROFILING_INTERVAL_MS: float = 5.0  # intervalle entre deux relevés de piles
+    PROFILING_DIR: Path = Path("logs/profiles")
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: Optional[str] = None  # jeton des administrateurs forçant le profilage d'une requête
     
     # Maintenance
     MAINTENANCE_EMAIL_NOTIFICATIONS: bool = True
@@ -87,6 +180,9 @@ class Settings(BaseSettings):
     PAYMENT_DUE_DAYS: int = 5
     PAYMENT_GRACE_PERIOD_DAYS: int = 3
     PAYMENT_LATE_FEE_PERCENTAGE: float = 5.0
+    OVERDUE_BATCH_SIZE: int = 5000  # paiements mis à jour ou pénalisés par instruction
+    RENT_SCHEDULE_MONTHS_AHEAD: int = 3  # mois de loyers générés d'avance, mois courant compris
+    RENT_SCHEDULE_BATCH_SIZE: int = 1000  # contrats traités par transaction
     
     # Contrats
     CONTRACT_RENEWAL_NOTICE_DAYS: int = 90
@@ -103,6 +199,18 @@ class Settings(BaseSettings):
     SMS_PROVIDER: Optional[str] = None
     SMS_API_KEY: Optional[str] = None
     SMS_FROM_NUMBER: Optional[str] = None
+    SMS_API_URL: Optional[str] = None  # défaut : https://api.{SMS_PROVIDER}.com
+    SMS_BATCH_PATH: Optional[str] = None  # endpoint d'envoi groupé, ex. "/sms/send-batch"
+    SMS_BATCH_SIZE: int = 100
+    SMS_POOL_SIZE: int = 10  # connexions HTTP conservées et envois simultanés
+    SMS_CONNECT_TIMEOUT: float = 3.05
+    SMS_READ_TIMEOUT: float = 10.0
+    SMS_MAX_RETRIES: int = 3
+    SMS_RETRY_BACKOFF: float = 0.5  # secondes, doublé à chaque tentative (avec gigue)
+    SMS_RETRY_BACKOFF_MAX: float = 8.0
+    # En-tête de clé d'idempotence honoré par le fournisseur (ex. "Idempotency-Key") ;
+    # sans lui, un envoi interrompu après transmission n'est pas rejoué
+    SMS_IDEMPOTENCY_HEADER: Optional[str] = None
     
     class Config:
         case_sensitive = True
@@ -1,18 +1,397 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.core import metrics
+from app.core.logging import get_logger
+from app.core.request_context import record_query
+
+logger = get_logger(__name__)
+
+# Durée au-delà de laquelle l'obtention d'une connexion compte comme une attente (secondes)
+POOL_WAIT_THRESHOLD = 0.001
+
+# Temps passé à ouvrir des connexions pendant l'emprunt en cours (propre au thread
+# ou à la tâche asyncio, les greenlets de SQLAlchemy partageant le contexte de la tâche)
+_connect_time: ContextVar[Optional[List[float]]] = ContextVar("pool_connect_time", default=None)
+
+
+class PoolStats:
+    """Compteurs d'utilisation d'un pool de connexions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Remet tous les compteurs à zéro."""
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.overflow_checkouts = 0
+            self.timeouts = 0
+            self.wait_count = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+
+    def record_get(self, elapsed: float, overflow: bool) -> None:
+        """
+        Enregistre l'obtention d'une connexion depuis le pool.
+
+        Args:
+            elapsed: Durée de l'obtention hors ouverture de connexion (secondes) ;
+                seules celles au-delà de POOL_WAIT_THRESHOLD comptent comme des attentes
+            overflow: True si la connexion a été ouverte en débordement
+        """
+        with self._lock:
+            if elapsed > POOL_WAIT_THRESHOLD:
+                self.wait_count += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+            if overflow:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retourne une copie des compteurs."""
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_time_total": self.wait_time_total,
+                "wait_time_max": self.wait_time_max,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Mesure le temps d'attente et les débordements d'un pool à file d'attente."""
+
+    def __init__(self, *args, **kwargs):
+        self.stats = kwargs.pop("stats", None) or PoolStats()
+        super().__init__(*args, **kwargs)
+
+    def _do_get(self):
+        overflow = self.overflow()
+        connecting = [0.0]
+        token = _connect_time.set(connecting)
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            _connect_time.reset(token)
+        # L'ouverture d'une connexion (TCP, authentification) n'est pas une attente
+        elapsed = time.perf_counter() - start - connecting[0]
+        # overflow() part de -pool_size et croît à chaque connexion ouverte :
+        # seul un emprunt qui le fait passer au-dessus de 0 est un débordement
+        self.stats.record_get(elapsed, self.overflow() > max(overflow, 0))
+        return connection
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            connecting = _connect_time.get()
+            if connecting is not None:
+                connecting[0] += time.perf_counter() - start
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool instrumenté pour les moteurs synchrones."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool instrumenté pour les moteurs asynchrones."""
+
+
+def _attach_pool_events(engine: Engine, stats: PoolStats) -> None:
+    event.listen(engine, "connect", lambda *args: stats.record_connect())
+    event.listen(engine, "checkout", lambda *args: stats.record_checkout())
+    event.listen(engine, "checkin", lambda *args: stats.record_checkin())
+
+
+def _engine_options(backend: str, poolclass: type) -> Dict[str, Any]:
+    """Construit les options communes aux moteurs synchrone et asynchrone."""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DB_ECHO,
+    }
+    connect_args: Dict[str, Any] = {}
+    if backend == "sqlite":
+        connect_args["check_same_thread"] = False
+    else:
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+        if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+            if poolclass is InstrumentedAsyncQueuePool:
+                connect_args["server_settings"] = {
+                    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+                }
+            else:
+                connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    options["connect_args"] = connect_args
+    return options
+
+
+def _observe_query(elapsed: float, statement: Optional[str] = None) -> None:
+    record_query(elapsed, statement)
+    metrics.db_queries_total.inc()
+    metrics.db_query_duration_seconds.observe(elapsed)
+
+
+def _attach_query_events(engine: Engine) -> None:
+    """Mesure la durée de chaque requête SQL et l'impute à la requête HTTP en cours."""
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _observe_query(time.perf_counter() - conn.info["query_start"].pop(), statement)
+
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            _observe_query(time.perf_counter() - starts.pop(), exception_context.statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def _finalize_engine(db_engine: Engine) -> Engine:
+    stats = getattr(db_engine.pool, "stats", None) or PoolStats()
+    _attach_pool_events(db_engine, stats)
+    _attach_query_events(db_engine)
+    db_engine.pool_stats = stats
+    return db_engine
+
+
+def create_db_engine(url: Optional[str] = None, **overrides: Any) -> Engine:
+    """
+    Crée un moteur SQLAlchemy configuré à partir des paramètres de l'application.
+
+    Les bases SQLite conservent le pool par défaut de SQLAlchemy ; les autres
+    bases utilisent un pool instrumenté dont les compteurs sont disponibles
+    via `engine.pool_stats`.
+
+    Args:
+        url: URL de connexion (par défaut `settings.SQLALCHEMY_DATABASE_URI`)
+        **overrides: Arguments supplémentaires passés à `create_engine`
+
+    Returns:
+        Engine: Moteur SQLAlchemy
+    """
+    url = str(url or settings.SQLALCHEMY_DATABASE_URI)
+    options = _engine_options(make_url(url).get_backend_name(), InstrumentedQueuePool)
+    options.update(overrides)
+    return _finalize_engine(create_engine(url, **options))
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convertit une URL synchrone vers le pilote asynchrone correspondant.
+
+    Args:
+        url: URL de connexion (ex: `postgresql://...`, `sqlite:///...`)
+
+    Returns:
+        str: URL utilisant `asyncpg` pour PostgreSQL ou `aiosqlite` pour SQLite
+    """
+    parsed = make_url(str(url))
+    backend = parsed.get_backend_name()
+    if backend == "postgresql" and parsed.get_driver_name() != "asyncpg":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    elif backend == "sqlite" and parsed.get_driver_name() != "aiosqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return str(parsed)
+
+
+def create_async_db_engine(url: Optional[str] = None, **overrides: Any) -> AsyncEngine:
+    """
+    Crée un moteur asynchrone avec les mêmes réglages de pool que `create_db_engine`.
+
+    Les compteurs du pool sont disponibles via `engine.sync_engine.pool_stats`.
+
+    Args:
+        url: URL de connexion (par défaut `settings.ASYNC_DATABASE_URL`, ou
+            `settings.SQLALCHEMY_DATABASE_URI` converti vers le pilote asynchrone)
+        **overrides: Arguments supplémentaires passés à `create_async_engine`
+
+    Returns:
+        AsyncEngine: Moteur SQLAlchemy asynchrone
+    """
+    url = to_async_url(url or settings.ASYNC_DATABASE_URL or settings.SQLALCHEMY_DATABASE_URI)
+    options = _engine_options(make_url(url).get_backend_name(), InstrumentedAsyncQueuePool)
+    options.update(overrides)
+    async_db_engine = create_async_engine(url, **options)
+    _finalize_engine(async_db_engine.sync_engine)
+    return async_db_engine
+
+
+def get_pool_status(db_engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """
+    Retourne l'état courant du pool et ses compteurs cumulés.
+
+    Args:
+        db_engine: Moteur synchrone ou asynchrone à inspecter (par défaut le
+            moteur synchrone de l'application)
+
+    Returns:
+        Dict[str, Any]: État du pool (taille, connexions empruntées, débordement)
+        et compteurs (checkouts, attentes, timeouts)
+    """
+    db_engine = db_engine or engine
+    if isinstance(db_engine, AsyncEngine):
+        db_engine = db_engine.sync_engine
+    pool = db_engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    status.update(db_engine.pool_stats.snapshot())
+    return status
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+AsyncSessionLocal = sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
+
+def _pool_metrics() -> List[metrics.Gauge]:
+    """Expose l'état des pools des moteurs synchrone et asynchrone."""
+    gauges = {
+        key: metrics.Gauge(f"db_pool_{key}", documentation, ("engine",))
+        for key, documentation in (
+            ("size", "Taille du pool de connexions"),
+            ("checked_out", "Connexions empruntées"),
+            ("overflow", "Connexions ouvertes au-delà de la taille du pool"),
+            ("checkouts", "Emprunts de connexion cumulés"),
+            ("timeouts", "Attentes de connexion expirées cumulées"),
+            ("wait_time_total", "Temps d'attente de connexion cumulé (secondes)"),
+            ("wait_time_max", "Plus longue attente de connexion (secondes)"),
+        )
+    }
+    for name, db_engine in (("sync", engine), ("async", async_engine)):
+        status = get_pool_status(db_engine)
+        for key, gauge in gauges.items():
+            if key in status:
+                gauge.set(status[key], engine=name)
+    return list(gauges.values())
+
+
+metrics.registry.add_collector(_pool_metrics)
+
 # Dependency
-def get_db():
+def get_db() -> Session:
+    """
+    Fournit une session de base de données issue du pool partagé.
+    
+    Yields:
+        Session: Session de base de données
+        
+    Example:
+        ```python
+        @app.get("/items")
+        def read_items(db: Session = Depends(get_db)):
+            items = db.query(Item).all()
+            return items
+        ```
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+        logger.debug("Session de base de données fermée")
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Fournit une session asynchrone issue du pool partagé.
+    
+    Les requêtes concurrentes d'un même worker se chevauchent pendant les
+    entrées/sorties au lieu de bloquer la boucle d'événements.
+    
+    Yields:
+        AsyncSession: Session de base de données asynchrone
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+T = TypeVar("T")
+
+async def run_sync(db: AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Exécute une méthode de service synchrone sur une session asynchrone.
+    
+    La méthode reçoit la session synchrone sous-jacente via l'argument `db` ;
+    ses requêtes (chargements paresseux compris) passent par le pilote
+    asynchrone sans bloquer la boucle d'événements.
+    
+    Args:
+        db: Session asynchrone
+        fn: Méthode de service acceptant un argument `db`
+        *args: Arguments positionnels de la méthode
+        **kwargs: Arguments nommés de la méthode
+        
+    Returns:
+        Le résultat de la méthode
+    """
+    return await db.run_sync(lambda session: fn(*args, db=session, **kwargs))
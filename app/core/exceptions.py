@@ -67,6 +67,16 @@ class RateLimitException(PropertyManagementException):
             detail=detail
         )
 
+class ServiceUnavailableException(PropertyManagementException):
+    """Exception pour les services temporairement saturés."""
+    
+    def __init__(self, detail: str = "Service temporairement indisponible", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
 class DatabaseException(PropertyManagementException):
     """Exception pour les erreurs de base de données."""
     
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+# Type de contenu de chaque format d'export
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+def _value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def export_statement(query: Query, fields: Iterable[str]) -> Select:
+    """
+    Transforme une requête filtrée en SELECT des seules colonnes exportées, trié par id.
+
+    Les lignes sont lues comme des tuples, sans instancier d'objets ORM ni
+    alimenter l'identity map de la session.
+
+    Args:
+        query: Requête ORM filtrée (une seule entité)
+        fields: Noms des colonnes à exporter, dans l'ordre
+
+    Returns:
+        Select: Requête prête à être parcourue par `stream_export`
+    """
+    table = query.column_descriptions[0]["entity"].__table__
+    return query.with_entities(*(table.c[name] for name in fields)).order_by(None).order_by(table.c.id).statement
+
+async def stream_export(
+    db: AsyncSession,
+    statement: Select,
+    format: ExportFormat,
+    batch_size: int = settings.EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Parcourt une requête avec un curseur côté serveur et l'encode au fil de l'eau.
+
+    Seules `batch_size` lignes sont en mémoire à la fois, quelle que soit la
+    taille du résultat. Chaque lot produit un morceau de la réponse.
+
+    Args:
+        db: Session asynchrone (ouverte pendant toute la durée de l'export)
+        statement: Requête construite par `export_statement`
+        format: Format de sortie
+        batch_size: Nombre de lignes lues par aller-retour
+
+    Yields:
+        bytes: Morceau encodé en UTF-8 (en-tête CSV, puis un morceau par lot)
+    """
+    names = [column.name for column in statement.selected_columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == ExportFormat.CSV:
+        writer.writerow(names)
+        yield buffer.getvalue().encode()
+
+    result = await db.stream(statement)
+    async for rows in result.partitions(batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        if format == ExportFormat.CSV:
+            writer.writerows([_value(value) for value in row] for row in rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps(dict(zip(names, map(_value, row))), separators=(",", ":")))
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+
+def export_response(chunks: AsyncIterator[bytes], format: ExportFormat, name: str) -> StreamingResponse:
+    """Réponse téléchargeable `<name>.<format>` alimentée par `stream_export`."""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format.value}"'}
+    )
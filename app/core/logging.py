@@ -1,17 +1,59 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from app.core.config import settings
 
 # Créer le dossier logs s'il n'existe pas
 log_dir = Path("logs")
 log_dir.mkdir(exist_ok=True)
 
+# Attributs standard d'un LogRecord : tout autre attribut provient de `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """Formate chaque enregistrement en une ligne JSON, champs `extra` inclus."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler ne faisant aucun formatage sur le thread appelant.
+
+    Seuls le message et ses arguments sont fusionnés ; le formatage (JSON,
+    traceback) est réalisé par le thread du QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 # Configuration du format des logs
-log_format = logging.Formatter(
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+if settings.LOG_JSON:
+    log_format = JsonFormatter()
+else:
+    log_format = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
 
 # Configuration du handler pour la console
 console_handler = logging.StreamHandler(sys.stdout)
@@ -26,11 +68,18 @@ file_handler = RotatingFileHandler(
 )
 file_handler.setFormatter(log_format)
 
+# Les écritures (console, fichier) sont faites par un thread dédié : le code
+# appelant, y compris la boucle d'événements, ne fait que déposer l'enregistrement
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+queue_handler = _DeferredQueueHandler(log_queue)
+log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 # Configuration du logger principal
 logger = logging.getLogger("property_management")
 logger.setLevel(logging.INFO)
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+logger.addHandler(queue_handler)
 
 # Configuration des loggers spécifiques
 api_logger = logging.getLogger("property_management.api")
@@ -44,4 +93,4 @@ if settings.DEBUG:
 
 def get_logger(name: str) -> logging.Logger:
     """Retourne un logger avec le préfixe de l'application."""
-    return logging.getLogger(f"property_management.{name}") 
\ No newline at end of file
+    return logging.getLogger(f"property_management.{name}")
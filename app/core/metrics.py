@@ -0,0 +1,227 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Bornes par défaut des histogrammes de durée (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bornes des histogrammes de nombre de requêtes SQL par requête HTTP
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Lignes d'échantillons au format texte Prometheus."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remet la métrique à zéro."""
+
+class Counter(_Metric):
+    """Compteur monotone, éventuellement étiqueté."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+class Gauge(Counter):
+    """Valeur instantanée pouvant augmenter ou diminuer."""
+
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    """Distribution d'observations réparties dans des intervalles cumulés."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[LabelValues, List[float]] = {}  # [compteurs..., somme, total]
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> float:
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0.0
+
+    def sum(self, **labels: str) -> float:
+        series = self._series.get(self._key(labels))
+        return series[-2] if series else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+# Une fonction de collecte renvoie des métriques calculées au moment de l'export
+Collector = Callable[[], Iterable[_Metric]]
+
+class MetricsRegistry:
+    """Ensemble des métriques exportées au format texte Prometheus."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Exporte toutes les métriques au format texte Prometheus (0.0.4).
+
+        Returns:
+            str: Exposition texte
+        """
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            metrics.extend(collector())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Remet à zéro toutes les séries enregistrées."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+# Registre global et métriques de l'application
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Latence des requêtes HTTP", ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "Requêtes HTTP en cours de traitement", ("method",)
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "Requêtes SQL exécutées par requête HTTP", ("route",), QUERY_COUNT_BUCKETS
+)
+http_request_db_duration_seconds = registry.histogram(
+    "http_request_db_duration_seconds", "Temps SQL cumulé par requête HTTP", ("route",)
+)
+db_queries_total = registry.counter("db_queries_total", "Requêtes SQL exécutées")
+db_query_duration_seconds = registry.histogram("db_query_duration_seconds", "Durée des requêtes SQL")
+scheduler_job_duration_seconds = registry.histogram(
+    "scheduler_job_duration_seconds", "Durée des exécutions de tâches planifiées", ("job",),
+    (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+)
+scheduler_job_rows_total = registry.counter(
+    "scheduler_job_rows_total", "Lignes traitées par les tâches planifiées", ("job",)
+)
+scheduler_job_failures_total = registry.counter(
+    "scheduler_job_failures_total", "Exécutions de tâches planifiées en erreur", ("job",)
+)
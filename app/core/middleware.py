@@ -0,0 +1,160 @@
+import random
+from typing import Dict, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import api_logger
+from app.core import metrics
+from app.core.request_context import RequestContext, current_request
+
+# Route des requêtes n'ayant correspondu à aucune route (évite une cardinalité illimitée)
+UNMATCHED_ROUTE = "<unmatched>"
+
+def route_template(scope: Scope) -> str:
+    """Retourne le modèle de la route ayant traité la requête (ex. /api/v1/properties/{property_id})."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+class RequestLoggingMiddleware:
+    """
+    Middleware ASGI journalisant chaque requête en un enregistrement structuré.
+
+    Chaque enregistrement porte l'identifiant de requête (repris de l'en-tête
+    `REQUEST_ID_HEADER` ou généré, et renvoyé dans la réponse), la méthode,
+    le modèle de route, le statut, la latence ainsi que le nombre et la durée
+    des requêtes SQL. Les routes listées dans `sampling_rates` ne sont
+    journalisées que pour la proportion indiquée, sauf erreur ou lenteur.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampling_rates: Optional[Dict[str, float]] = None,
+        slow_request_ms: Optional[float] = None
+    ):
+        self.app = app
+        self.sampling_rates = settings.LOG_SAMPLING_RATES if sampling_rates is None else sampling_rates
+        self.slow_request_ms = settings.LOG_SLOW_REQUEST_MS if slow_request_ms is None else slow_request_ms
+        self.header = settings.REQUEST_ID_HEADER.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == self.header), None
+        )
+        context = RequestContext(request_id, scope["method"], scope["path"])
+        token = current_request.set(context)
+        status_code = 500
+        response_started = False
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(settings.REQUEST_ID_HEADER, context.request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as e:
+            context.route = route_template(scope)
+            self._log(context, 500, error=e)
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=500,
+                content={"detail": "Internal server error", "error": str(e)},
+                headers={settings.REQUEST_ID_HEADER: context.request_id}
+            )
+            await response(scope, receive, send)
+            return
+        finally:
+            current_request.reset(token)
+
+        context.route = route_template(scope)
+        self._log(context, status_code)
+
+    def _sampled(self, context: RequestContext, status_code: int, latency_ms: float) -> bool:
+        rate = self.sampling_rates.get(context.route)
+        if rate is None or status_code >= 500 or latency_ms >= self.slow_request_ms:
+            return True
+        return random.random() < rate
+
+    def _log(self, context: RequestContext, status_code: int, error: Optional[Exception] = None) -> None:
+        latency_ms = context.elapsed * 1000
+        if not self._sampled(context, status_code, latency_ms):
+            return
+        fields = {
+            "request_id": context.request_id,
+            "method": context.method,
+            "route": context.route,
+            "path": context.path,
+            "status": status_code,
+            "latency_ms": round(latency_ms, 2),
+            "db_queries": context.db_queries,
+            "db_time_ms": round(context.db_time * 1000, 2),
+        }
+        rate = self.sampling_rates.get(context.route)
+        if rate is not None:
+            fields["sample_rate"] = rate
+        if error is not None:
+            # La traceback est formatée par le thread d'écriture des logs
+            api_logger.error("request failed", exc_info=error, extra=fields)
+        else:
+            api_logger.info("request", extra=fields)
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI alimentant les métriques HTTP.
+
+    Enregistre par modèle de route la latence, le nombre de réponses par
+    statut, le nombre et la durée des requêtes SQL, ainsi que le nombre de
+    requêtes en cours. Placé sous `RequestLoggingMiddleware`, il réutilise le
+    contexte de requête de celui-ci ; seul, il crée le sien.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = current_request.get()
+        token = None
+        if context is None:
+            context = RequestContext(None, scope["method"], scope["path"])
+            token = current_request.set(context)
+        method = scope["method"]
+        started = context.elapsed
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.http_requests_in_progress.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            metrics.http_requests_in_progress.dec(method=method)
+            route = route_template(scope)
+            metrics.http_requests_total.inc(method=method, route=route, status=str(status_code))
+            metrics.http_request_duration_seconds.observe(context.elapsed - started, method=method, route=route)
+            metrics.http_request_db_queries.observe(context.db_queries, route=route)
+            metrics.http_request_db_duration_seconds.observe(context.db_time, route=route)
+            if token is not None:
+                current_request.reset(token)
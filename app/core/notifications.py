@@ -1,11 +1,12 @@
-import smtplib
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Optional, Dict, Any
-import requests
 from app.core.config import settings
 from app.core.exceptions import NotificationException
 from app.core.logging import get_logger
+from app.core.sms import SMSClient
+from app.core.smtp import SMTPConnectionPool
 
 logger = get_logger(__name__)
 
@@ -26,8 +27,32 @@ class NotificationManager:
             "api_key": settings.SMS_API_KEY,
             "from_number": settings.SMS_FROM_NUMBER
         }
+        self.smtp_pool = SMTPConnectionPool(
+            host=self.smtp_settings["host"],
+            port=self.smtp_settings["port"],
+            username=self.smtp_settings["username"],
+            password=self.smtp_settings["password"],
+            tls=self.smtp_settings["tls"],
+            size=settings.SMTP_POOL_SIZE,
+            timeout=settings.SMTP_TIMEOUT,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            idle_timeout=settings.SMTP_IDLE_TIMEOUT
+        )
+        self.sms_client = SMSClient(
+            base_url=settings.SMS_API_URL or f"https://api.{self.sms_settings['provider']}.com",
+            api_key=self.sms_settings["api_key"],
+            pool_size=settings.SMS_POOL_SIZE,
+            connect_timeout=settings.SMS_CONNECT_TIMEOUT,
+            read_timeout=settings.SMS_READ_TIMEOUT,
+            max_retries=settings.SMS_MAX_RETRIES,
+            backoff=settings.SMS_RETRY_BACKOFF,
+            backoff_max=settings.SMS_RETRY_BACKOFF_MAX,
+            batch_path=settings.SMS_BATCH_PATH,
+            batch_size=settings.SMS_BATCH_SIZE,
+            idempotency_header=settings.SMS_IDEMPOTENCY_HEADER
+        )
     
-    def _create_email_message(
+    def create_email_message(
         self,
         to_email: str,
         subject: str,
@@ -81,22 +106,10 @@ class NotificationManager:
         """
         try:
             # Créer le message
-            message = self._create_email_message(to_email, subject, body, html_body)
+            message = self.create_email_message(to_email, subject, body, html_body)
             
-            # Configurer la connexion SMTP
-            with smtplib.SMTP(self.smtp_settings["host"], self.smtp_settings["port"]) as server:
-                if self.smtp_settings["tls"]:
-                    server.starttls()
-                
-                # Authentification
-                if self.smtp_settings["username"] and self.smtp_settings["password"]:
-                    server.login(
-                        self.smtp_settings["username"],
-                        self.smtp_settings["password"]
-                    )
-                
-                # Envoyer l'email
-                server.send_message(message)
+            # Envoyer l'email sur une connexion persistante du pool
+            self.smtp_pool.send(message)
             
             logger.info(f"Email envoyé à {to_email}")
             
@@ -104,6 +117,39 @@ class NotificationManager:
             logger.error(f"Erreur lors de l'envoi de l'email : {str(e)}")
             raise NotificationException(f"Erreur lors de l'envoi de l'email : {str(e)}")
     
+    def create_sms_payload(
+        self,
+        to_number: str,
+        message: str,
+        template_id: Optional[str] = None,
+        template_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Crée le corps d'une requête d'envoi de SMS.
+        
+        Args:
+            to_number: Numéro de téléphone du destinataire
+            message: Message à envoyer
+            template_id: ID du template (optionnel)
+            template_data: Données pour le template (optionnel)
+            
+        Returns:
+            Dict[str, Any]: Corps de la requête
+        """
+        data = {
+            "to": to_number,
+            "from": self.sms_settings["from_number"],
+            "message": message
+        }
+        
+        if template_id:
+            data["template_id"] = template_id
+        
+        if template_data:
+            data["template_data"] = template_data
+        
+        return data
+    
     def send_sms(
         self,
         to_number: str,
@@ -124,31 +170,8 @@ class NotificationManager:
             NotificationException: Si une erreur survient lors de l'envoi
         """
         try:
-            # Préparer les données de la requête
-            data = {
-                "to": to_number,
-                "from": self.sms_settings["from_number"],
-                "message": message
-            }
-            
-            if template_id:
-                data["template_id"] = template_id
-            
-            if template_data:
-                data["template_data"] = template_data
-            
-            # Envoyer la requête à l'API du fournisseur SMS
-            response = requests.post(
-                f"https://api.{self.sms_settings['provider']}.com/sms/send",
-                json=data,
-                headers={
-                    "Authorization": f"Bearer {self.sms_settings['api_key']}",
-                    "Content-Type": "application/json"
-                }
-            )
-            
-            # Vérifier la réponse
-            response.raise_for_status()
+            # Envoyer la requête à l'API du fournisseur SMS (connexion réutilisée)
+            self.sms_client.send(self.create_sms_payload(to_number, message, template_id, template_data))
             
             logger.info(f"SMS envoyé à {to_number}")
             
@@ -199,11 +222,18 @@ class NotificationManager:
         subject: Optional[str] = None,
         html_message: Optional[str] = None,
         template_id: Optional[str] = None,
-        template_data: Optional[Dict[str, Any]] = None
-    ) -> None:
+        template_data: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, int]:
         """
         Envoie une notification à plusieurs destinataires.
         
+        Les emails sont répartis en lots de `NOTIFICATION_BULK_BATCH_SIZE`
+        messages, chaque lot étant envoyé sur une seule connexion du pool ;
+        les SMS passent par le client HTTP partagé, par lots si le fournisseur
+        expose un endpoint d'envoi groupé. Un échec n'interrompt
+        pas l'envoi aux autres destinataires.
+        
         Args:
             message: Message à envoyer
             recipients: Liste des destinataires avec leurs coordonnées
@@ -211,25 +241,57 @@ class NotificationManager:
             html_message: Message HTML pour l'email (optionnel)
             template_id: ID du template SMS (optionnel)
             template_data: Données pour le template SMS (optionnel)
+            max_workers: Envois simultanés (défaut : NOTIFICATION_BULK_WORKERS)
             
-        Raises:
-            NotificationException: Si une erreur survient lors de l'envoi
+        Returns:
+            Dict[str, int]: Nombre d'emails et de SMS envoyés et en échec
         """
-        for recipient in recipients:
-            try:
-                self.send_notification(
-                    message=message,
-                    to_email=recipient.get("email"),
-                    to_number=recipient.get("phone"),
-                    subject=subject,
-                    html_message=html_message,
-                    template_id=template_id,
-                    template_data=template_data
-                )
-            except Exception as e:
-                logger.error(f"Erreur lors de l'envoi de la notification : {str(e)}")
-                # Continuer avec les autres destinataires
-                continue
+        emails = [
+            self.create_email_message(recipient["email"], subject, message, html_message)
+            for recipient in recipients
+            if recipient.get("email") and subject
+        ]
+        sms_payloads = [
+            self.create_sms_payload(recipient["phone"], message, template_id, template_data)
+            for recipient in recipients
+            if recipient.get("phone")
+        ]
+        unreachable = sum(1 for recipient in recipients if not recipient.get("email") and not recipient.get("phone"))
+        if unreachable:
+            logger.warning(f"{unreachable} destinataires sans email ni téléphone ignorés")
+        
+        batch_size = settings.NOTIFICATION_BULK_BATCH_SIZE
+        batches = [emails[i:i + batch_size] for i in range(0, len(emails), batch_size)]
+        
+        workers = max_workers or settings.NOTIFICATION_BULK_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Les SMS partent en parallèle des emails, sur le pool HTTP du client
+            sms_future = executor.submit(self.sms_client.send_many, sms_payloads, workers)
+            email_failures = [
+                failure
+                for failures in executor.map(self.smtp_pool.send_many, batches)
+                for failure in failures
+            ]
+            sms_failures = sms_future.result()
+        
+        for email, error in email_failures:
+            logger.error(f"Erreur lors de l'envoi de l'email à {email['To']} : {str(error)}")
+        for payload, error in sms_failures:
+            logger.error(f"Erreur lors de l'envoi du SMS à {payload['to']} : {str(error)}")
+        
+        report = {
+            "emails_sent": len(emails) - len(email_failures),
+            "emails_failed": len(email_failures),
+            "sms_sent": len(sms_payloads) - len(sms_failures),
+            "sms_failed": len(sms_failures)
+        }
+        logger.info(f"Notification groupée : {report}")
+        return report
+    
+    def close(self) -> None:
+        """Ferme les connexions persistantes."""
+        self.smtp_pool.close()
+        self.sms_client.close()
 
 # Instance globale du gestionnaire de notifications
 notification_manager = NotificationManager() 
\ No newline at end of file
@@ -0,0 +1,303 @@
+import hashlib
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import Message
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.notifications import NotificationManager, notification_manager
+from app.core.sms import SMSDeliveryUncertain
+from app.models.notification import NotificationChannel, OutboxNotification, OutboxStatus
+
+logger = get_logger(__name__)
+
+def notification_rows(
+    idempotency_key: str,
+    message: str,
+    to_email: Optional[str] = None,
+    to_number: Optional[str] = None,
+    subject: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Prépare les lignes d'outbox d'une notification (un email et/ou un SMS).
+
+    Mêmes règles que `NotificationManager.send_notification` : l'email n'est
+    envoyé que si un sujet est fourni.
+
+    Args:
+        idempotency_key: Clé unique de la notification (suffixée par canal)
+        message: Message à envoyer
+        to_email: Adresse email du destinataire (optionnel)
+        to_number: Numéro de téléphone du destinataire (optionnel)
+        subject: Sujet de l'email (optionnel)
+
+    Returns:
+        List[Dict[str, Any]]: Lignes à insérer avec `enqueue_notifications`
+    """
+    now = datetime.utcnow()
+    rows = []
+    if to_email and subject:
+        rows.append({
+            "channel": NotificationChannel.EMAIL, "recipient": to_email, "subject": subject,
+            "body": message, "idempotency_key": f"{idempotency_key}:email", "next_attempt_at": now
+        })
+    if to_number:
+        rows.append({
+            "channel": NotificationChannel.SMS, "recipient": to_number, "subject": None,
+            "body": message, "idempotency_key": f"{idempotency_key}:sms", "next_attempt_at": now
+        })
+    return rows
+
+def enqueue_notifications(db: Session, rows: Sequence[Dict[str, Any]]) -> None:
+    """
+    Insère des notifications dans l'outbox en une seule requête.
+
+    L'insertion a lieu dans la transaction de l'appelant ; les lignes dont la
+    clé d'idempotence existe déjà sont ignorées, ce qui rend les producteurs
+    rejouables sans doublon.
+
+    Args:
+        db: Session de base de données
+        rows: Lignes préparées par `notification_rows`
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        existing = {
+            key for (key,) in db.query(OutboxNotification.idempotency_key).filter(
+                OutboxNotification.idempotency_key.in_([row["idempotency_key"] for row in rows])
+            )
+        }
+        db.bulk_insert_mappings(
+            OutboxNotification, [row for row in rows if row["idempotency_key"] not in existing]
+        )
+        return
+    statement = insert(OutboxNotification.__table__).on_conflict_do_nothing(index_elements=["idempotency_key"])
+    db.execute(statement, list(rows))
+
+class NotificationDispatcher:
+    """
+    Livre les notifications de l'outbox.
+
+    Chaque lot est d'abord réservé dans une transaction courte : les lignes,
+    verrouillées par `FOR UPDATE SKIP LOCKED` sous PostgreSQL, passent au
+    statut SENDING avec un bail (`next_attempt_at`) afin que plusieurs
+    dispatchers se partagent la file sans double envoi. La livraison a lieu
+    hors transaction, sans immobiliser de connexion, puis les résultats sont
+    enregistrés dans une seconde transaction courte. Un lot dont le dispatcher
+    s'est arrêté en cours de livraison est repris à l'expiration du bail.
+
+    Les emails et les SMS sont envoyés en parallèle, chaque canal avec sa
+    propre concurrence. Un envoi en échec est reprogrammé avec un backoff
+    exponentiel, puis placé en lettre morte après `max_attempts` tentatives ;
+    une exception levée par un canal compte comme l'échec de chacune de ses
+    lignes, sans empêcher d'enregistrer les envois de l'autre canal.
+    """
+
+    def __init__(
+        self,
+        manager: NotificationManager = notification_manager,
+        batch_size: int = settings.OUTBOX_BATCH_SIZE,
+        email_concurrency: int = settings.OUTBOX_EMAIL_CONCURRENCY,
+        sms_concurrency: int = settings.OUTBOX_SMS_CONCURRENCY,
+        max_attempts: int = settings.OUTBOX_MAX_ATTEMPTS,
+        retry_backoff: float = settings.OUTBOX_RETRY_BACKOFF_SECONDS,
+        retry_backoff_max: float = settings.OUTBOX_RETRY_BACKOFF_MAX_SECONDS,
+        lease: float = settings.OUTBOX_LEASE_SECONDS
+    ):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.email_concurrency = email_concurrency
+        self.sms_concurrency = sms_concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.lease = lease
+
+    def _deliver(
+        self,
+        send: Callable[[List[OutboxNotification]], Dict[int, Exception]],
+        rows: List[OutboxNotification]
+    ) -> Dict[int, Exception]:
+        """Livre les lignes d'un canal ; une exception du canal devient l'échec de chacune de ses lignes."""
+        try:
+            return send(rows)
+        except Exception as e:
+            logger.exception(f"Échec de livraison de {len(rows)} notifications : {e}")
+            return {row.id: e for row in rows}
+
+    def _send_emails(self, rows: List[OutboxNotification]) -> Dict[int, Exception]:
+        if not rows:
+            return {}
+        messages = {}
+        for row in rows:
+            message = self.manager.create_email_message(row.recipient, row.subject, row.body)
+            # Message-ID stable : le relais peut écarter un renvoi après une reprise
+            digest = hashlib.sha1(row.idempotency_key.encode()).hexdigest()
+            message["Message-ID"] = f"<{digest}@outbox>"
+            messages[id(message)] = (row, message)
+        batch_size = settings.NOTIFICATION_BULK_BATCH_SIZE
+        ordered = [message for _, message in messages.values()]
+        batches = [ordered[i:i + batch_size] for i in range(0, len(ordered), batch_size)]
+
+        def send_batch(batch: List[Message]) -> List[Tuple[Message, Exception]]:
+            # Une exception n'efface pas les envois des autres lots
+            try:
+                return self.manager.smtp_pool.send_many(batch)
+            except Exception as e:
+                logger.exception(f"Échec de livraison de {len(batch)} emails : {e}")
+                return [(message, e) for message in batch]
+
+        with ThreadPoolExecutor(max_workers=min(self.email_concurrency, len(batches))) as executor:
+            failures = [
+                failure
+                for batch_failures in executor.map(send_batch, batches)
+                for failure in batch_failures
+            ]
+        return {messages[id(message)][0].id: error for message, error in failures}
+
+    def _send_sms(self, rows: List[OutboxNotification]) -> Dict[int, Exception]:
+        if not rows:
+            return {}
+        payloads = {}
+        for row in rows:
+            payload = self.manager.create_sms_payload(row.recipient, row.body)
+            payload["idempotency_key"] = row.idempotency_key
+            payloads[id(payload)] = (row, payload)
+        failures = self.manager.sms_client.send_many(
+            [payload for _, payload in payloads.values()], max_workers=self.sms_concurrency
+        )
+        return {payloads[id(payload)][0].id: error for payload, error in failures}
+
+    def _retry_delay(self, attempts: int) -> timedelta:
+        ceiling = min(self.retry_backoff_max, self.retry_backoff * 2 ** (attempts - 1))
+        return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+    def claim_batch(self, db: Session) -> List[OutboxNotification]:
+        """
+        Réserve un lot de notifications échues (ou dont le bail a expiré).
+
+        Les lignes passent au statut SENDING, leur tentative est comptée et le
+        bail court jusqu'à `next_attempt_at` ; la transaction est validée avant
+        la livraison. Une ligne reprise après expiration du bail alors qu'elle a
+        épuisé ses `max_attempts` tentatives (dispatcher arrêté à chaque
+        livraison) passe en lettre morte au lieu d'être réservée à nouveau.
+
+        Args:
+            db: Session de base de données
+
+        Returns:
+            List[OutboxNotification]: Notifications réservées (SENDING) ou
+                abandonnées (DEAD), détachées de la session
+        """
+        now = datetime.utcnow()
+        rows = db.query(OutboxNotification).filter(
+            OutboxNotification.status.in_([OutboxStatus.PENDING, OutboxStatus.SENDING]),
+            OutboxNotification.next_attempt_at <= now
+        ).order_by(
+            OutboxNotification.next_attempt_at, OutboxNotification.id
+        ).limit(self.batch_size).with_for_update(skip_locked=True).all()
+        for row in rows:
+            if row.status == OutboxStatus.SENDING:
+                logger.warning(f"Notification {row.idempotency_key} reprise après expiration du bail")
+            if row.attempts >= self.max_attempts:
+                row.status = OutboxStatus.DEAD
+                row.last_error = f"Bail expiré après {row.attempts} tentatives"
+                logger.error(f"Notification {row.idempotency_key} abandonnée : {row.last_error}")
+                continue
+            row.status = OutboxStatus.SENDING
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=self.lease)
+        db.flush()
+        # Détachées avant la validation : leurs attributs restent lisibles sans nouvelle requête
+        for row in rows:
+            db.expunge(row)
+        db.commit()
+        return rows
+
+    def dispatch_batch(self, db: Session) -> Dict[str, int]:
+        """
+        Réserve, livre puis enregistre le statut d'un lot de notifications.
+
+        Args:
+            db: Session de base de données
+
+        Returns:
+            Dict[str, int]: Notifications traitées, envoyées, reprogrammées et en lettre morte
+        """
+        claimed = self.claim_batch(db)
+        rows = [row for row in claimed if row.status == OutboxStatus.SENDING]
+        report = {"processed": len(claimed), "sent": 0, "retried": 0, "dead": len(claimed) - len(rows)}
+        if not rows:
+            return report
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            emails = executor.submit(
+                self._deliver, self._send_emails, [row for row in rows if row.channel == NotificationChannel.EMAIL]
+            )
+            sms = executor.submit(
+                self._deliver, self._send_sms, [row for row in rows if row.channel == NotificationChannel.SMS]
+            )
+            failures = {**emails.result(), **sms.result()}
+
+        now = datetime.utcnow()
+        updates = []
+        for row in rows:
+            error = failures.get(row.id)
+            if error is None:
+                updates.append({
+                    "id": row.id, "status": OutboxStatus.SENT, "sent_at": now, "last_error": None
+                })
+                report["sent"] += 1
+            elif row.attempts >= self.max_attempts or isinstance(error, SMSDeliveryUncertain):
+                # Un SMS peut-être déjà envoyé n'est pas rejoué (risque de doublon)
+                updates.append({"id": row.id, "status": OutboxStatus.DEAD, "last_error": str(error)})
+                report["dead"] += 1
+                logger.error(f"Notification {row.idempotency_key} abandonnée : {error}")
+            else:
+                updates.append({
+                    "id": row.id, "status": OutboxStatus.PENDING, "last_error": str(error),
+                    "next_attempt_at": now + self._retry_delay(row.attempts)
+                })
+                report["retried"] += 1
+        db.bulk_update_mappings(OutboxNotification, updates)
+        db.commit()
+        return report
+
+    def drain(self, session_factory: sessionmaker) -> Dict[str, int]:
+        """
+        Livre les notifications échues jusqu'à épuisement, un lot par transaction.
+
+        Args:
+            session_factory: Fabrique des sessions (une par lot)
+
+        Returns:
+            Dict[str, int]: Totaux cumulés des lots
+        """
+        start = time.perf_counter()
+        totals = {"processed": 0, "sent": 0, "retried": 0, "dead": 0}
+        while True:
+            with session_factory() as db:
+                report = self.dispatch_batch(db)
+            for key, value in report.items():
+                totals[key] += value
+            if report["processed"] < self.batch_size:
+                break
+        if totals["processed"]:
+            logger.info(
+                f"Outbox : {totals} en {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+        return totals
+
+# Instance globale du dispatcher
+notification_dispatcher = NotificationDispatcher()
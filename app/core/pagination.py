@@ -0,0 +1,162 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+T = TypeVar("T")
+
+# En-têtes de réponse portant les informations de pagination
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+class Page(Generic[T]):
+    """Page de résultats avec le curseur de la page suivante."""
+
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None, total: Optional[int] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Curseur de pagination invalide"
+    )
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "value"):  # Enum
+        return value.value
+    return value
+
+def _deserialize(column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(sort: str, sort_value: Any, last_id: int) -> str:
+    """
+    Encode la position du dernier élément d'une page en un curseur opaque.
+
+    Args:
+        sort: Nom de la clé de tri
+        sort_value: Valeur de la clé de tri du dernier élément
+        last_id: Identifiant du dernier élément
+
+    Returns:
+        str: Curseur encodé en base64 (URL-safe)
+    """
+    payload = json.dumps({"s": sort, "v": _serialize(sort_value), "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Décode un curseur produit par `encode_cursor`.
+
+    Raises:
+        HTTPException: Si le curseur est mal formé
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict) or not {"s", "v", "id"} <= payload.keys():
+            raise ValueError(cursor)
+        return payload
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise _invalid_cursor()
+
+def paginate(
+    query: Query,
+    *,
+    id_column,
+    sort_columns: Dict[str, Any],
+    sort: str = "id",
+    limit: int = 100,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    columns: Optional[Sequence[Any]] = None
+) -> Page:
+    """
+    Pagine une requête par curseur (keyset) ou, à défaut, par offset.
+
+    Les résultats sont triés par (clé de tri, id). Avec un curseur, seules les
+    lignes situées après la dernière ligne de la page précédente sont lues,
+    ce qui garde un coût constant quelle que soit la profondeur de la page.
+    Le total n'est calculé que si `include_total` est demandé.
+
+    Args:
+        query: Requête filtrée à paginer
+        id_column: Colonne identifiant (départage les égalités de tri)
+        sort_columns: Clés de tri autorisées et colonnes correspondantes
+        sort: Clé de tri demandée
+        limit: Nombre maximum d'éléments
+        skip: Nombre d'éléments à sauter (mode offset, ignoré avec un curseur)
+        cursor: Curseur renvoyé par la page précédente
+        include_total: Calcule le nombre total de résultats
+        columns: Projette la requête sur ces colonnes (tuples au lieu d'objets ORM) ;
+            la clé de tri et l'identifiant sont ajoutés en fin de tuple s'ils manquent
+
+    Returns:
+        Page: Éléments, curseur suivant (None sur la dernière page) et total éventuel
+
+    Raises:
+        HTTPException: Si la clé de tri ou le curseur sont invalides
+    """
+    if sort not in sort_columns:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tri non supporté. Valeurs autorisées : {', '.join(sort_columns)}"
+        )
+    sort_column = sort_columns[sort]
+
+    total = query.order_by(None).count() if include_total else None
+    if columns is not None:
+        selected = {column.key for column in columns}
+        missing = [column for column in (sort_column, id_column) if column.key not in selected]
+        query = query.with_entities(*columns, *dict.fromkeys(missing))
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position["s"] != sort:
+            raise _invalid_cursor()
+        try:
+            last_id = int(position["id"])
+            if sort_column is id_column:
+                query = query.filter(id_column > last_id)
+            else:
+                last_value = _deserialize(sort_column, position["v"])
+                query = query.filter(tuple_(sort_column, id_column) > tuple_(last_value, last_id))
+        except (TypeError, ValueError):
+            raise _invalid_cursor()
+
+    if sort_column is id_column:
+        query = query.order_by(id_column)
+    else:
+        query = query.order_by(sort_column, id_column)
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort_column.key), getattr(last, id_column.key))
+    return Page(rows, next_cursor, total)
+
+def set_page_headers(response: Response, page: Page) -> None:
+    """Expose le curseur suivant et le total éventuel dans les en-têtes de la réponse."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
@@ -0,0 +1,255 @@
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.middleware import route_template
+
+logger = get_logger(__name__)
+
+# Modules dans lesquels un thread est considéré comme inactif (attente d'un verrou,
+# d'une file ou d'entrées/sorties réseau de la boucle d'événements)
+_IDLE_MODULES = ("threading", "queue", "selectors", "concurrent.futures.thread")
+
+MAX_STACK_DEPTH = 128
+
+def collapse_stack(frame) -> Optional[str]:
+    """
+    Convertit une pile d'exécution au format « folded » (racine d'abord,
+    frames séparées par `;`).
+
+    Args:
+        frame: Frame la plus récente du thread
+
+    Returns:
+        Optional[str]: Pile repliée, ou None si le thread est inactif
+    """
+    if frame is None or frame.f_globals.get("__name__") in _IDLE_MODULES:
+        return None
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    return ";".join(reversed(names)).replace(" ", "_")
+
+class ProfileSession:
+    """
+    Échantillons de piles collectés pendant une requête profilée.
+
+    Args:
+        thread: Thread exécutant la requête
+        task: Tâche asyncio de la requête, si elle s'exécute dans une boucle d'événements
+    """
+
+    def __init__(self, thread: int, task: Optional[asyncio.Task] = None):
+        self.thread = thread
+        self.task = task
+        self.loop = task.get_loop() if task is not None else None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def active(self) -> bool:
+        """Indique si la requête s'exécute, et non une autre tâche de la même boucle."""
+        return self.task is None or asyncio.current_task(self.loop) is self.task
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+class SamplingProfiler:
+    """
+    Profileur statistique : un thread relève périodiquement (`sys._current_frames`)
+    la pile du thread de chaque session en cours.
+
+    Une session ne relève que le thread qui l'a ouverte, et seulement pendant
+    que la tâche asyncio de sa requête s'exécute : les autres requêtes servies
+    par la même boucle d'événements ou par le pool de threads n'apparaissent
+    pas dans son profil. Le code délégué à un autre thread (endpoints
+    synchrones, hachage des mots de passe) n'y apparaît pas non plus ; les
+    requêtes SQL passées par `run_sync` s'exécutent dans la tâche et sont
+    relevées.
+
+    Le thread ne tourne que pendant les sessions ; le coût pour le code profilé
+    se limite à la lecture des frames toutes les `interval` secondes.
+    """
+
+    def __init__(self, interval: float = settings.PROFILING_INTERVAL_MS / 1000):
+        self.interval = interval
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> ProfileSession:
+        """Ouvre une session sur le thread et la tâche appelants, et démarre l'échantillonnage si nécessaire."""
+        session = ProfileSession(threading.get_ident(), _current_task())
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession) -> None:
+        """Ferme une session ; l'échantillonnage s'arrête avec la dernière."""
+        with self._lock:
+            self._sessions.remove(session)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            running = [session.active() for session in sessions]
+            frames = sys._current_frames()
+            for session, was_running in zip(sessions, running):
+                session.samples += 1
+                # Tâche en cours avant et après la lecture des frames : la pile est bien la sienne
+                if not (was_running and session.active()):
+                    continue
+                stack = collapse_stack(frames.get(session.thread))
+                if stack is not None:
+                    session.stacks[stack] += 1
+            time.sleep(self.interval)
+
+class ProfileStore:
+    """
+    Profils agrégés par route, écrits au format « folded » (flamegraph.pl,
+    speedscope) dans `directory`.
+
+    Chaque processus écrit ses propres fichiers (`<route>.<pid>.folded`) ; la
+    lecture fusionne ceux de tous les workers. Chaque ligne commence par la
+    route, ce qui permet de concaténer plusieurs profils.
+    """
+
+    def __init__(self, directory: Path = settings.PROFILING_DIR):
+        self.directory = Path(directory)
+        self._profiles: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def slug(route: str) -> str:
+        """Nom de fichier d'une route (ex. "GET_api_v1_properties")."""
+        return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+    @staticmethod
+    def _root(route: str) -> str:
+        return route.replace(" ", "_").replace(";", "_")
+
+    def add(self, route: str, stacks: Counter) -> None:
+        """
+        Ajoute les piles d'une requête au profil de sa route et réécrit le fichier.
+
+        Args:
+            route: Méthode et modèle de route (ex. "GET /api/v1/properties/")
+            stacks: Nombre d'échantillons par pile repliée
+        """
+        if not stacks:
+            return
+        with self._lock:
+            profile = self._profiles.setdefault(route, Counter())
+            profile.update(stacks)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            root = self._root(route)
+            path = self.directory / f"{self.slug(route)}.{os.getpid()}.folded"
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(
+                "".join(f"{root};{stack} {count}\n" for stack, count in profile.most_common()),
+                encoding="utf-8"
+            )
+            os.replace(temporary, path)
+
+    def load(self, route: Optional[str] = None) -> Counter:
+        """
+        Fusionne les profils écrits par tous les processus.
+
+        Args:
+            route: Route à charger (toutes si None)
+
+        Returns:
+            Counter: Nombre d'échantillons par pile repliée (route en racine)
+        """
+        pattern = f"{self.slug(route)}.*.folded" if route else "*.folded"
+        prefix = f"{self._root(route)};" if route else ""
+        profile: Counter = Counter()
+        for path in sorted(self.directory.glob(pattern)):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                stack, _, count = line.rpartition(" ")
+                if stack.startswith(prefix) and count.isdigit():
+                    profile[stack] += int(count)
+        return profile
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Liste les routes profilées et leur nombre d'échantillons."""
+        samples: Counter = Counter()
+        for stack, count in self.load().items():
+            samples[stack.split(";", 1)[0].replace("_", " ", 1)] += count
+        return [{"route": route, "samples": count} for route, count in samples.most_common()]
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI profilant une fraction des requêtes.
+
+    Une requête est profilée avec la probabilité `sample_rate`, ou à coup sûr
+    si elle porte l'en-tête `PROFILING_HEADER` avec le jeton `PROFILING_TOKEN`
+    (réservé aux administrateurs). Ses piles sont ajoutées au profil de sa
+    route une fois la réponse envoyée.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        token: Optional[str] = None,
+        profiler: Optional[SamplingProfiler] = None,
+        store: Optional[ProfileStore] = None
+    ):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.token = (settings.PROFILING_TOKEN if token is None else token) or None
+        self.header = settings.PROFILING_HEADER.lower().encode()
+        self.profiler = profiler or sampling_profiler
+        self.store = store or profile_store
+
+    def _requested(self, scope: Scope) -> bool:
+        if self.token is None:
+            return False
+        value = next((value for name, value in scope["headers"] if name == self.header), None)
+        return value is not None and hmac.compare_digest(value, self.token.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (random.random() < self.sample_rate or self._requested(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        session = self.profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.stop(session)
+            route = f"{scope['method']} {route_template(scope)}"
+            try:
+                await run_in_threadpool(self.store.add, route, session.stacks)
+            except OSError as e:
+                logger.error(f"Écriture du profil {route} impossible : {e}")
+
+# Instances globales du profileur et des profils agrégés
+sampling_profiler = SamplingProfiler()
+profile_store = ProfileStore()
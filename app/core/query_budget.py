@@ -0,0 +1,174 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.middleware import route_template
+from app.core.request_context import RequestContext, current_request
+
+logger = get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\?|%\(\w+\)s|%s|\$\d+|:\w+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """
+    Réduit une requête SQL à sa forme : littéraux et paramètres remplacés par
+    `?`, listes `IN (...)` ramenées à un seul élément.
+
+    Args:
+        statement: Texte SQL exécuté
+
+    Returns:
+        str: Forme de la requête
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryReport:
+    """Requêtes SQL exécutées pendant une requête HTTP ou un bloc `track_queries`."""
+
+    def __init__(self, route: str, context: RequestContext):
+        self.route = route
+        self.count = context.db_queries
+        self.time = context.db_time
+        self.shapes: Counter = Counter()
+        for statement, executions in (context.statements or {}).items():
+            self.shapes[statement_shape(statement)] += executions
+
+    def executions(self, prefix: str = "") -> int:
+        """Nombre de requêtes dont la forme commence par `prefix` (ex. "INSERT")."""
+        return sum(count for shape, count in self.shapes.items() if shape.upper().startswith(prefix.upper()))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Formes exécutées au moins `threshold` fois, les plus fréquentes d'abord."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def describe(self) -> str:
+        lines = [f"{self.route} : {self.count} requêtes SQL en {self.time * 1000:.1f} ms"]
+        lines.extend(f"  {count} x {shape}" for shape, count in self.shapes.most_common(5))
+        return "\n".join(lines)
+
+class QueryBudgetExceeded(AssertionError):
+    """Levée en mode strict quand une requête dépasse son budget ou répète une même requête SQL."""
+
+    def __init__(self, report: QueryReport, reasons: List[str]):
+        self.report = report
+        self.reasons = reasons
+        super().__init__("; ".join(reasons) + "\n" + report.describe())
+
+class QueryBudget:
+    """
+    Budgets de requêtes SQL par modèle de route et détection des N+1.
+
+    Une requête est en infraction si elle exécute plus de requêtes SQL que le
+    budget de sa route (ou `default`), ou si une même forme de requête est
+    répétée au moins `repeat_threshold` fois, signe d'un chargement paresseux
+    dans une boucle.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        default: Optional[int] = None,
+        repeat_threshold: Optional[int] = None
+    ):
+        self.budgets = settings.QUERY_BUDGETS if budgets is None else budgets
+        self.default = settings.QUERY_BUDGET_DEFAULT if default is None else default
+        self.repeat_threshold = settings.QUERY_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+
+    def violations(self, report: QueryReport) -> List[str]:
+        """
+        Liste les infractions d'un relevé de requêtes.
+
+        Args:
+            report: Relevé de la requête
+
+        Returns:
+            List[str]: Infractions (vide si le budget est respecté)
+        """
+        reasons = []
+        budget = self.budgets.get(report.route, self.default)
+        if budget is not None and report.count > budget:
+            reasons.append(f"{report.count} requêtes SQL pour un budget de {budget}")
+        if self.repeat_threshold:
+            for shape, count in report.repeated(self.repeat_threshold):
+                reasons.append(f"requête répétée {count} fois (N+1 probable) : {shape}")
+        return reasons
+
+@contextmanager
+def track_queries(route: str = "<block>") -> Iterator[List[QueryReport]]:
+    """
+    Relève les requêtes SQL exécutées dans le bloc, hors requête HTTP.
+
+    Le relevé est ajouté à la liste produite à la sortie du bloc.
+
+    Example:
+        ```python
+        with track_queries() as reports:
+            PaymentService.get_payments(db)
+        assert reports[0].count <= 2
+        ```
+    """
+    context = RequestContext(method="", path=route)
+    context.statements = Counter()
+    token = current_request.set(context)
+    reports: List[QueryReport] = []
+    try:
+        yield reports
+    finally:
+        current_request.reset(token)
+        reports.append(QueryReport(route, context))
+
+class QueryBudgetMiddleware:
+    """
+    Middleware ASGI de contrôle des requêtes SQL par requête HTTP.
+
+    À activer en développement et en CI (`QUERY_BUDGET_ENABLED`) : le suivi
+    des formes de requête a un coût. Les infractions sont journalisées ; en
+    mode strict, `QueryBudgetExceeded` est levée une fois la réponse envoyée,
+    ce qui fait échouer le test qui a émis la requête.
+    """
+
+    def __init__(self, app: ASGIApp, budget: Optional[QueryBudget] = None, strict: Optional[bool] = None):
+        self.app = app
+        self.budget = budget or QueryBudget()
+        self.strict = settings.QUERY_BUDGET_STRICT if strict is None else strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = current_request.get()
+        token = None
+        if context is None:
+            context = RequestContext(None, scope["method"], scope["path"])
+            token = current_request.set(context)
+        context.statements = Counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if token is not None:
+                current_request.reset(token)
+
+        report = QueryReport(route_template(scope), context)
+        reasons = self.budget.violations(report)
+        if not reasons:
+            return
+        logger.warning(
+            "query budget exceeded",
+            extra={"route": report.route, "db_queries": report.count, "violations": reasons}
+        )
+        if self.strict:
+            raise QueryBudgetExceeded(report, reasons)
@@ -0,0 +1,48 @@
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+class RequestContext:
+    """Informations propres à la requête HTTP en cours."""
+
+    __slots__ = ("request_id", "method", "path", "route", "started", "db_queries", "db_time", "statements")
+
+    def __init__(self, request_id: Optional[str] = None, method: str = "", path: str = ""):
+        self.request_id = request_id or uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0  # secondes
+        # Nombre d'exécutions par forme de requête SQL, tenu seulement si activé
+        self.statements: Optional[Counter] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Durée écoulée depuis le début de la requête, en secondes."""
+        return time.perf_counter() - self.started
+
+# Contexte de la requête en cours (propagé aux threads et greenlets de la requête)
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+def get_request_context() -> Optional[RequestContext]:
+    """Retourne le contexte de la requête en cours, ou None hors requête."""
+    return current_request.get()
+
+def record_query(elapsed: float, statement: Optional[str] = None) -> None:
+    """
+    Impute une requête SQL à la requête HTTP en cours.
+
+    Args:
+        elapsed: Durée d'exécution en secondes
+        statement: Texte SQL exécuté (compté par forme si le suivi est activé)
+    """
+    context = current_request.get()
+    if context is not None:
+        context.db_queries += 1
+        context.db_time += elapsed
+        if context.statements is not None and statement is not None:
+            context.statements[statement] += 1
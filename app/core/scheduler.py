@@ -1,37 +1,121 @@
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, sessionmaker
 import pytz
+from app.core import metrics
 from app.core.logging import get_logger
-from app.core.notifications import notification_manager
-from app.models.contract import Contract
-from app.models.payment import Payment
-from app.models.maintenance import MaintenanceRequest
+from app.core.outbox import enqueue_notifications, notification_dispatcher, notification_rows
+from app.models.contract import Contract, ContractStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.maintenance import MaintenanceRequest, MaintenanceStatus
+from app.models.property import Property
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.payment import PaymentService
 
 logger = get_logger(__name__)
 
 # Configure timezone
 timezone = pytz.timezone('Europe/Paris')
 
+class JobRun:
+    """Compteurs d'une exécution de tâche planifiée et notifications à mettre en file."""
+
+    def __init__(self, name: str, db: Session):
+        self.name = name
+        self.db = db
+        self.rows = 0
+        self.notifications = 0
+        self._pending: List[Dict[str, Any]] = []
+
+    def notify(
+        self,
+        key: str,
+        message: str,
+        to_email: Optional[str] = None,
+        to_number: Optional[str] = None,
+        subject: Optional[str] = None
+    ) -> None:
+        """
+        Ajoute une notification à l'outbox (insérée par lots).
+
+        Args:
+            key: Clé d'idempotence de la notification
+            message: Message à envoyer
+            to_email: Adresse email du destinataire (optionnel)
+            to_number: Numéro de téléphone du destinataire (optionnel)
+            subject: Sujet de l'email (optionnel)
+        """
+        rows = notification_rows(key, message, to_email, to_number, subject)
+        self._pending.extend(rows)
+        self.notifications += len(rows)
+        if len(self._pending) >= settings.SCHEDULER_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insère les notifications en attente dans l'outbox."""
+        enqueue_notifications(self.db, self._pending)
+        self._pending = []
+
+@contextmanager
+def job_run(name: str, db: Session) -> Iterator[JobRun]:
+    """
+    Mesure une exécution de tâche, alimente les métriques et journalise son bilan.
+
+    Args:
+        name: Nom de la tâche
+        db: Session de l'exécution, utilisée pour alimenter l'outbox
+
+    Yields:
+        JobRun: Compteurs à incrémenter pendant l'exécution
+    """
+    run = JobRun(name, db)
+    start = time.perf_counter()
+    try:
+        yield run
+        run.flush()
+    except Exception:
+        metrics.scheduler_job_failures_total.inc(job=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.scheduler_job_duration_seconds.observe(elapsed, job=name)
+        metrics.scheduler_job_rows_total.inc(run.rows, job=name)
+        logger.info(
+            f"Tâche {name} : {run.rows} lignes, {run.notifications} notifications en file "
+            f"en {elapsed * 1000:.1f} ms"
+        )
+
 class TaskScheduler:
     """Gestionnaire des tâches planifiées."""
     
-    def __init__(self):
-        """Initialise le planificateur de tâches."""
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        """
+        Initialise le planificateur de tâches.
+        
+        Args:
+            session_factory: Fabrique des sessions ouvertes à chaque exécution
+        """
+        self.session_factory = session_factory
         jobstores = {
             'default': MemoryJobStore()
         }
+        # Chaque exécution occupe une connexion : le nombre de threads borne
+        # la part du pool consommée par les tâches planifiées
         executors = {
-            'default': ThreadPoolExecutor(20)
+            'default': ThreadPoolExecutor(settings.SCHEDULER_MAX_WORKERS)
         }
         job_defaults = {
-            'coalesce': False,
-            'max_instances': 3
+            'coalesce': True,
+            'max_instances': settings.SCHEDULER_JOB_MAX_INSTANCES,
+            'misfire_grace_time': settings.SCHEDULER_MISFIRE_GRACE_SECONDS
         }
         
         self.scheduler = BackgroundScheduler(
@@ -43,6 +127,42 @@ class TaskScheduler:
         self.scheduler.start()
         logger.info("Planificateur de tâches démarré")
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Ouvre une session dédiée à une exécution de tâche.
+        
+        La transaction est validée en fin d'exécution, annulée en cas
+        d'erreur, et la connexion est rendue au pool dans tous les cas.
+        
+        Yields:
+            Session: Session de base de données
+        """
+        db = self.session_factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def run_job(self, job: Callable[[Session], None]) -> None:
+        """
+        Exécute une tâche dans sa propre session.
+        
+        Args:
+            job: Tâche recevant la session en argument
+        """
+        try:
+            with self.session_scope() as db:
+                job(db)
+        except Exception as e:
+            # Transaction annulée, échec compté par `job_run` ; APScheduler journalise la trace
+            logger.error(f"Erreur lors de l'exécution de la tâche {job.__name__} : {str(e)}")
+            raise
+    
     def schedule_payment_reminders(self, db: Session) -> None:
         """
         Planifie l'envoi des rappels de paiement.
@@ -50,35 +170,34 @@ class TaskScheduler:
         Args:
             db: Session de base de données
         """
-        try:
-            # Récupérer les paiements à venir dans les 7 jours
-            due_date = datetime.now(timezone) + timedelta(days=7)
-            payments = db.query(Payment).filter(
+        with job_run("payment_reminders", db) as run:
+            # Récupérer les paiements à venir dans les 7 jours, avec contrat,
+            # propriété et locataire chargés dans la même requête
+            today = datetime.now(timezone).date()
+            due_date = today + timedelta(days=7)
+            payments = db.query(Payment).options(
+                joinedload(Payment.contract).joinedload(Contract.property),
+                joinedload(Payment.contract).joinedload(Contract.tenant)
+            ).filter(
                 Payment.due_date <= due_date,
-                Payment.status == "pending"
-            ).all()
+                Payment.status == PaymentStatus.PENDING
+            ).order_by(Payment.id).yield_per(settings.SCHEDULER_BATCH_SIZE)
             
             for payment in payments:
-                # Récupérer les informations du contrat et de la propriété
-                contract = db.query(Contract).filter(Contract.id == payment.contract_id).first()
-                if not contract:
-                    continue
+                run.rows += 1
+                contract = payment.contract
                 
                 # Préparer le message
                 message = f"Rappel: Paiement de {payment.amount}€ pour {contract.property.address} dû le {payment.due_date.strftime('%d/%m/%Y')}"
                 
-                # Envoyer la notification
-                notification_manager.send_notification(
+                # Mettre la notification en file (un rappel par jour)
+                run.notify(
+                    f"payment_reminder:{payment.id}:{today.isoformat()}",
                     message=message,
                     to_email=contract.tenant.email,
                     to_number=contract.tenant.phone,
                     subject="Rappel de paiement"
                 )
-            
-            logger.info(f"Rappels de paiement envoyés pour {len(payments)} paiements")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'envoi des rappels de paiement : {str(e)}")
     
     def check_contract_renewals(self, db: Session) -> None:
         """
@@ -87,20 +206,29 @@ class TaskScheduler:
         Args:
             db: Session de base de données
         """
-        try:
+        with job_run("contract_renewals", db) as run:
             # Récupérer les contrats qui expirent dans les 30 jours
-            expiry_date = datetime.now(timezone) + timedelta(days=30)
-            contracts = db.query(Contract).filter(
+            today = datetime.now(timezone).date()
+            expiry_date = today + timedelta(days=30)
+            year, week, _ = today.isocalendar()
+            period = f"{year}-W{week:02d}"
+            contracts = db.query(Contract).options(
+                joinedload(Contract.tenant),
+                joinedload(Contract.property).joinedload(Property.owner)
+            ).filter(
                 Contract.end_date <= expiry_date,
-                Contract.status == "active"
-            ).all()
+                Contract.status == ContractStatus.ACTIVE
+            ).order_by(Contract.id).yield_per(settings.SCHEDULER_BATCH_SIZE)
             
             for contract in contracts:
+                run.rows += 1
+                
                 # Préparer le message
                 message = f"Votre contrat pour {contract.property.address} expire le {contract.end_date.strftime('%d/%m/%Y')}. Veuillez contacter le propriétaire pour le renouvellement."
                 
-                # Envoyer la notification
-                notification_manager.send_notification(
+                # Mettre la notification en file (une par semaine)
+                run.notify(
+                    f"contract_renewal:{contract.id}:tenant:{period}",
                     message=message,
                     to_email=contract.tenant.email,
                     to_number=contract.tenant.phone,
@@ -108,17 +236,13 @@ class TaskScheduler:
                 )
                 
                 # Notifier également le propriétaire
-                notification_manager.send_notification(
+                run.notify(
+                    f"contract_renewal:{contract.id}:owner:{period}",
                     message=f"Le contrat pour {contract.property.address} expire le {contract.end_date.strftime('%d/%m/%Y')}. Le locataire a été notifié.",
                     to_email=contract.property.owner.email,
                     to_number=contract.property.owner.phone,
                     subject="Contrat à renouveler"
                 )
-            
-            logger.info(f"Notifications de renouvellement envoyées pour {len(contracts)} contrats")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la vérification des contrats à renouveler : {str(e)}")
     
     def check_maintenance_requests(self, db: Session) -> None:
         """
@@ -127,62 +251,118 @@ class TaskScheduler:
         Args:
             db: Session de base de données
         """
-        try:
+        with job_run("maintenance_requests", db) as run:
             # Récupérer les demandes de maintenance en attente depuis plus de 24h
-            threshold = datetime.now(timezone) - timedelta(days=1)
-            requests = db.query(MaintenanceRequest).filter(
+            now = datetime.now(timezone).replace(tzinfo=None)
+            threshold = now - timedelta(days=1)
+            period = f"{now.date().isoformat()}T{now.hour // 6 * 6:02d}"
+            requests = db.query(MaintenanceRequest).options(
+                joinedload(MaintenanceRequest.property).joinedload(Property.owner)
+            ).filter(
                 MaintenanceRequest.created_at <= threshold,
-                MaintenanceRequest.status == "pending"
-            ).all()
+                MaintenanceRequest.status == MaintenanceStatus.PENDING
+            ).order_by(MaintenanceRequest.id).yield_per(settings.SCHEDULER_BATCH_SIZE)
             
             for request in requests:
+                run.rows += 1
+                
                 # Préparer le message
                 message = f"La demande de maintenance pour {request.property.address} est en attente depuis plus de 24h. Priorité : {request.priority}"
                 
-                # Envoyer la notification au propriétaire
-                notification_manager.send_notification(
+                # Mettre la notification au propriétaire en file (une par créneau de 6h)
+                run.notify(
+                    f"maintenance_pending:{request.id}:{period}",
                     message=message,
                     to_email=request.property.owner.email,
                     to_number=request.property.owner.phone,
                     subject="Demande de maintenance en attente"
                 )
-            
-            logger.info(f"Notifications de maintenance envoyées pour {len(requests)} demandes")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la vérification des demandes de maintenance : {str(e)}")
     
-    def schedule_all_tasks(self, db: Session) -> None:
+    def process_overdue_payments(self, db: Session) -> None:
+        """
+        Passe en retard les paiements échus et applique les pénalités de retard.
+        
+        Args:
+            db: Session de base de données
+        """
+        with job_run("overdue_payments", db) as run:
+            report = PaymentService.process_overdue_payments(db)
+            run.rows = report["marked_overdue"] + report["late_fees"]
+    
+    def generate_rent_schedules(self, db: Session) -> None:
         """
-        Planifie toutes les tâches récurrentes.
+        Génère les loyers à venir de tous les contrats actifs.
         
         Args:
             db: Session de base de données
         """
+        with job_run("rent_schedules", db) as run:
+            report = PaymentService.generate_rent_schedules(db)
+            run.rows = report["contracts"]
+    
+    def dispatch_notifications(self) -> None:
+        """Livre les notifications en attente dans l'outbox."""
+        try:
+            notification_dispatcher.drain(self.session_factory)
+        except Exception as e:
+            logger.error(f"Erreur lors de la livraison des notifications : {str(e)}")
+    
+    def schedule_all_tasks(self) -> None:
+        """Planifie toutes les tâches récurrentes."""
         # Rappels de paiement tous les jours à 9h
         self.scheduler.add_job(
-            self.schedule_payment_reminders,
+            self.run_job,
             CronTrigger(hour=9, minute=0, timezone=timezone),
-            args=[db],
-            id="payment_reminders"
+            args=[self.schedule_payment_reminders],
+            id="payment_reminders",
+            replace_existing=True
         )
         
         # Vérification des contrats tous les lundis à 10h
         self.scheduler.add_job(
-            self.check_contract_renewals,
+            self.run_job,
             CronTrigger(day_of_week="mon", hour=10, minute=0, timezone=timezone),
-            args=[db],
-            id="contract_renewals"
+            args=[self.check_contract_renewals],
+            id="contract_renewals",
+            replace_existing=True
         )
         
         # Vérification des demandes de maintenance toutes les 6 heures
         self.scheduler.add_job(
-            self.check_maintenance_requests,
+            self.run_job,
             CronTrigger(hour="*/6", timezone=timezone),
-            args=[db],
-            id="maintenance_requests"
+            args=[self.check_maintenance_requests],
+            id="maintenance_requests",
+            replace_existing=True
         )
         
+        # Paiements en retard et pénalités toutes les nuits à 1h
+        self.scheduler.add_job(
+            self.run_job,
+            CronTrigger(hour=1, minute=0, timezone=timezone),
+            args=[self.process_overdue_payments],
+            id="overdue_payments",
+            replace_existing=True
+        )
+        
+        # Génération des échéanciers de loyers toutes les nuits à 2h
+        self.scheduler.add_job(
+            self.run_job,
+            CronTrigger(hour=2, minute=0, timezone=timezone),
+            args=[self.generate_rent_schedules],
+            id="rent_schedules",
+            replace_existing=True
+        )
+        
+        # Livraison des notifications de l'outbox
+        if settings.OUTBOX_DISPATCH_IN_SCHEDULER:
+            self.scheduler.add_job(
+                self.dispatch_notifications,
+                IntervalTrigger(seconds=settings.OUTBOX_DISPATCH_INTERVAL_SECONDS, timezone=timezone),
+                id="notification_dispatch",
+                replace_existing=True
+            )
+        
         logger.info("Toutes les tâches planifiées ont été configurées")
     
     def shutdown(self) -> None:
@@ -1,5 +1,8 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Union
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -8,6 +11,7 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
 from app.core.logging import get_logger
 from app.models.user import User, UserRole
 from app.core.database import get_db 
@@ -15,7 +19,11 @@ from app.core.database import get_db
 logger = get_logger(__name__)
 
 # Configuration du hachage des mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
 
 # Configuration de l'authentification OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/token")
@@ -28,6 +36,89 @@ def get_password_hash(password: str) -> str:
     """Génère un hash pour le mot de passe."""
     return pwd_context.hash(password)
 
+class PasswordHasher:
+    """
+    Exécute le hachage et la vérification bcrypt hors de la boucle d'événements.
+    
+    Les calculs sont confiés à un pool dédié (threads ou processus). Le nombre
+    de calculs en cours ou en attente est borné : au-delà, une
+    `ServiceUnavailableException` (503) est levée plutôt que d'accumuler
+    de la latence.
+    """
+    
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        queue_limit: int = settings.PASSWORD_HASH_QUEUE_LIMIT,
+        executor_type: str = settings.PASSWORD_HASH_EXECUTOR
+    ):
+        """
+        Initialise le pool de hachage.
+        
+        Args:
+            workers: Nombre de threads ou processus de hachage
+            queue_limit: Nombre maximal de calculs en cours ou en attente
+            executor_type: "thread" ou "process"
+        """
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Type d'exécuteur inconnu : {executor_type}")
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.executor_type = executor_type
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def pending(self) -> int:
+        """Nombre de calculs en cours ou en attente."""
+        return self._pending
+    
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="password-hasher"
+                    )
+            return self._executor
+    
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                logger.warning(f"File de hachage saturée ({self._pending} calculs en attente)")
+                raise ServiceUnavailableException(
+                    "Service d'authentification saturé, veuillez réessayer"
+                )
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+    
+    async def hash(self, password: str) -> str:
+        """Génère un hash pour le mot de passe sans bloquer la boucle d'événements."""
+        return await self._submit(get_password_hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Vérifie un mot de passe sans bloquer la boucle d'événements."""
+        return await self._submit(verify_password, plain_password, hashed_password)
+    
+    def shutdown(self) -> None:
+        """Arrête le pool de hachage."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+# Instance globale du pool de hachage
+password_hasher = PasswordHasher()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crée un token JWT."""
     to_encode = data.copy()
@@ -0,0 +1,200 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import run_sync
+from app.core.pagination import Page, set_page_headers
+
+class RowSerializer:
+    """
+    Projection et sérialisation précompilées d'un schéma de réponse.
+
+    Les colonnes du modèle correspondant aux champs du schéma sont résolues une
+    seule fois. Les requêtes projetées sur `columns` renvoient des tuples, sans
+    objets ORM, convertis en dictionnaires par `to_dicts` puis encodés par
+    orjson (dates et enums compris). La validation Pydantic et
+    `jsonable_encoder` ne sont pas rejoués sur ces lignes, déjà typées par les
+    colonnes.
+
+    Les colonnes lues en plus des champs exposés (droits d'accès, tri) sont
+    placées en fin de tuple et ignorées à la sérialisation.
+    """
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        model: Any,
+        fields: Optional[Sequence[str]] = None,
+        extra: Sequence[str] = ()
+    ):
+        self.schema = schema
+        self.model = model
+        self.fields: Tuple[str, ...] = tuple(fields or schema.__fields__)
+        names = tuple(dict.fromkeys(self.fields + tuple(extra)))
+        self.columns = tuple(model.__table__.c[name] for name in names)
+
+    def select(self, fields: Optional[str], extra: Sequence[str] = ()) -> "RowSerializer":
+        """
+        Restreint le sérialiseur aux champs demandés (paramètre `fields=id,title,price`).
+
+        Args:
+            fields: Noms de champs séparés par des virgules (None ou vide : tous les champs)
+            extra: Colonnes lues mais non exposées (ex. celles des contrôles d'accès)
+
+        Returns:
+            RowSerializer: Sérialiseur des seuls champs demandés, dans l'ordre du schéma
+
+        Raises:
+            HTTPException: 400 si un champ n'appartient pas au schéma
+        """
+        requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Champs inconnus : {', '.join(sorted(unknown))}. "
+                       f"Valeurs autorisées : {', '.join(self.fields)}"
+            )
+        if not requested and not extra:
+            return self
+        return RowSerializer(
+            self.schema,
+            self.model,
+            [name for name in self.fields if name in requested] if requested else self.fields,
+            extra
+        )
+
+    def to_dict(self, row: Tuple) -> Dict[str, Any]:
+        return dict(zip(self.fields, row))
+
+    def to_dicts(self, rows: Iterable[Tuple]) -> List[Dict[str, Any]]:
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+class Relation:
+    """
+    Ressource liée pouvant être incluse dans une réponse (`include=`).
+
+    Les lignes liées sont chargées en une requête `WHERE remote IN (...)` pour
+    toute la page, comme la stratégie `selectinload` de SQLAlchemy, mais
+    projetées sur les colonnes du schéma de la ressource liée. La condition de
+    visibilité du lecteur sur la ressource liée est ajoutée à cette requête :
+    une ligne liée non visible est incluse comme absente.
+
+    Args:
+        rows: Sérialiseur de la ressource liée
+        local: Colonne de la ressource principale portant la clé (ex. "property_id")
+        remote: Colonne de la ressource liée comparée à cette clé
+        many: True pour une liste de lignes liées (ex. les paiements d'un contrat)
+    """
+
+    def __init__(self, rows: RowSerializer, local: str, remote: str = "id", many: bool = False):
+        self.rows = rows.select(None, extra=(remote,))
+        self.local = local
+        self.remote = remote
+        self.many = many
+
+    def load(self, db: Session, keys: Iterable[Any], scope: Any) -> Dict[Any, Any]:
+        """Charge les lignes liées aux clés données et visibles par `scope`, indexées par clé."""
+        related: Dict[Any, Any] = {}
+        keys = set(keys) - {None}
+        if not keys:
+            return related
+        table = self.rows.model.__table__
+        query = db.query(*self.rows.columns).filter(table.c[self.remote].in_(keys))
+        condition = scope.condition(self.rows.model)
+        if condition is not None:
+            query = query.filter(condition)
+        query = query.order_by(table.c.id)
+        for row in query:
+            key = getattr(row, self.remote)
+            if self.many:
+                related.setdefault(key, []).append(self.rows.to_dict(row))
+            else:
+                related[key] = self.rows.to_dict(row)
+        return related
+
+class Includes:
+    """
+    Ressources liées demandées par le paramètre `include=property,tenant`.
+
+    Chaque relation demandée coûte une requête, quel que soit le nombre de
+    lignes de la page : `load` lit les ressources liées, `embed` les ajoute
+    aux dictionnaires sérialisés sous le nom de la relation.
+    """
+
+    def __init__(self, relations: Dict[str, Relation], include: Optional[str]):
+        requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+        unknown = requested - set(relations)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Inclusions inconnues : {', '.join(sorted(unknown))}. "
+                       f"Valeurs autorisées : {', '.join(relations)}"
+            )
+        self.relations = {name: relation for name, relation in relations.items() if name in requested}
+        self.loaded: Dict[str, Dict[Any, Any]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.relations)
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Colonnes de la ressource principale à lire pour résoudre les inclusions."""
+        return tuple(dict.fromkeys(relation.local for relation in self.relations.values()))
+
+    def load(self, db: Session, rows: Sequence[Tuple], scope: Any) -> None:
+        """
+        Charge les ressources liées à des lignes projetées (avec les colonnes `keys`).
+
+        Args:
+            db: Session de base de données
+            rows: Lignes de la ressource principale
+            scope: Droits du lecteur (`AccessScope`), appliqués à chaque ressource liée
+        """
+        for name, relation in self.relations.items():
+            self.loaded[name] = relation.load(db, (getattr(row, relation.local) for row in rows), scope)
+
+    async def load_async(self, db: AsyncSession, rows: Sequence[Tuple], scope: Any) -> None:
+        if self:
+            await run_sync(db, self.load, rows=rows, scope=scope)
+
+    def embed(self, rows: Sequence[Tuple], items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for name, relation in self.relations.items():
+            related = self.loaded.get(name, {})
+            for row, item in zip(rows, items):
+                item[name] = related.get(getattr(row, relation.local), [] if relation.many else None)
+        return items
+
+def page_response(page: Page, serializer: RowSerializer, includes: Optional[Includes] = None) -> ORJSONResponse:
+    """
+    Encode une page de lignes projetées et expose ses en-têtes de pagination.
+
+    Renvoyer une réponse déjà construite dispense FastAPI de revalider le
+    contenu contre `response_model`, qui reste déclaré pour la documentation.
+    Les ressources liées déjà chargées par `includes` sont ajoutées à chaque ligne.
+    """
+    items = serializer.to_dicts(page.items)
+    if includes:
+        includes.embed(page.items, items)
+    response = ORJSONResponse(items)
+    set_page_headers(response, page)
+    return response
+
+def item_response(row: Tuple, serializer: RowSerializer, includes: Optional[Includes] = None) -> ORJSONResponse:
+    """Encode une ligne projetée (lecture unitaire), comme `page_response`."""
+    item = serializer.to_dict(row)
+    if includes:
+        includes.embed([row], [item])
+    return ORJSONResponse(item)
+
+def batch_response(batch: Any, serializer: RowSerializer, includes: Optional[Includes] = None) -> ORJSONResponse:
+    """Encode une lecture groupée (`AccessScope.fetch`) au format `BatchResult`."""
+    items = serializer.to_dicts(batch.rows)
+    if includes:
+        includes.embed(batch.rows, items)
+    return ORJSONResponse({"items": items, "missing": batch.missing, "forbidden": batch.forbidden})
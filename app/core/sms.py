@@ -0,0 +1,208 @@
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Statuts HTTP pour lesquels une nouvelle tentative a des chances d'aboutir
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class SMSDeliveryError(Exception):
+    """Échec définitif d'un envoi auprès du fournisseur SMS."""
+
+class SMSDeliveryUncertain(SMSDeliveryError):
+    """Échec après transmission de la requête : le SMS a pu être envoyé, il ne doit pas être rejoué."""
+
+def _maybe_delivered(error: requests.RequestException) -> bool:
+    """
+    Indique si une requête en échec a pu atteindre le fournisseur.
+
+    Un délai de lecture dépassé ou une connexion coupée en cours d'échange
+    surviennent après l'envoi de la requête : le SMS a pu être accepté. Seuls
+    les échecs d'établissement de la connexion garantissent le contraire.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return False
+    if isinstance(error, requests.ConnectionError):
+        return bool(error.args) and isinstance(error.args[0], ProtocolError)
+    return True
+
+class SMSClient:
+    """
+    Client HTTP du fournisseur SMS.
+
+    Une `requests.Session` partagée conserve les connexions (keep-alive) d'un
+    envoi à l'autre. Chaque requête est bornée par un délai de connexion et de
+    lecture ; les échecs de connexion, 429 et 5xx sont rejoués avec un backoff
+    exponentiel à gigue complète, en respectant `Retry-After` s'il est fourni.
+    Un envoi qui a pu atteindre le fournisseur (délai de lecture dépassé,
+    connexion coupée) n'est rejoué que si le fournisseur déduplique les envois
+    par une clé d'idempotence (`idempotency_header`), pour ne pas doubler le SMS.
+    Si le fournisseur expose un endpoint d'envoi groupé, les messages lui sont
+    transmis par lots.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 8.0,
+        batch_path: Optional[str] = None,
+        batch_size: int = 100,
+        idempotency_header: Optional[str] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.batch_path = batch_path
+        self.batch_size = batch_size
+        self.idempotency_header = idempotency_header
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+
+    def _post(self, path: str, payload: Any, idempotency_key: Optional[str] = None) -> requests.Response:
+        """
+        Envoie une requête POST avec nouvelles tentatives.
+
+        Args:
+            path: Chemin de l'endpoint
+            payload: Corps JSON
+            idempotency_key: Clé stable de l'envoi, transmise dans `idempotency_header`
+                si le fournisseur la prend en charge
+
+        Raises:
+            SMSDeliveryError: Si la requête échoue après toutes les tentatives
+        """
+        headers = None
+        if self.idempotency_header and idempotency_key:
+            headers = {self.idempotency_header: idempotency_key}
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(
+                    f"{self.base_url}{path}", json=payload, headers=headers, timeout=self.timeout
+                )
+                if response.status_code not in RETRYABLE_STATUSES:
+                    response.raise_for_status()
+                    return response
+                error: Exception = requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                if headers is None and _maybe_delivered(e):
+                    # Le SMS a pu partir : le rejouer sans clé d'idempotence risque un doublon
+                    raise SMSDeliveryUncertain(str(e)) from e
+            except requests.HTTPError as e:
+                raise SMSDeliveryError(str(e)) from e
+            if attempt < self.max_retries:
+                delay = self._delay(attempt, response)
+                logger.warning(f"Envoi SMS en échec ({error}), nouvelle tentative dans {delay:.2f}s")
+                self._sleep(delay)
+        raise SMSDeliveryError(str(error)) from error
+
+    def send(self, payload: Dict[str, Any]) -> None:
+        """
+        Envoie un SMS.
+
+        Args:
+            payload: Corps de la requête (destinataire, expéditeur, message)
+
+        Raises:
+            SMSDeliveryError: Si l'envoi échoue
+        """
+        self._post("/sms/send", payload, payload.get("idempotency_key"))
+
+    @staticmethod
+    def _batch_key(payloads: List[Dict[str, Any]]) -> Optional[str]:
+        """Clé d'idempotence d'un lot, dérivée de celles de ses messages (None s'il en manque)."""
+        keys = [payload.get("idempotency_key") for payload in payloads]
+        if not all(keys):
+            return None
+        return hashlib.sha1("\n".join(keys).encode()).hexdigest()
+
+    def _send_batch(self, payloads: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Exception]]:
+        try:
+            self._post(self.batch_path, {"messages": payloads}, self._batch_key(payloads))
+            return []
+        except SMSDeliveryError as e:
+            cause = e.__cause__
+            if isinstance(cause, requests.HTTPError) and cause.response is not None \
+                    and cause.response.status_code in (404, 405):
+                # Endpoint groupé indisponible : on revient aux envois unitaires
+                with self._lock:
+                    if self.batch_path:
+                        logger.warning(f"Endpoint SMS groupé {self.batch_path} indisponible")
+                    self.batch_path = None
+                return self._send_each(payloads)
+            return [(payload, e) for payload in payloads]
+
+    def _send_each(self, payloads: Sequence[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Exception]]:
+        failures = []
+        for payload in payloads:
+            try:
+                self.send(payload)
+            except SMSDeliveryError as e:
+                failures.append((payload, e))
+        return failures
+
+    def send_many(
+        self,
+        payloads: Sequence[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], Exception]]:
+        """
+        Envoie plusieurs SMS en parallèle, par lots si le fournisseur le permet.
+
+        Args:
+            payloads: Corps des requêtes
+            max_workers: Requêtes simultanées (borné par la taille du pool HTTP)
+
+        Returns:
+            List[Tuple[Dict[str, Any], Exception]]: SMS non envoyés et erreur associée
+        """
+        if not payloads:
+            return []
+        if self.batch_path:
+            size, send = self.batch_size, self._send_batch
+        else:
+            # Répartir les envois unitaires entre les workers
+            size, send = max(1, -(-len(payloads) // self.pool_size)), self._send_each
+        chunks = [list(payloads[i:i + size]) for i in range(0, len(payloads), size)]
+        workers = min(max_workers or self.pool_size, self.pool_size, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [failure for failures in executor.map(send, chunks) for failure in failures]
+
+    def close(self) -> None:
+        """Ferme les connexions HTTP conservées."""
+        self.session.close()
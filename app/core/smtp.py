@@ -0,0 +1,211 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import Message
+from queue import Empty, LifoQueue
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+def is_connection_error(error: BaseException) -> bool:
+    """Indique si l'erreur rend la connexion inutilisable (et non le seul message)."""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421  # le serveur ferme la connexion
+    # Erreurs réseau (socket), hors erreurs protocolaires SMTP
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+class _PooledConnection:
+    """Connexion SMTP authentifiée et ses compteurs d'utilisation."""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+
+class SMTPConnectionPool:
+    """
+    Pool de connexions SMTP persistantes.
+
+    Une connexion est ouverte (EHLO, STARTTLS, LOGIN) une seule fois puis
+    réutilisée pour de nombreux messages. Elle est renouvelée après
+    `max_messages` envois, après `idle_timeout` secondes d'inactivité ou dès
+    qu'une erreur de connexion survient.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str],
+        port: Optional[int],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        tls: bool = True,
+        size: int = 4,
+        timeout: float = 10.0,
+        max_messages: int = 100,
+        idle_timeout: float = 60.0
+    ):
+        self.host = host
+        self.port = port or 0
+        self.username = username
+        self.password = password
+        self.tls = tls
+        self.size = size
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self._idle: "LifoQueue[_PooledConnection]" = LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _connect(self) -> _PooledConnection:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.tls:
+                server.starttls()
+                server.ehlo()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        logger.debug(f"Connexion SMTP ouverte vers {self.host}:{self.port}")
+        return _PooledConnection(server)
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except Empty:
+                return self._connect()
+            if time.monotonic() - connection.last_used < self.idle_timeout:
+                return connection
+            # Le serveur a pu fermer une connexion restée inactive
+            connection.close()
+
+    def _checkin(self, connection: _PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.messages >= self.max_messages:
+            connection.close()
+        else:
+            self._idle.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledConnection]:
+        """
+        Emprunte une connexion au pool.
+
+        Au plus `size` connexions sont ouvertes simultanément ; une connexion
+        ayant levé une erreur de connexion est fermée au lieu d'être rendue.
+
+        Yields:
+            _PooledConnection: Connexion authentifiée
+        """
+        with self._slots:
+            connection = self._checkout()
+            try:
+                yield connection
+            except BaseException as e:
+                if is_connection_error(e):
+                    connection.server.close()
+                else:
+                    self._checkin(connection)
+                raise
+            self._checkin(connection)
+
+    def _send_on(self, connection: _PooledConnection, message: Message) -> None:
+        connection.server.send_message(message)
+        connection.messages += 1
+
+    def send(self, message: Message) -> None:
+        """
+        Envoie un message, en se reconnectant une fois si la connexion est perdue.
+
+        Args:
+            message: Message à envoyer
+
+        Raises:
+            smtplib.SMTPException: Si l'envoi échoue
+        """
+        try:
+            with self.connection() as connection:
+                self._send_on(connection, message)
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            with self.connection() as connection:
+                self._send_on(connection, message)
+
+    def send_many(self, messages: Sequence[Message]) -> List[Tuple[Message, Exception]]:
+        """
+        Envoie une série de messages sur une même connexion.
+
+        Une connexion perdue est rouverte et l'envoi reprend au message en
+        cours ; un message refusé par le serveur n'interrompt pas la série.
+        Si le serveur reste injoignable, ou si l'ouverture de la connexion
+        échoue (STARTTLS non pris en charge, authentification refusée), les
+        messages restants sont abandonnés avec cette erreur. Seules les erreurs
+        étrangères à SMTP et au réseau sont levées.
+
+        Args:
+            messages: Messages à envoyer
+
+        Returns:
+            List[Tuple[Message, Exception]]: Messages non envoyés et erreur associée
+        """
+        failures: List[Tuple[Message, Exception]] = []
+        pending = list(messages)
+        retried = False
+        while pending:
+            connected = False
+            try:
+                with self.connection() as connection:
+                    connected = True
+                    while pending and connection.messages < self.max_messages:
+                        try:
+                            self._send_on(connection, pending[0])
+                        except smtplib.SMTPException as e:
+                            if is_connection_error(e):
+                                raise
+                            failures.append((pending[0], e))
+                        pending.pop(0)
+                        retried = False
+            except Exception as e:
+                if not isinstance(e, (smtplib.SMTPException, OSError)):
+                    raise
+                if not is_connection_error(e):
+                    # Configuration refusée par le serveur : inutile de réessayer
+                    failures.extend((message, e) for message in pending)
+                    break
+                if not retried:
+                    retried = True
+                    continue
+                if not connected:
+                    failures.extend((message, e) for message in pending)
+                    break
+                # Deux échecs consécutifs sur le même message : on l'abandonne
+                failures.append((pending.pop(0), e))
+                retried = False
+        return failures
+
+    def close(self) -> None:
+        """Ferme toutes les connexions inactives."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
@@ -1,12 +1,16 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.core.logging import logger, api_logger
+from app.core.logging import logger
+from app.core import metrics
+from app.core.middleware import MetricsMiddleware, RequestLoggingMiddleware
+from app.core.notifications import notification_manager
+from app.core.profiling import ProfilingMiddleware
+from app.core.query_budget import QueryBudgetMiddleware
 from app.core.scheduler import task_scheduler
+from app.core.security import password_hasher
 from app.api.v1.api import api_router
-from app.core.database import SessionLocal
 from app.core.config import settings
-import traceback
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -24,26 +28,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Middleware de logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Middleware pour logger les requêtes HTTP."""
-    api_logger.info(f"Request: {request.method} {request.url}")
-    try:
-        response = await call_next(request)
-        api_logger.info(f"Response: {response.status_code}")
-        return response
-    except Exception as e:
-        error_details = {
-            "error": str(e),
-            "type": type(e).__name__,
-            "traceback": traceback.format_exc()
-        }
-        api_logger.error(f"Error details: {error_details}")
-        return JSONResponse(
-            status_code=500,
-            content={"detail": "Internal server error", "error": str(e)}
-        )
+# Métriques HTTP (placées sous le logging pour partager le contexte de requête)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Détection des N+1 et budgets de requêtes SQL par route (opt-in)
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Profilage d'une fraction des requêtes, ou sur demande d'un administrateur
+if settings.PROFILING_SAMPLE_RATE > 0 or settings.PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+# Middleware de logging (enregistrements structurés, écrits hors de la boucle d'événements)
+app.add_middleware(RequestLoggingMiddleware)
 
 # Inclusion du router principal
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -59,17 +57,19 @@ async def root():
         "redoc": "/redoc"
     }
 
+if settings.METRICS_ENABLED:
+    @app.get(settings.METRICS_PATH, include_in_schema=False)
+    def export_metrics():
+        """Expose les métriques de l'application au format texte Prometheus."""
+        return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.on_event("startup")
 async def startup_event():
     """Événement déclenché au démarrage de l'application."""
     logger.info("Application starting up...")
     
-    # Initialiser le planificateur de tâches
-    db = SessionLocal()
-    try:
-        task_scheduler.schedule_all_tasks(db)
-    finally:
-        db.close()
+    # Initialiser le planificateur de tâches (une session par exécution)
+    task_scheduler.schedule_all_tasks()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -77,4 +77,10 @@ async def shutdown_event():
     logger.info("Application shutting down...")
     
     # Arrêter le planificateur de tâches
-    task_scheduler.shutdown()                           
\ No newline at end of file
+    task_scheduler.shutdown()
+    
+    # Arrêter le pool de hachage des mots de passe
+    password_hasher.shutdown()
+    
+    # Fermer les connexions SMTP persistantes
+    notification_manager.close()                           
\ No newline at end of file
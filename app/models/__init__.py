@@ -7,6 +7,7 @@ from .property import Property, PropertyType, PropertyStatus
 from .contract import Contract, ContractType, ContractStatus
 from .payment import Payment, PaymentType, PaymentStatus
 from .maintenance import MaintenanceRequest, MaintenanceType, MaintenanceStatus
+from .notification import OutboxNotification, NotificationChannel, OutboxStatus
 
 # Export all models
 __all__ = [
@@ -24,4 +25,7 @@ __all__ = [
     "MaintenanceRequest",
     "MaintenanceType",
     "MaintenanceStatus",
+    "OutboxNotification",
+    "NotificationChannel",
+    "OutboxStatus",
 ] 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, Text, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -41,5 +41,10 @@ class Contract(Base):
     
     payments = relationship("Payment", back_populates="contract")
     
+    __table_args__ = (
+        Index("ix_contracts_tenant_id_status", "tenant_id", "status"),
+        Index("ix_contracts_property_id_status", "property_id", "status"),
+    )
+    
     def __repr__(self):
         return f"<Contract {self.id} - {self.type}>" 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, DateTime, Text, Index, func
 from sqlalchemy.orm import relationship
 import enum
 
@@ -32,6 +32,7 @@ class MaintenanceRequest(Base):
     cost = Column(Float)
     priority = Column(Integer, default=1)  # 1-5, 5 being highest
     notes = Column(Text)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     
     # Relations
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
@@ -43,5 +44,12 @@ class MaintenanceRequest(Base):
     assigned_to_id = Column(Integer, ForeignKey("users.id"))
     assigned_to = relationship("User", foreign_keys=[assigned_to_id])
     
+    __table_args__ = (
+        Index("ix_maintenance_requests_property_id", "property_id"),
+        Index("ix_maintenance_requests_status_created_at", "status", "created_at"),
+        Index("ix_maintenance_requests_status_priority", "status", "priority"),
+        Index("ix_maintenance_requests_status_type", "status", "type"),
+    )
+    
     def __repr__(self):
         return f"<MaintenanceRequest {self.id} - {self.title}>" 
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, Index, func
+import enum
+
+from app.core.database import Base
+
+class NotificationChannel(str, enum.Enum):
+    EMAIL = "email"
+    SMS = "sms"
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"  # réservée par un dispatcher jusqu'à next_attempt_at (bail)
+    SENT = "sent"
+    DEAD = "dead"
+
+class OutboxNotification(Base):
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(Enum(NotificationChannel), nullable=False)
+    recipient = Column(String, nullable=False)
+    subject = Column(String)
+    body = Column(Text, nullable=False)
+    # Clé fournie par le producteur : une même notification n'est enregistrée qu'une fois
+    idempotency_key = Column(String, nullable=False, unique=True)
+    
+    # Suivi de la livraison
+    status = Column(Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, server_default=func.now())
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    sent_at = Column(DateTime)
+    
+    __table_args__ = (
+        Index("ix_notification_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    
+    def __repr__(self):
+        return f"<OutboxNotification {self.id} - {self.channel}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Date, Text, Index, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -9,7 +9,8 @@ class PaymentType(str, enum.Enum):
     DEPOSIT = "deposit"
     CHARGES = "charges"
     MAINTENANCE = "maintenance"
-    OTHER = "other" 
+    OTHER = "other"
+    LATE_FEE = "late_fee"
 
 class PaymentStatus(str, enum.Enum):
     PENDING = "pending"
@@ -35,5 +36,21 @@ class Payment(Base):
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
     contract = relationship("Contract", back_populates="payments")
     
+    # Paiement en retard ayant donné lieu à cette pénalité (une seule par paiement)
+    late_fee_for_id = Column(Integer, ForeignKey("payments.id"))
+    
+    __table_args__ = (
+        Index("ix_payments_contract_id", "contract_id"),
+        Index("ix_payments_status_due_date", "status", "due_date"),
+        Index("ix_payments_late_fee_for_id", "late_fee_for_id", unique=True),
+        # Rappels et détection des retards : seuls les paiements en attente
+        Index(
+            "ix_payments_pending_due_date",
+            "due_date",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Payment {self.id} - {self.type}>" 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, Enum, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -50,5 +50,9 @@ class Property(Base):
     contracts = relationship("Contract", back_populates="property")
     maintenance_requests = relationship("MaintenanceRequest", back_populates="property")
     
+    __table_args__ = (
+        Index("ix_properties_owner_id_status_type", "owner_id", "status", "type"),
+    )
+    
     def __repr__(self):
         return f"<Property {self.title}>" 
\ No newline at end of file
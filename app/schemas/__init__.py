@@ -1,4 +1,4 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserWithToken
+from app.schemas.user import User, UserCreate, UserUpdate, UserSummary, UserWithToken, Principal
 from app.schemas.property import Property, PropertyCreate, PropertyUpdate
 from app.schemas.contract import Contract, ContractCreate, ContractUpdate
 from app.schemas.payment import Payment, PaymentCreate, PaymentUpdate
@@ -6,14 +6,17 @@ from app.schemas.maintenance import (
     MaintenanceRequest,
     MaintenanceRequestCreate,
     MaintenanceRequestUpdate
-) 
+)
+from app.schemas.bulk_import import ImportReport, ImportRowError
 
 # Export all schemas
 __all__ = [
     "User",
     "UserCreate",
     "UserUpdate",
+    "UserSummary",
     "UserWithToken",
+    "Principal",
     "Property",
     "PropertyCreate",
     "PropertyUpdate",
@@ -25,5 +28,7 @@ __all__ = [
     "PaymentUpdate",
     "MaintenanceRequest",
     "MaintenanceRequestCreate",
-    "MaintenanceRequestUpdate"
+    "MaintenanceRequestUpdate",
+    "ImportReport",
+    "ImportRowError"
 ] 
\ No newline at end of file
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from pydantic.generics import GenericModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+# Identifiants d'une lecture groupée
+class BatchRequest(BaseModel):
+    ids: List[int]
+
+# Lignes visibles (dans l'ordre demandé), identifiants inexistants et interdits
+class BatchResult(GenericModel, Generic[T]):
+    items: List[T] = []
+    missing: List[int] = []
+    forbidden: List[int] = []
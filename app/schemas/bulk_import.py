@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+
+# Erreurs d'une ligne rejetée (numéro de ligne de données, en-tête CSV exclu)
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+# Bilan d'un import en masse
+class ImportReport(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
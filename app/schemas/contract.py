@@ -39,4 +39,5 @@ class Contract(ContractBase):
     tenant_id: int
 
     class Config:
+        orm_mode = True
         from_attributes = True 
\ No newline at end of file
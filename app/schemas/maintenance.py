@@ -41,4 +41,5 @@ class MaintenanceRequest(MaintenanceRequestBase):
     assigned_to_id: Optional[int] = None
 
     class Config:
+        orm_mode = True
         from_attributes = True 
\ No newline at end of file
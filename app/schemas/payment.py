@@ -31,6 +31,8 @@ class PaymentUpdate(BaseModel):
 class Payment(PaymentBase):
     id: int
     contract_id: int
+    late_fee_for_id: Optional[int] = None
 
     class Config:
+        orm_mode = True
         from_attributes = True 
\ No newline at end of file
@@ -58,4 +58,5 @@ class Property(PropertyBase):
     owner_id: int
 
     class Config:
+        orm_mode = True
         from_attributes = True 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from typing import List, Optional
 from app.models.user import UserRole
 
 # Base User Schema
@@ -27,9 +27,28 @@ class User(UserBase):
     is_active: bool
 
     class Config:
+        orm_mode = True
+        from_attributes = True
+
+# Schema for a user embedded in another resource (`include=`), without contact details
+class UserSummary(BaseModel):
+    id: int
+    full_name: Optional[str] = None
+    role: UserRole
+
+    class Config:
+        orm_mode = True
         from_attributes = True
 
 # Schema for user with token
 class UserWithToken(User):
     access_token: str
-    token_type: str = "bearer" 
\ No newline at end of file
+    token_type: str = "bearer"
+
+# Authenticated user kept in the principal cache
+class Principal(User):
+    tenant_contract_ids: List[int] = []
+    tenant_property_ids: List[int] = []
+
+    class Config:
+        allow_mutation = False
@@ -3,16 +3,24 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash
+from app.core.security import verify_password, get_password_hash, password_hasher
+from app.core.serialization import RowSerializer
+from app.models.contract import Contract
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
-from app.core.database import get_db
+from app.schemas.user import Principal, UserCreate, UserSummary, UserUpdate
+from app.core.database import get_async_db, get_db, run_sync
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Projection des utilisateurs inclus dans d'autres ressources : identité seule,
+# sans email ni téléphone, quel que soit le rôle du lecteur
+USER_SUMMARY_ROWS = RowSerializer(UserSummary, User)
+
 class AuthService:
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -37,15 +45,20 @@ class AuthService:
             )
 
     @staticmethod
-    def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    def get_user_id_from_token(token: str) -> int:
         payload = AuthService.verify_token(token)
-        user_id: int = payload.get("sub")
+        user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        return int(user_id)
+
+    @staticmethod
+    def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+        user_id = AuthService.get_user_id_from_token(token)
         user = db.query(User).filter(User.id == user_id).first()
         if user is None:
             raise HTTPException(
@@ -55,9 +68,55 @@ class AuthService:
             )
         return user
 
+    @staticmethod
+    def load_principal(user_id: int, db: Session) -> Optional[Principal]:
+        """Charge un utilisateur et les contrats dont il est locataire."""
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return None
+        contracts = db.query(Contract.id, Contract.property_id).filter(
+            Contract.tenant_id == user_id
+        ).all()
+        return Principal(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            phone=user.phone,
+            role=user.role,
+            is_active=user.is_active,
+            tenant_contract_ids=[contract.id for contract in contracts],
+            tenant_property_ids=sorted({contract.property_id for contract in contracts})
+        )
+
+    @staticmethod
+    async def get_current_user_async(
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> Principal:
+        """
+        Retourne l'utilisateur authentifié, servi depuis `principal_cache` tant
+        que l'entrée n'a pas expiré ou n'a pas été invalidée.
+        """
+        user_id = AuthService.get_user_id_from_token(token)
+        principal = principal_cache.get(user_id)
+        if principal is None:
+            principal = await run_sync(db, AuthService.load_principal, user_id=user_id)
+            if principal is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            principal_cache.set(user_id, principal)
+        return principal
+
+    @staticmethod
+    def get_user_by_email(email: str, db: Session) -> Optional[User]:
+        return db.query(User).filter(User.email == email).first()
+
     @staticmethod
     def authenticate_user(email: str, password: str, db: Session) -> Optional[User]:
-        user = db.query(User).filter(User.email == email).first()
+        user = AuthService.get_user_by_email(email, db)
         if not user:
             return None
         if not verify_password(password, user.hashed_password):
@@ -65,7 +124,7 @@ class AuthService:
         return user
 
     @staticmethod
-    def create_user(user_data: UserCreate, db: Session) -> User:
+    def create_user(user_data: UserCreate, db: Session, hashed_password: Optional[str] = None) -> User:
         # Check if user already exists
         if db.query(User).filter(User.email == user_data.email).first():
             raise HTTPException(
@@ -74,7 +133,7 @@ class AuthService:
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = hashed_password or get_password_hash(user_data.password)
         db_user = User(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -88,7 +147,12 @@ class AuthService:
         return db_user
 
     @staticmethod
-    def update_user(user_id: int, user_data: UserUpdate, db: Session) -> User:
+    def update_user(
+        user_id: int,
+        user_data: UserUpdate,
+        db: Session,
+        hashed_password: Optional[str] = None
+    ) -> User:
         user = db.query(User).filter(User.id == user_id).first()
         if not user:
             raise HTTPException(
@@ -98,10 +162,55 @@ class AuthService:
         
         # Update user fields
         for field, value in user_data.dict(exclude_unset=True).items():
-            if field == "password" and value:
-                value = get_password_hash(value)
+            if field == "password":
+                if not value:
+                    continue
+                field = "hashed_password"
+                value = hashed_password or get_password_hash(value)
             setattr(user, field, value)
         
         db.commit()
         db.refresh(user)
-        return user 
\ No newline at end of file
+        principal_cache.invalidate(user_id)
+        return user
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    # Le hachage bcrypt est confié à `password_hasher` pour ne pas bloquer la boucle.
+
+    @staticmethod
+    async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+        """Variante asynchrone de `authenticate_user`."""
+        user = await run_sync(db, AuthService.get_user_by_email, email=email)
+        if not user:
+            return None
+        if not await password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
+
+    @staticmethod
+    async def create_user_async(db: AsyncSession, user_data: UserCreate) -> User:
+        """Variante asynchrone de `create_user`."""
+        if await run_sync(db, AuthService.get_user_by_email, email=user_data.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        hashed_password = await password_hasher.hash(user_data.password)
+        return await run_sync(
+            db, AuthService.create_user, user_data=user_data, hashed_password=hashed_password
+        )
+
+    @staticmethod
+    async def update_user_async(db: AsyncSession, user_id: int, user_data: UserUpdate) -> User:
+        """Variante asynchrone de `update_user`."""
+        hashed_password = None
+        if user_data.password:
+            hashed_password = await password_hasher.hash(user_data.password)
+        return await run_sync(
+            db,
+            AuthService.update_user,
+            user_id=user_id,
+            user_data=user_data,
+            hashed_password=hashed_password
+        )
@@ -0,0 +1,296 @@
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.database import Base, run_sync
+from app.core.logging import get_logger
+from app.models.contract import Contract, ContractStatus
+from app.models.payment import Payment
+from app.models.property import Property, PropertyStatus
+from app.models.user import User
+from app.schemas.bulk_import import ImportReport, ImportRowError
+from app.schemas.contract import ContractCreate
+from app.schemas.payment import PaymentCreate
+from app.schemas.property import PropertyCreate
+
+logger = get_logger(__name__)
+
+# Types de contenu acceptés par format
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+
+# Ligne lue : (numéro, valeurs) ou (numéro, message d'erreur de lecture)
+Row = Tuple[int, Union[Dict[str, Any], str]]
+
+# Vérifie un lot de lignes valides et retourne les erreurs par numéro de ligne
+ChunkCheck = Callable[[Session, List[Tuple[int, BaseModel]]], Dict[int, str]]
+
+def import_format(content_type: Optional[str]) -> str:
+    """
+    Détermine le format d'un import à partir de son type de contenu.
+
+    Raises:
+        HTTPException: 415 si le type de contenu n'est ni CSV ni NDJSON
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be text/csv or application/x-ndjson"
+        )
+    return IMPORT_FORMATS[media_type]
+
+async def spool_upload(chunks: AsyncIterator[bytes], max_size: int = settings.IMPORT_MAX_SIZE) -> BinaryIO:
+    """
+    Recopie un flux reçu dans un fichier temporaire (en mémoire jusqu'à 8 Mo).
+
+    Raises:
+        HTTPException: 413 si le flux dépasse `max_size` octets
+    """
+    spool = SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            spool.close()
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Import too large"
+            )
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+def read_rows(source: BinaryIO, format: str) -> Iterator[Row]:
+    """
+    Lit les lignes d'un import CSV (avec en-tête) ou NDJSON (un objet par ligne).
+
+    Les cellules CSV vides sont omises, afin que les champs optionnels
+    prennent leur valeur par défaut.
+
+    Args:
+        source: Flux binaire encodé en UTF-8
+        format: "csv" ou "ndjson"
+
+    Yields:
+        Row: Numéro de la ligne de données et ses valeurs, ou une erreur de lecture
+    """
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        for number, values in enumerate(csv.DictReader(text), start=1):
+            if None in values:
+                yield number, "unexpected extra columns"
+                continue
+            yield number, {key: value for key, value in values.items() if value not in ("", None)}
+        return
+    number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            values = json.loads(line)
+        except ValueError as e:
+            yield number, f"invalid JSON: {e}"
+            continue
+        yield number, values if isinstance(values, dict) else "expected a JSON object"
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()]
+
+def _existing_ids(db: Session, column, ids) -> set:
+    return {value for (value,) in db.query(column).filter(column.in_(set(ids)))} if ids else set()
+
+class BulkImportService:
+    @staticmethod
+    def _import(
+        db: Session,
+        rows: Iterator[Row],
+        schema: Type[BaseModel],
+        model: Type[Base],
+        check: ChunkCheck,
+        chunk_size: int,
+        after_insert: Optional[Callable[[Session, List[BaseModel]], None]] = None
+    ) -> ImportReport:
+        """
+        Valide, vérifie et insère des lignes par lots.
+
+        Chaque lot de `chunk_size` lignes valides coûte une requête de
+        vérification par clé étrangère, une insertion groupée et un commit. Un
+        lot rejeté par la base est annulé et ses lignes signalées en erreur ;
+        les lots précédents restent importés.
+        """
+        report = ImportReport()
+
+        def reject(number: int, errors: List[str]) -> None:
+            report.failed += 1
+            if len(report.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                report.errors.append(ImportRowError(row=number, errors=errors))
+
+        def flush(chunk: List[Tuple[int, BaseModel]]) -> None:
+            failures = check(db, chunk)
+            for number, message in failures.items():
+                reject(number, [message])
+            accepted = [(number, item) for number, item in chunk if number not in failures]
+            if not accepted:
+                return
+            try:
+                db.execute(insert(model.__table__), [item.dict() for _, item in accepted])
+                if after_insert is not None:
+                    after_insert(db, [item for _, item in accepted])
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.error(f"Lot d'import {model.__tablename__} rejeté : {e}")
+                for number, _ in accepted:
+                    reject(number, [f"chunk rejected by the database: {type(e).__name__}"])
+                return
+            report.imported += len(accepted)
+
+        chunk: List[Tuple[int, BaseModel]] = []
+        for number, values in rows:
+            report.total += 1
+            if isinstance(values, str):
+                reject(number, [values])
+                continue
+            try:
+                chunk.append((number, schema.parse_obj(values)))
+            except ValidationError as e:
+                reject(number, _validation_messages(e))
+                continue
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        logger.info(
+            f"Import {model.__tablename__} : {report.imported}/{report.total} lignes importées"
+        )
+        return report
+
+    @staticmethod
+    def _check_properties(db: Session, chunk: List[Tuple[int, PropertyCreate]]) -> Dict[int, str]:
+        owners = _existing_ids(db, User.id, [item.owner_id for _, item in chunk])
+        return {number: "owner_id: Owner not found" for number, item in chunk if item.owner_id not in owners}
+
+    @staticmethod
+    def _check_contracts(db: Session, chunk: List[Tuple[int, ContractCreate]]) -> Dict[int, str]:
+        property_ids = {item.property_id for _, item in chunk}
+        statuses = dict(
+            db.query(Property.id, Property.status).filter(Property.id.in_(property_ids))
+        ) if property_ids else {}
+        tenants = _existing_ids(db, User.id, [item.tenant_id for _, item in chunk])
+        failures, claimed = {}, set()
+        for number, item in chunk:
+            if item.property_id not in statuses:
+                failures[number] = "property_id: Property not found"
+            elif statuses[item.property_id] != PropertyStatus.AVAILABLE or item.property_id in claimed:
+                failures[number] = "property_id: Property is not available"
+            elif item.tenant_id not in tenants:
+                failures[number] = "tenant_id: Tenant not found"
+            else:
+                claimed.add(item.property_id)
+        return failures
+
+    @staticmethod
+    def _rent_properties(db: Session, contracts: List[ContractCreate]) -> None:
+        db.execute(
+            update(Property).where(
+                Property.id.in_({contract.property_id for contract in contracts})
+            ).values(status=PropertyStatus.RENTED),
+            execution_options={"synchronize_session": False}
+        )
+        for contract in contracts:
+            principal_cache.invalidate(contract.tenant_id)
+
+    @staticmethod
+    def _check_payments(db: Session, chunk: List[Tuple[int, PaymentCreate]]) -> Dict[int, str]:
+        contract_ids = {item.contract_id for _, item in chunk}
+        statuses = dict(
+            db.query(Contract.id, Contract.status).filter(Contract.id.in_(contract_ids))
+        ) if contract_ids else {}
+        failures = {}
+        for number, item in chunk:
+            if item.contract_id not in statuses:
+                failures[number] = "contract_id: Contract not found"
+            elif statuses[item.contract_id] != ContractStatus.ACTIVE:
+                failures[number] = "contract_id: Contract is not active"
+        return failures
+
+    @staticmethod
+    def import_properties(
+        db: Session, source: BinaryIO, format: str, chunk_size: int = settings.IMPORT_CHUNK_SIZE
+    ) -> ImportReport:
+        """
+        Importe des propriétés (mêmes règles que `PropertyService.create_property`).
+
+        Args:
+            db: Session de base de données
+            source: Contenu CSV ou NDJSON
+            format: "csv" ou "ndjson"
+            chunk_size: Nombre de lignes par transaction
+
+        Returns:
+            ImportReport: Bilan de l'import et erreurs par ligne
+        """
+        return BulkImportService._import(
+            db, read_rows(source, format), PropertyCreate, Property,
+            BulkImportService._check_properties, chunk_size
+        )
+
+    @staticmethod
+    def import_contracts(
+        db: Session, source: BinaryIO, format: str, chunk_size: int = settings.IMPORT_CHUNK_SIZE
+    ) -> ImportReport:
+        """
+        Importe des contrats (mêmes règles que `ContractService.create_contract`) :
+        chaque bien doit être disponible et passe au statut loué.
+        """
+        return BulkImportService._import(
+            db, read_rows(source, format), ContractCreate, Contract,
+            BulkImportService._check_contracts, chunk_size, BulkImportService._rent_properties
+        )
+
+    @staticmethod
+    def import_payments(
+        db: Session, source: BinaryIO, format: str, chunk_size: int = settings.IMPORT_CHUNK_SIZE
+    ) -> ImportReport:
+        """Importe des paiements (mêmes règles que `PaymentService.create_payment`)."""
+        return BulkImportService._import(
+            db, read_rows(source, format), PaymentCreate, Payment,
+            BulkImportService._check_payments, chunk_size
+        )
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    @staticmethod
+    async def import_properties_async(db: AsyncSession, **kwargs) -> ImportReport:
+        """Variante asynchrone de `import_properties`."""
+        return await run_sync(db, BulkImportService.import_properties, **kwargs)
+
+    @staticmethod
+    async def import_contracts_async(db: AsyncSession, **kwargs) -> ImportReport:
+        """Variante asynchrone de `import_contracts`."""
+        return await run_sync(db, BulkImportService.import_contracts, **kwargs)
+
+    @staticmethod
+    async def import_payments_async(db: AsyncSession, **kwargs) -> ImportReport:
+        """Variante asynchrone de `import_payments`."""
+        return await run_sync(db, BulkImportService.import_payments, **kwargs)
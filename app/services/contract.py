@@ -1,17 +1,34 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Sequence
 from datetime import date
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
+from app.core.cache import principal_cache
+from app.core.export import ExportFormat, export_statement, stream_export
+from app.core.pagination import Page, paginate
+from app.core.serialization import RowSerializer
 from app.models.contract import Contract, ContractStatus
 from app.models.property import Property, PropertyStatus
-from app.schemas.contract import ContractCreate, ContractUpdate
+from app.schemas.contract import Contract as ContractSchema, ContractCreate, ContractUpdate
 from app.models.user import User
+from app.core.database import run_sync
+from app.services.scoping import AccessScope
+
+# Clés de tri autorisées pour la pagination par curseur
+CONTRACT_SORT_COLUMNS = {
+    "id": Contract.id,
+    "start_date": Contract.start_date,
+}
+
+# Projection et sérialisation rapides des listes (voir `RowSerializer`)
+CONTRACT_ROWS = RowSerializer(ContractSchema, Contract)
 
 class ContractService:
     @staticmethod
-    def get_contract(contract_id: int, db: Session) -> Contract:
-        contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    def get_contract(contract_id: int, db: Session, columns: Optional[Sequence[Any]] = None) -> Contract:
+        query = db.query(Contract) if columns is None else db.query(*columns)
+        contract = query.filter(Contract.id == contract_id).first()
         if not contract:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -28,16 +45,68 @@ class ContractService:
         tenant_id: Optional[int] = None,
         status: Optional[ContractStatus] = None
     ) -> List[Contract]:
+        return ContractService.get_contracts_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            property_id=property_id,
+            tenant_id=tenant_id,
+            status=status
+        ).items
+
+    @staticmethod
+    def contracts_query(
+        db: Session,
+        property_id: Optional[int] = None,
+        tenant_id: Optional[int] = None,
+        status: Optional[ContractStatus] = None,
+        scope: Optional[AccessScope] = None
+    ) -> Query:
+        """
+        Construit la requête filtrée des contrats, sans l'exécuter (pagination et export).
+
+        Args:
+            scope: Restreint aux contrats visibles par l'utilisateur
+        """
         query = db.query(Contract)
         
+        if scope is not None:
+            query = scope.apply(query)
         if property_id:
             query = query.filter(Contract.property_id == property_id)
         if tenant_id:
             query = query.filter(Contract.tenant_id == tenant_id)
         if status:
             query = query.filter(Contract.status == status)
-            
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    @staticmethod
+    def get_contracts_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        property_id: Optional[int] = None,
+        tenant_id: Optional[int] = None,
+        status: Optional[ContractStatus] = None,
+        scope: Optional[AccessScope] = None,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        include_total: bool = False,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Page:
+        return paginate(
+            ContractService.contracts_query(
+                db, property_id=property_id, tenant_id=tenant_id, status=status, scope=scope
+            ),
+            id_column=Contract.id,
+            sort_columns=CONTRACT_SORT_COLUMNS,
+            sort=sort,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            columns=columns
+        )
 
     @staticmethod
     def create_contract(contract_data: ContractCreate, db: Session) -> Contract:
@@ -71,6 +140,7 @@ class ContractService:
         
         db.commit()
         db.refresh(db_contract)
+        principal_cache.invalidate(db_contract.tenant_id)
         return db_contract
 
     @staticmethod
@@ -83,6 +153,7 @@ class ContractService:
         
         db.commit()
         db.refresh(contract)
+        principal_cache.invalidate(contract.tenant_id)
         return contract
 
     @staticmethod
@@ -105,6 +176,7 @@ class ContractService:
         
         db.commit()
         db.refresh(contract)
+        principal_cache.invalidate(contract.tenant_id)
         return contract
 
     @staticmethod
@@ -117,4 +189,49 @@ class ContractService:
             Contract.status == ContractStatus.ACTIVE,
             Contract.end_date <= thirty_days_later,
             Contract.end_date >= today
-        ).all() 
\ No newline at end of file
+        ).all()
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    @staticmethod
+    async def get_contract_async(db: AsyncSession, **kwargs) -> Contract:
+        """Variante asynchrone de `get_contract`."""
+        return await run_sync(db, ContractService.get_contract, **kwargs)
+
+    @staticmethod
+    async def get_contracts_async(db: AsyncSession, **kwargs) -> List[Contract]:
+        """Variante asynchrone de `get_contracts`."""
+        return await run_sync(db, ContractService.get_contracts, **kwargs)
+
+    @staticmethod
+    async def get_contracts_page_async(db: AsyncSession, **kwargs) -> Page:
+        """Variante asynchrone de `get_contracts_page`."""
+        return await run_sync(db, ContractService.get_contracts_page, **kwargs)
+
+    @staticmethod
+    async def create_contract_async(db: AsyncSession, **kwargs) -> Contract:
+        """Variante asynchrone de `create_contract`."""
+        return await run_sync(db, ContractService.create_contract, **kwargs)
+
+    @staticmethod
+    async def update_contract_async(db: AsyncSession, **kwargs) -> Contract:
+        """Variante asynchrone de `update_contract`."""
+        return await run_sync(db, ContractService.update_contract, **kwargs)
+
+    @staticmethod
+    async def terminate_contract_async(db: AsyncSession, **kwargs) -> Contract:
+        """Variante asynchrone de `terminate_contract`."""
+        return await run_sync(db, ContractService.terminate_contract, **kwargs)
+
+    @staticmethod
+    async def check_contract_expiration_async(db: AsyncSession, **kwargs) -> List[Contract]:
+        """Variante asynchrone de `check_contract_expiration`."""
+        return await run_sync(db, ContractService.check_contract_expiration, **kwargs)
+
+    @staticmethod
+    def export_contracts(
+        db: AsyncSession, format: ExportFormat, fields: Sequence[str] = CONTRACT_ROWS.fields, **filters
+    ) -> AsyncIterator[bytes]:
+        """Exporte en continu les contrats filtrés par `contracts_query`."""
+        query = ContractService.contracts_query(db.sync_session, **filters)
+        return stream_export(db, export_statement(query, fields), format)
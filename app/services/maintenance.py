@@ -1,17 +1,39 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Sequence
 from datetime import date
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
 from app.models.maintenance import MaintenanceRequest, MaintenanceStatus
 from app.models.property import Property
-from app.schemas.maintenance import MaintenanceRequestCreate, MaintenanceRequestUpdate
+from app.schemas.maintenance import (
+    MaintenanceRequest as MaintenanceRequestSchema,
+    MaintenanceRequestCreate,
+    MaintenanceRequestUpdate
+)
+from app.core.export import ExportFormat, export_statement, stream_export
+from app.core.pagination import Page, paginate
+from app.core.serialization import RowSerializer
 from app.models.user import User
+from app.core.database import run_sync
+from app.services.scoping import AccessScope
+
+# Clés de tri autorisées pour la pagination par curseur
+MAINTENANCE_SORT_COLUMNS = {
+    "id": MaintenanceRequest.id,
+    "request_date": MaintenanceRequest.request_date,
+}
+
+# Projection et sérialisation rapides des listes (voir `RowSerializer`)
+MAINTENANCE_ROWS = RowSerializer(MaintenanceRequestSchema, MaintenanceRequest)
 
 class MaintenanceService:
     @staticmethod
-    def get_maintenance_request(request_id: int, db: Session) -> MaintenanceRequest:
-        request = db.query(MaintenanceRequest).filter(MaintenanceRequest.id == request_id).first()
+    def get_maintenance_request(
+        request_id: int, db: Session, columns: Optional[Sequence[Any]] = None
+    ) -> MaintenanceRequest:
+        query = db.query(MaintenanceRequest) if columns is None else db.query(*columns)
+        request = query.filter(MaintenanceRequest.id == request_id).first()
         if not request:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -29,8 +51,35 @@ class MaintenanceService:
         type: Optional[str] = None,
         priority: Optional[int] = None
     ) -> List[MaintenanceRequest]:
+        return MaintenanceService.get_maintenance_requests_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            property_id=property_id,
+            status=status,
+            type=type,
+            priority=priority
+        ).items
+
+    @staticmethod
+    def maintenance_requests_query(
+        db: Session,
+        property_id: Optional[int] = None,
+        status: Optional[MaintenanceStatus] = None,
+        type: Optional[str] = None,
+        priority: Optional[int] = None,
+        scope: Optional[AccessScope] = None
+    ) -> Query:
+        """
+        Construit la requête filtrée des demandes, sans l'exécuter (pagination et export).
+
+        Args:
+            scope: Restreint aux demandes visibles par l'utilisateur
+        """
         query = db.query(MaintenanceRequest)
         
+        if scope is not None:
+            query = scope.apply(query)
         if property_id:
             query = query.filter(MaintenanceRequest.property_id == property_id)
         if status:
@@ -39,8 +88,37 @@ class MaintenanceService:
             query = query.filter(MaintenanceRequest.type == type)
         if priority:
             query = query.filter(MaintenanceRequest.priority == priority)
-            
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    @staticmethod
+    def get_maintenance_requests_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        property_id: Optional[int] = None,
+        status: Optional[MaintenanceStatus] = None,
+        type: Optional[str] = None,
+        priority: Optional[int] = None,
+        scope: Optional[AccessScope] = None,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        include_total: bool = False,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Page:
+        return paginate(
+            MaintenanceService.maintenance_requests_query(
+                db, property_id=property_id, status=status, type=type,
+                priority=priority, scope=scope
+            ),
+            id_column=MaintenanceRequest.id,
+            sort_columns=MAINTENANCE_SORT_COLUMNS,
+            sort=sort,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            columns=columns
+        )
 
     @staticmethod
     def create_maintenance_request(request_data: MaintenanceRequestCreate, db: Session) -> MaintenanceRequest:
@@ -120,4 +198,54 @@ class MaintenanceService:
         return db.query(MaintenanceRequest).filter(
             MaintenanceRequest.type == "emergency",
             MaintenanceRequest.status != MaintenanceStatus.COMPLETED
-        ).all() 
\ No newline at end of file
+        ).all()
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    @staticmethod
+    async def get_maintenance_request_async(db: AsyncSession, **kwargs) -> MaintenanceRequest:
+        """Variante asynchrone de `get_maintenance_request`."""
+        return await run_sync(db, MaintenanceService.get_maintenance_request, **kwargs)
+
+    @staticmethod
+    async def get_maintenance_requests_async(db: AsyncSession, **kwargs) -> List[MaintenanceRequest]:
+        """Variante asynchrone de `get_maintenance_requests`."""
+        return await run_sync(db, MaintenanceService.get_maintenance_requests, **kwargs)
+
+    @staticmethod
+    async def get_maintenance_requests_page_async(db: AsyncSession, **kwargs) -> Page:
+        """Variante asynchrone de `get_maintenance_requests_page`."""
+        return await run_sync(db, MaintenanceService.get_maintenance_requests_page, **kwargs)
+
+    @staticmethod
+    async def create_maintenance_request_async(db: AsyncSession, **kwargs) -> MaintenanceRequest:
+        """Variante asynchrone de `create_maintenance_request`."""
+        return await run_sync(db, MaintenanceService.create_maintenance_request, **kwargs)
+
+    @staticmethod
+    async def update_maintenance_request_async(db: AsyncSession, **kwargs) -> MaintenanceRequest:
+        """Variante asynchrone de `update_maintenance_request`."""
+        return await run_sync(db, MaintenanceService.update_maintenance_request, **kwargs)
+
+    @staticmethod
+    async def complete_maintenance_request_async(db: AsyncSession, **kwargs) -> MaintenanceRequest:
+        """Variante asynchrone de `complete_maintenance_request`."""
+        return await run_sync(db, MaintenanceService.complete_maintenance_request, **kwargs)
+
+    @staticmethod
+    async def get_high_priority_requests_async(db: AsyncSession, **kwargs) -> List[MaintenanceRequest]:
+        """Variante asynchrone de `get_high_priority_requests`."""
+        return await run_sync(db, MaintenanceService.get_high_priority_requests, **kwargs)
+
+    @staticmethod
+    async def get_emergency_requests_async(db: AsyncSession, **kwargs) -> List[MaintenanceRequest]:
+        """Variante asynchrone de `get_emergency_requests`."""
+        return await run_sync(db, MaintenanceService.get_emergency_requests, **kwargs)
+
+    @staticmethod
+    def export_maintenance_requests(
+        db: AsyncSession, format: ExportFormat, fields: Sequence[str] = MAINTENANCE_ROWS.fields, **filters
+    ) -> AsyncIterator[bytes]:
+        """Exporte en continu les demandes filtrées par `maintenance_requests_query`."""
+        query = MaintenanceService.maintenance_requests_query(db.sync_session, **filters)
+        return stream_export(db, export_statement(query, fields), format)
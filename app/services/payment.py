@@ -1,16 +1,59 @@
-from typing import List, Optional
-from datetime import date
+import calendar
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from datetime import date, timedelta
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import Numeric, cast, func, insert, literal, select, update
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 
-from app.models.payment import Payment, PaymentStatus
+from app.models.payment import Payment, PaymentStatus, PaymentType
 from app.models.contract import Contract, ContractStatus
-from app.schemas.payment import PaymentCreate, PaymentUpdate
+from app.schemas.payment import Payment as PaymentSchema, PaymentCreate, PaymentUpdate
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.export import ExportFormat, export_statement, stream_export
+from app.core.pagination import Page, paginate
+from app.core.serialization import RowSerializer
+from app.core.database import run_sync
+from app.services.scoping import AccessScope
+
+logger = get_logger(__name__)
+
+# Clés de tri autorisées pour la pagination par curseur
+PAYMENT_SORT_COLUMNS = {
+    "id": Payment.id,
+    "due_date": Payment.due_date,
+}
+
+# Projection et sérialisation rapides des listes (voir `RowSerializer`)
+PAYMENT_ROWS = RowSerializer(PaymentSchema, Payment)
+
+def month_index(day: date) -> int:
+    """Numéro de mois absolu (année * 12 + mois - 1), pour l'arithmétique sur les mois."""
+    return day.year * 12 + day.month - 1
+
+def rent_due_date(index: int, payment_day: int) -> date:
+    """
+    Date d'échéance du loyer d'un mois, le jour de paiement étant ramené au
+    dernier jour des mois trop courts (ex. le 31 devient le 28 février).
+
+    Args:
+        index: Numéro de mois absolu (voir `month_index`)
+        payment_day: Jour de paiement du contrat (1-31)
+
+    Returns:
+        date: Date d'échéance
+    """
+    year, month = divmod(index, 12)
+    month += 1
+    return date(year, month, min(payment_day, calendar.monthrange(year, month)[1]))
 
 class PaymentService:
     @staticmethod
-    def get_payment(payment_id: int, db: Session) -> Payment:
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
+    def get_payment(payment_id: int, db: Session, columns: Optional[Sequence[Any]] = None) -> Payment:
+        query = db.query(Payment) if columns is None else db.query(*columns)
+        payment = query.filter(Payment.id == payment_id).first()
         if not payment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -27,16 +70,68 @@ class PaymentService:
         status: Optional[PaymentStatus] = None,
         type: Optional[str] = None
     ) -> List[Payment]:
+        return PaymentService.get_payments_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            contract_id=contract_id,
+            status=status,
+            type=type
+        ).items
+
+    @staticmethod
+    def payments_query(
+        db: Session,
+        contract_id: Optional[int] = None,
+        status: Optional[PaymentStatus] = None,
+        type: Optional[str] = None,
+        scope: Optional[AccessScope] = None
+    ) -> Query:
+        """
+        Construit la requête filtrée des paiements, sans l'exécuter (pagination et export).
+
+        Args:
+            scope: Restreint aux paiements visibles par l'utilisateur
+        """
         query = db.query(Payment)
         
+        if scope is not None:
+            query = scope.apply(query)
         if contract_id:
             query = query.filter(Payment.contract_id == contract_id)
         if status:
             query = query.filter(Payment.status == status)
         if type:
             query = query.filter(Payment.type == type)
-            
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    @staticmethod
+    def get_payments_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        contract_id: Optional[int] = None,
+        status: Optional[PaymentStatus] = None,
+        type: Optional[str] = None,
+        scope: Optional[AccessScope] = None,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        include_total: bool = False,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Page:
+        return paginate(
+            PaymentService.payments_query(
+                db, contract_id=contract_id, status=status, type=type, scope=scope
+            ),
+            id_column=Payment.id,
+            sort_columns=PAYMENT_SORT_COLUMNS,
+            sort=sort,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            include_total=include_total,
+            columns=columns
+        )
 
     @staticmethod
     def create_payment(payment_data: PaymentCreate, db: Session) -> Payment:
@@ -99,9 +194,194 @@ class PaymentService:
             Payment.due_date < today
         ).all()
 
+    @staticmethod
+    def process_overdue_payments(
+        db: Session,
+        as_of: Optional[date] = None,
+        batch_size: int = settings.OVERDUE_BATCH_SIZE
+    ) -> Dict[str, int]:
+        """
+        Passe en retard les paiements échus et applique les pénalités de retard.
+
+        Deux étapes ensemblistes, chacune découpée en lots de `batch_size`
+        lignes validés un par un :
+
+        1. `UPDATE` des paiements en attente dont l'échéance est dépassée vers
+           `OVERDUE` ;
+        2. `INSERT ... SELECT` d'une pénalité (`PAYMENT_LATE_FEE_PERCENTAGE` du
+           montant) pour chaque paiement en retard depuis plus de
+           `PAYMENT_GRACE_PERIOD_DAYS` jours qui n'en a pas encore.
+
+        Une pénalité référence le paiement qu'elle sanctionne
+        (`late_fee_for_id`, unique) : la tâche peut être rejouée sans doublon,
+        et les pénalités elles-mêmes ne sont jamais pénalisées.
+
+        Args:
+            db: Session de base de données
+            as_of: Date de référence (par défaut aujourd'hui)
+            batch_size: Nombre de lignes par instruction
+
+        Returns:
+            Dict[str, int]: Paiements passés en retard et pénalités créées
+        """
+        today = as_of or date.today()
+        fee_cutoff = today - timedelta(days=settings.PAYMENT_GRACE_PERIOD_DAYS)
+        report = {"marked_overdue": 0, "late_fees": 0}
+
+        while True:
+            batch = select(Payment.id).where(
+                Payment.status == PaymentStatus.PENDING,
+                Payment.due_date < today
+            ).order_by(Payment.id).limit(batch_size)
+            marked = db.execute(
+                update(Payment).where(Payment.id.in_(batch)).values(status=PaymentStatus.OVERDUE),
+                execution_options={"synchronize_session": False}
+            ).rowcount
+            db.commit()
+            report["marked_overdue"] += marked
+            if marked < batch_size:
+                break
+
+        late_fee = aliased(Payment)
+        while True:
+            penalized = select(
+                Payment.contract_id,
+                func.round(cast(Payment.amount * settings.PAYMENT_LATE_FEE_PERCENTAGE / 100, Numeric), 2),
+                # Conversions explicites : PostgreSQL ne déduit pas le type enum d'un littéral
+                cast(literal(PaymentType.LATE_FEE, Payment.type.type), Payment.type.type),
+                cast(literal(PaymentStatus.PENDING, Payment.status.type), Payment.status.type),
+                literal(today),
+                literal("Pénalité de retard"),
+                Payment.id
+            ).where(
+                Payment.status == PaymentStatus.OVERDUE,
+                Payment.type != PaymentType.LATE_FEE,
+                Payment.due_date < fee_cutoff,
+                ~select(late_fee.id).where(late_fee.late_fee_for_id == Payment.id).exists()
+            ).order_by(Payment.id).limit(batch_size)
+            created = db.execute(
+                insert(Payment.__table__).from_select(
+                    ["contract_id", "amount", "type", "status", "due_date", "notes", "late_fee_for_id"],
+                    penalized
+                )
+            ).rowcount
+            db.commit()
+            report["late_fees"] += created
+            if created < batch_size:
+                break
+
+        logger.info(f"Paiements en retard : {report}")
+        return report
+
+    @staticmethod
+    def _plan_rent_schedule(
+        db: Session,
+        contracts: Sequence[Any],
+        first_month: int,
+        last_month: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Prépare les loyers manquants d'un lot de contrats sur une plage de mois.
+
+        Les mois déjà pourvus d'un loyer sont relevés en une requête et ignorés,
+        ce qui rend la génération rejouable.
+
+        Args:
+            db: Session de base de données
+            contracts: Lignes (id, start_date, end_date, rent_amount, payment_day)
+            first_month: Premier mois de la plage (numéro absolu)
+            last_month: Dernier mois de la plage, inclus
+
+        Returns:
+            List[Dict[str, Any]]: Paiements à insérer
+        """
+        if not contracts:
+            return []
+        existing = {
+            (contract_id, month_index(due_date))
+            for contract_id, due_date in db.query(Payment.contract_id, Payment.due_date).filter(
+                Payment.contract_id.in_([contract.id for contract in contracts]),
+                Payment.type == PaymentType.RENT,
+                Payment.due_date >= rent_due_date(first_month, 1),
+                Payment.due_date <= rent_due_date(last_month, 31)
+            )
+        }
+        rows = []
+        for contract in contracts:
+            for index in range(first_month, last_month + 1):
+                due_date = rent_due_date(index, contract.payment_day)
+                if contract.end_date and due_date > contract.end_date:
+                    break
+                if due_date < contract.start_date or (contract.id, index) in existing:
+                    continue
+                rows.append({
+                    "contract_id": contract.id,
+                    "amount": contract.rent_amount,
+                    "type": PaymentType.RENT,
+                    "status": PaymentStatus.PENDING,
+                    "due_date": due_date,
+                })
+        return rows
+
+    @staticmethod
+    def generate_rent_schedules(
+        db: Session,
+        months_ahead: int = settings.RENT_SCHEDULE_MONTHS_AHEAD,
+        as_of: Optional[date] = None,
+        batch_size: int = settings.RENT_SCHEDULE_BATCH_SIZE
+    ) -> Dict[str, int]:
+        """
+        Génère les loyers à venir de tous les contrats actifs.
+
+        Les contrats sont parcourus par lots (pagination sur l'identifiant) ;
+        chaque lot coûte une requête de lecture des loyers existants et une
+        insertion groupée, puis est validé. Les mois déjà générés sont ignorés :
+        la tâche peut être rejouée chaque nuit sans créer de doublon.
+
+        Args:
+            db: Session de base de données
+            months_ahead: Nombre de mois générés, mois courant compris
+            as_of: Date de référence (par défaut aujourd'hui)
+            batch_size: Nombre de contrats traités par lot
+
+        Returns:
+            Dict[str, int]: Contrats parcourus et loyers créés
+        """
+        first_month = month_index(as_of or date.today())
+        last_month = first_month + months_ahead - 1
+        report = {"contracts": 0, "created": 0}
+        last_id = 0
+        while True:
+            contracts = db.query(
+                Contract.id, Contract.start_date, Contract.end_date,
+                Contract.rent_amount, Contract.payment_day
+            ).filter(
+                Contract.id > last_id,
+                Contract.status == ContractStatus.ACTIVE,
+                Contract.rent_amount.isnot(None),
+                Contract.payment_day.isnot(None)
+            ).order_by(Contract.id).limit(batch_size).all()
+            if not contracts:
+                break
+            rows = PaymentService._plan_rent_schedule(db, contracts, first_month, last_month)
+            if rows:
+                db.execute(insert(Payment.__table__), rows)
+            db.commit()
+            report["contracts"] += len(contracts)
+            report["created"] += len(rows)
+            last_id = contracts[-1].id
+        logger.info(f"Échéanciers de loyers : {report}")
+        return report
+
     @staticmethod
     def generate_rent_payments(contract_id: int, db: Session) -> List[Payment]:
-        """Generate rent payments for a contract"""
+        """
+        Génère les loyers manquants d'un contrat, du mois courant jusqu'à la fin
+        du contrat (ou sur douze mois s'il n'a pas de date de fin).
+
+        Returns:
+            List[Payment]: Loyers créés
+        """
         contract = db.query(Contract).filter(Contract.id == contract_id).first()
         if not contract:
             raise HTTPException(
@@ -115,22 +395,75 @@ class PaymentService:
                 detail="Contract must have rent amount and payment day set"
             )
         
-        # Generate payments for the remaining months of the contract
-        payments = []
-        current_date = date.today()
-        end_date = contract.end_date or date(current_date.year + 1, current_date.month, current_date.day)
-        
-        while current_date <= end_date:
-            payment = Payment(
-                contract_id=contract_id,
-                amount=contract.rent_amount,
-                type="rent",
-                status=PaymentStatus.PENDING,
-                due_date=date(current_date.year, current_date.month, contract.payment_day)
-            )
-            payments.append(payment)
-            current_date = date(current_date.year, current_date.month + 1, current_date.day)
-        
-        db.add_all(payments)
+        first_month = month_index(date.today())
+        last_month = month_index(contract.end_date) if contract.end_date else first_month + 12
+        rows = PaymentService._plan_rent_schedule(db, [contract], first_month, last_month)
+        if not rows:
+            return []
+        db.execute(insert(Payment.__table__), rows)
         db.commit()
-        return payments 
\ No newline at end of file
+        return db.query(Payment).filter(
+            Payment.contract_id == contract_id,
+            Payment.type == PaymentType.RENT,
+            Payment.due_date.in_([row["due_date"] for row in rows])
+        ).order_by(Payment.due_date).all()
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    @staticmethod
+    async def get_payment_async(db: AsyncSession, **kwargs) -> Payment:
+        """Variante asynchrone de `get_payment`."""
+        return await run_sync(db, PaymentService.get_payment, **kwargs)
+
+    @staticmethod
+    async def get_payments_async(db: AsyncSession, **kwargs) -> List[Payment]:
+        """Variante asynchrone de `get_payments`."""
+        return await run_sync(db, PaymentService.get_payments, **kwargs)
+
+    @staticmethod
+    async def get_payments_page_async(db: AsyncSession, **kwargs) -> Page:
+        """Variante asynchrone de `get_payments_page`."""
+        return await run_sync(db, PaymentService.get_payments_page, **kwargs)
+
+    @staticmethod
+    async def create_payment_async(db: AsyncSession, **kwargs) -> Payment:
+        """Variante asynchrone de `create_payment`."""
+        return await run_sync(db, PaymentService.create_payment, **kwargs)
+
+    @staticmethod
+    async def update_payment_async(db: AsyncSession, **kwargs) -> Payment:
+        """Variante asynchrone de `update_payment`."""
+        return await run_sync(db, PaymentService.update_payment, **kwargs)
+
+    @staticmethod
+    async def mark_payment_as_paid_async(db: AsyncSession, **kwargs) -> Payment:
+        """Variante asynchrone de `mark_payment_as_paid`."""
+        return await run_sync(db, PaymentService.mark_payment_as_paid, **kwargs)
+
+    @staticmethod
+    async def check_overdue_payments_async(db: AsyncSession, **kwargs) -> List[Payment]:
+        """Variante asynchrone de `check_overdue_payments`."""
+        return await run_sync(db, PaymentService.check_overdue_payments, **kwargs)
+
+    @staticmethod
+    async def generate_rent_payments_async(db: AsyncSession, **kwargs) -> List[Payment]:
+        """Variante asynchrone de `generate_rent_payments`."""
+        return await run_sync(db, PaymentService.generate_rent_payments, **kwargs)
+
+    @staticmethod
+    async def process_overdue_payments_async(db: AsyncSession, **kwargs) -> Dict[str, int]:
+        """Variante asynchrone de `process_overdue_payments`."""
+        return await run_sync(db, PaymentService.process_overdue_payments, **kwargs)
+
+    @staticmethod
+    async def generate_rent_schedules_async(db: AsyncSession, **kwargs) -> Dict[str, int]:
+        """Variante asynchrone de `generate_rent_schedules`."""
+        return await run_sync(db, PaymentService.generate_rent_schedules, **kwargs)
+
+    @staticmethod
+    def export_payments(
+        db: AsyncSession, format: ExportFormat, fields: Sequence[str] = PAYMENT_ROWS.fields, **filters
+    ) -> AsyncIterator[bytes]:
+        """Exporte en continu les paiements filtrés par `payments_query`."""
+        query = PaymentService.payments_query(db.sync_session, **filters)
+        return stream_export(db, export_statement(query, fields), format)
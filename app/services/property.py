@@ -1,22 +1,39 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional, Sequence
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import status as http_status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
 from app.models.property import Property, PropertyType, PropertyStatus
 from app.core.logging import get_logger
+from app.core.export import ExportFormat, export_statement, stream_export
+from app.core.pagination import Page, paginate
+from app.core.serialization import RowSerializer
 
-from app.schemas.property import PropertyCreate, PropertyUpdate
+from app.schemas.property import Property as PropertySchema, PropertyCreate, PropertyUpdate
 from app.models.user import User, UserRole
 from app.models.contract import Contract, ContractStatus
+from app.core.database import run_sync
+from app.services.scoping import AccessScope
 
 logger = get_logger(__name__)
 
+# Clés de tri autorisées pour la pagination par curseur
+PROPERTY_SORT_COLUMNS = {
+    "id": Property.id,
+    "price": Property.price,
+}
+
+# Projection et sérialisation rapides des listes (voir `RowSerializer`)
+PROPERTY_ROWS = RowSerializer(PropertySchema, Property)
+
 class PropertyService:
     @staticmethod
     def get_property(
         property_id: int,
         db: Session,
         user_role: Optional[UserRole] = None,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        columns: Optional[Sequence[Any]] = None
     ) -> Property:
         """
         Récupère une propriété spécifique avec vérification des permissions.
@@ -26,6 +43,8 @@ class PropertyService:
             db: Session de base de données
             user_role: Rôle de l'utilisateur qui fait la requête
             user_id: ID de l'utilisateur qui fait la requête
+            columns: Colonnes à lire (ligne brute au lieu d'un objet ORM) ;
+                doivent inclure `owner_id` pour le contrôle des propriétaires
             
         Returns:
             Property: La propriété demandée
@@ -33,7 +52,8 @@ class PropertyService:
         Raises:
             HTTPException: Si la propriété n'existe pas ou si l'utilisateur n'a pas les permissions
         """
-        property = db.query(Property).filter(Property.id == property_id).first()
+        query = db.query(Property) if columns is None else db.query(*columns)
+        property = query.filter(Property.id == property_id).first()
         if not property:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -79,20 +99,94 @@ class PropertyService:
         user_id: Optional[int] = None
     ) -> List[Property]:
         """
-        Récupère une liste de propriétés avec filtres et pagination.
+        Récupère une liste de propriétés avec filtres et pagination par offset.
+        
+        Voir `get_properties_page` pour la pagination par curseur.
+        
+        Returns:
+            List[Property]: Liste des propriétés correspondant aux critères
+        """
+        return PropertyService.get_properties_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            owner_id=owner_id,
+            status=status,
+            type=type,
+            user_role=user_role,
+            user_id=user_id
+        ).items
+
+    @staticmethod
+    def properties_query(
+        db: Session,
+        owner_id: Optional[int] = None,
+        status: Optional[PropertyStatus] = None,
+        type: Optional[PropertyType] = None,
+        user_role: Optional[UserRole] = None,
+        user_id: Optional[int] = None
+    ) -> Query:
+        """
+        Construit la requête des propriétés visibles par l'utilisateur, sans l'exécuter.
+
+        Partagée par la pagination (`get_properties_page`) et l'export (`export_properties`).
+
+        Raises:
+            HTTPException: Si un propriétaire filtre sur un autre propriétaire
+        """
+        # Les propriétaires ne peuvent voir que leurs propriétés
+        if user_role == UserRole.OWNER and owner_id and owner_id != user_id:
+            raise HTTPException(
+                status_code=http_status.HTTP_403_FORBIDDEN,
+                detail="Vous ne pouvez voir que vos propres propriétés"
+            )
+
+        # Restriction selon le rôle (voir `AccessScope.properties`)
+        query = AccessScope(user_role, user_id).apply(db.query(Property))
+
+        # Application des filtres supplémentaires
+        if owner_id:
+            query = query.filter(Property.owner_id == owner_id)
+        if status:
+            query = query.filter(Property.status == status)
+        if type:
+            query = query.filter(Property.type == type)
+        return query
+
+    @staticmethod
+    def get_properties_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        owner_id: Optional[int] = None,
+        status: Optional[PropertyStatus] = None,
+        type: Optional[PropertyType] = None,
+        user_role: Optional[UserRole] = None,
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        include_total: bool = False,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Page:
+        """
+        Récupère une page de propriétés avec filtres.
         
         Args:
             db: Session de base de données
-            skip: Nombre d'éléments à sauter (doit être >= 0)
+            skip: Nombre d'éléments à sauter (doit être >= 0, ignoré avec un curseur)
             limit: Nombre maximum d'éléments (doit être entre 1 et 100)
             owner_id: ID du propriétaire pour filtrer (uniquement pour ADMIN/AGENT)
             status: Statut de la propriété pour filtrer
             type: Type de propriété pour filtrer
             user_role: Rôle de l'utilisateur qui fait la requête
             user_id: ID de l'utilisateur qui fait la requête
+            cursor: Curseur renvoyé par la page précédente
+            sort: Clé de tri (voir `PROPERTY_SORT_COLUMNS`)
+            include_total: Calcule le nombre total de résultats
+            columns: Colonnes à projeter (voir `paginate`)
             
         Returns:
-            List[Property]: Liste des propriétés correspondant aux critères
+            Page: Propriétés de la page, curseur suivant et total éventuel
             
         Raises:
             HTTPException: Si les paramètres sont invalides ou en cas d'erreur
@@ -101,73 +195,51 @@ class PropertyService:
             # Validation des paramètres de pagination
             if skip < 0:
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
+                    status_code=http_status.HTTP_400_BAD_REQUEST,
                     detail="Le paramètre 'skip' doit être positif"
                 )
             
             if not 1 <= limit <= 100:
                 raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
+                    status_code=http_status.HTTP_400_BAD_REQUEST,
                     detail="Le paramètre 'limit' doit être entre 1 et 100"
                 )
 
-            # Construction de la requête de base
-            query = db.query(Property)
-
-            # Application des filtres selon le rôle de l'utilisateur
-            if user_role == UserRole.ADMIN or user_role == UserRole.AGENT:
-                # Les admins et agents peuvent voir toutes les propriétés
-                if owner_id:
-                    query = query.filter(Property.owner_id == owner_id)
-            elif user_role == UserRole.OWNER:
-                # Les propriétaires ne peuvent voir que leurs propriétés
-                if owner_id and owner_id != user_id:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Vous ne pouvez voir que vos propres propriétés"
-                    )
-                query = query.filter(Property.owner_id == user_id)
-            elif user_role == UserRole.TENANT:
-                # Les locataires ne peuvent voir que les propriétés qu'ils louent
-                tenant_contracts = db.query(Contract).filter(
-                    Contract.tenant_id == user_id,
-                    Contract.status == ContractStatus.ACTIVE
-                ).all()
-                property_ids = [contract.property_id for contract in tenant_contracts]
-                if not property_ids:
-                    return []  # Aucune propriété louée
-                query = query.filter(Property.id.in_(property_ids))
-
-            # Application des filtres supplémentaires
-            if status:
-                query = query.filter(Property.status == status)
-            if type:
-                query = query.filter(Property.type == type)
-
-            # Compte total des résultats (pour la pagination)
-            total_count = query.count()
-            
-            # Application de la pagination
-            query = query.order_by(Property.id)  # Tri par ID pour une pagination cohérente
-            query = query.offset(skip).limit(limit)
-            
-            # Exécution de la requête
-            properties = query.all()
+            query = PropertyService.properties_query(
+                db,
+                owner_id=owner_id,
+                status=status,
+                type=type,
+                user_role=user_role,
+                user_id=user_id
+            )
+
+            page = paginate(
+                query,
+                id_column=Property.id,
+                sort_columns=PROPERTY_SORT_COLUMNS,
+                sort=sort,
+                limit=limit,
+                skip=skip,
+                cursor=cursor,
+                include_total=include_total,
+                columns=columns
+            )
             
             logger.info(
-                f"Récupération de {len(properties)}/{total_count} propriétés avec les filtres: "
-                f"skip={skip}, limit={limit}, owner_id={owner_id}, "
+                f"Récupération de {len(page.items)} propriétés avec les filtres: "
+                f"skip={skip}, cursor={cursor}, limit={limit}, owner_id={owner_id}, "
                 f"status={status}, type={type}, user_role={user_role}"
             )
             
-            return properties
+            return page
             
         except HTTPException:
             raise
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des propriétés: {str(e)}")
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erreur lors de la récupération des propriétés"
             )
 
@@ -220,4 +292,60 @@ class PropertyService:
         property.status = status
         db.commit()
         db.refresh(property)
-        return property 
\ No newline at end of file
+        return property
+
+    # Variantes asynchrones : mêmes règles métier, exécutées sur une AsyncSession
+
+    @staticmethod
+    async def get_property_async(db: AsyncSession, **kwargs) -> Property:
+        """Variante asynchrone de `get_property`."""
+        return await run_sync(db, PropertyService.get_property, **kwargs)
+
+    @staticmethod
+    async def get_properties_async(db: AsyncSession, **kwargs) -> List[Property]:
+        """Variante asynchrone de `get_properties`."""
+        return await run_sync(db, PropertyService.get_properties, **kwargs)
+
+    @staticmethod
+    async def get_properties_page_async(db: AsyncSession, **kwargs) -> Page:
+        """Variante asynchrone de `get_properties_page`."""
+        return await run_sync(db, PropertyService.get_properties_page, **kwargs)
+
+    @staticmethod
+    async def create_property_async(db: AsyncSession, **kwargs) -> Property:
+        """Variante asynchrone de `create_property`."""
+        return await run_sync(db, PropertyService.create_property, **kwargs)
+
+    @staticmethod
+    async def update_property_async(db: AsyncSession, **kwargs) -> Property:
+        """Variante asynchrone de `update_property`."""
+        return await run_sync(db, PropertyService.update_property, **kwargs)
+
+    @staticmethod
+    async def delete_property_async(db: AsyncSession, **kwargs) -> None:
+        """Variante asynchrone de `delete_property`."""
+        return await run_sync(db, PropertyService.delete_property, **kwargs)
+
+    @staticmethod
+    async def update_property_status_async(db: AsyncSession, **kwargs) -> Property:
+        """Variante asynchrone de `update_property_status`."""
+        return await run_sync(db, PropertyService.update_property_status, **kwargs)
+
+    @staticmethod
+    def export_properties(
+        db: AsyncSession, format: ExportFormat, fields: Sequence[str] = PROPERTY_ROWS.fields, **filters
+    ) -> AsyncIterator[bytes]:
+        """
+        Exporte en continu les propriétés visibles par l'utilisateur.
+
+        Args:
+            db: Session asynchrone
+            format: Format de sortie
+            fields: Colonnes exportées, dans l'ordre
+            **filters: Filtres de `properties_query`
+
+        Returns:
+            AsyncIterator[bytes]: Contenu de l'export, lot par lot
+        """
+        query = PropertyService.properties_query(db.sync_session, **filters)
+        return stream_export(db, export_statement(query, fields), format)
@@ -0,0 +1,161 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.database import run_sync
+from app.core.serialization import RowSerializer
+
+from app.models.contract import Contract, ContractStatus
+from app.models.maintenance import MaintenanceRequest
+from app.models.payment import Payment
+from app.models.property import Property
+from app.models.user import User, UserRole
+from app.schemas.user import Principal
+
+class AccessScope:
+    """
+    Visibilité des ressources selon le rôle, exprimée en conditions SQL.
+
+    Chaque condition est ajoutée au WHERE de la requête filtrée (égalité ou
+    sous-requête EXISTS corrélée) : la base applique les droits dans la même
+    requête que les autres filtres, sans charger au préalable les contrats de
+    l'utilisateur. Les admins, les agents et les appels internes (sans rôle)
+    voient toutes les lignes.
+    """
+
+    def __init__(self, role: Optional[UserRole] = None, user_id: Optional[int] = None):
+        self.role = role
+        self.user_id = user_id
+
+    @classmethod
+    def of(cls, principal: Principal) -> "AccessScope":
+        return cls(principal.role, principal.id)
+
+    def properties(self):
+        """Propriétaire : ses biens. Locataire : les biens qu'il loue (contrat actif)."""
+        if self.role == UserRole.OWNER:
+            return Property.owner_id == self.user_id
+        if self.role == UserRole.TENANT:
+            return exists().where(and_(
+                Contract.property_id == Property.id,
+                Contract.tenant_id == self.user_id,
+                Contract.status == ContractStatus.ACTIVE
+            ))
+        return None
+
+    def contracts(self):
+        """Locataire : ses contrats."""
+        if self.role == UserRole.TENANT:
+            return Contract.tenant_id == self.user_id
+        return None
+
+    def payments(self):
+        """Locataire : les paiements de ses contrats."""
+        if self.role == UserRole.TENANT:
+            return exists().where(and_(
+                Contract.id == Payment.contract_id,
+                Contract.tenant_id == self.user_id
+            ))
+        return None
+
+    def maintenance_requests(self):
+        """Locataire : les demandes portant sur un bien dont il a un contrat."""
+        if self.role == UserRole.TENANT:
+            return exists().where(and_(
+                Contract.property_id == MaintenanceRequest.property_id,
+                Contract.tenant_id == self.user_id
+            ))
+        return None
+
+    def users(self):
+        """
+        Comptes liés (locataire, demandeur, intervenant) : visibles de tous.
+
+        Ils ne sont inclus dans les autres ressources que par `UserSummary`,
+        sans email ni téléphone.
+        """
+        return None
+
+    def apply(self, query: Query) -> Query:
+        """
+        Restreint une requête ORM aux lignes visibles.
+
+        Args:
+            query: Requête sur Property, Contract, Payment ou MaintenanceRequest
+
+        Returns:
+            Query: Requête filtrée (inchangée si le rôle voit tout)
+        """
+        condition = self.condition(query.column_descriptions[0]["entity"])
+        return query if condition is None else query.filter(condition)
+
+    def condition(self, model: Any):
+        """Condition de visibilité des lignes d'un modèle (None si le rôle voit tout)."""
+        return _CONDITIONS[model](self)
+
+    def fetch(self, db: Session, rows: RowSerializer, ids: Sequence[int]) -> "Batch":
+        """
+        Lit des lignes par identifiant en une seule requête.
+
+        La condition de visibilité est évaluée comme une colonne du SELECT :
+        les lignes existantes mais non visibles sont comptées comme interdites
+        sans être exposées, sans requête de contrôle par ligne.
+
+        Args:
+            db: Session de base de données
+            rows: Sérialiseur de la ressource (colonnes à lire)
+            ids: Identifiants demandés (doublons ignorés)
+
+        Returns:
+            Batch: Lignes visibles dans l'ordre demandé, identifiants absents et interdits
+
+        Raises:
+            HTTPException: 400 si la liste est vide ou dépasse BATCH_MAX_IDS
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids or len(ids) > settings.BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Entre 1 et {settings.BATCH_MAX_IDS} identifiants par requête"
+            )
+        table = rows.model.__table__
+        condition = self.condition(rows.model)
+        columns = rows.columns + (table.c.id.label("batch_id"),)
+        if condition is not None:
+            columns += (condition.label("batch_visible"),)
+        found = {row.batch_id: row for row in db.query(*columns).filter(table.c.id.in_(ids))}
+
+        batch = Batch()
+        for id in ids:
+            row = found.get(id)
+            if row is None:
+                batch.missing.append(id)
+            elif condition is not None and not row.batch_visible:
+                batch.forbidden.append(id)
+            else:
+                batch.rows.append(row)
+        return batch
+
+    async def fetch_async(self, db: AsyncSession, rows: RowSerializer, ids: Sequence[int]) -> "Batch":
+        return await run_sync(db, self.fetch, rows=rows, ids=ids)
+
+class Batch:
+    """Résultat d'une lecture groupée par identifiants (`AccessScope.fetch`)."""
+
+    def __init__(self):
+        self.rows: List[Tuple] = []
+        self.missing: List[int] = []
+        self.forbidden: List[int] = []
+
+# Condition de visibilité par modèle
+_CONDITIONS = {
+    Property: AccessScope.properties,
+    Contract: AccessScope.contracts,
+    Payment: AccessScope.payments,
+    MaintenanceRequest: AccessScope.maintenance_requests,
+    User: AccessScope.users,
+}
@@ -0,0 +1,3 @@
+"""
+Package benchmarks contenant les mesures de performance de l'application.
+"""
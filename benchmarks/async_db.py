@@ -0,0 +1,150 @@
+"""
+Compare le débit de `PropertyService.get_properties` en mode synchrone
+(session bloquante dans un handler `async def`) et en mode asynchrone
+(`AsyncSession` via `get_properties_async`).
+
+Usage:
+    python -m benchmarks.async_db --requests 200 --concurrency 20 --latency-ms 5
+
+Sans `--database-url`, une base SQLite temporaire est utilisée ; chaque
+requête y paie une latence simulée (`--latency-ms`) exécutée par le pilote,
+comme le ferait un aller-retour réseau vers PostgreSQL. Avec une URL
+PostgreSQL, la latence réelle du serveur est mesurée et la simulation est
+désactivée.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from sqlalchemy import event, text
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_async_db_engine, create_db_engine
+from app.models import Property, PropertyType, User, UserRole
+from app.services.property import PropertyService
+
+
+def _install_latency(sync_engine, latency_ms: float) -> None:
+    """Déclare une fonction SQLite `bench_sleep(ms)` simulant un aller-retour."""
+
+    @event.listens_for(sync_engine, "connect")
+    def _register(dbapi_connection, _record):
+        target = getattr(dbapi_connection, "_connection", dbapi_connection)
+        if hasattr(target, "_conn"):  # aiosqlite : fonction déclarée sur sqlite3
+            target = target._conn
+        target.create_function("bench_sleep", 1, lambda ms: time.sleep(ms / 1000.0))
+
+
+def _seed(url: str, rows: int) -> None:
+    engine = create_db_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        if db.query(User).count():
+            return
+        owner = User(email="bench@example.com", hashed_password="x", role=UserRole.OWNER)
+        db.add(owner)
+        db.flush()
+        db.add_all(
+            Property(
+                title=f"Bien {i}", type=PropertyType.APARTMENT, address=f"{i} rue du Test",
+                city="Paris", postal_code="75000", country="France",
+                surface_area=50.0, price=1000.0, owner_id=owner.id,
+            )
+            for i in range(rows)
+        )
+        db.commit()
+    engine.dispose()
+
+
+async def _run_sync_mode(url: str, args: argparse.Namespace, simulate: bool) -> float:
+    engine = create_db_engine(url)
+    if simulate:
+        _install_latency(engine, args.latency_ms)
+    Session = sessionmaker(bind=engine)
+
+    async def handler():
+        with Session() as db:
+            if simulate:
+                db.execute(text("SELECT bench_sleep(:ms)"), {"ms": args.latency_ms})
+            PropertyService.get_properties(db=db, limit=args.limit)
+
+    elapsed = await _drive(handler, args)
+    engine.dispose()
+    return elapsed
+
+
+async def _run_async_mode(url: str, args: argparse.Namespace, simulate: bool) -> float:
+    engine = create_async_db_engine(url)
+    if simulate:
+        _install_latency(engine.sync_engine, args.latency_ms)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def handler():
+        async with Session() as db:
+            if simulate:
+                await db.execute(text("SELECT bench_sleep(:ms)"), {"ms": args.latency_ms})
+            await PropertyService.get_properties_async(db, limit=args.limit)
+
+    elapsed = await _drive(handler, args)
+    await engine.dispose()
+    return elapsed
+
+
+async def _drive(handler, args: argparse.Namespace) -> float:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    return time.perf_counter() - start
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    simulate = make_url(url).get_backend_name() == "sqlite" and args.latency_ms > 0
+    _seed(url, args.rows)
+
+    results: Dict[str, Any] = {
+        "database": make_url(url).get_backend_name(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "simulated_latency_ms": args.latency_ms if simulate else None,
+    }
+    for mode, runner in (("sync", _run_sync_mode), ("async", _run_async_mode)):
+        elapsed = asyncio.run(runner(url, args, simulate))
+        results[mode] = {
+            "seconds": round(elapsed, 4),
+            "requests_per_second": round(args.requests / elapsed, 1),
+        }
+    results["speedup"] = round(results["sync"]["seconds"] / results["async"]["seconds"], 2)
+    if tmpdir:
+        tmpdir.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Génère un jeu de données réaliste pour les benchmarks.
+
+Usage:
+    python -m benchmarks.dataset --database-url sqlite:///./bench.db --users 2000
+
+Pour `--users` utilisateurs : 1 % d'administrateurs, 4 % d'agents, 20 % de
+propriétaires (deux biens chacun) et 75 % de locataires. 80 % des biens sont
+loués (un contrat actif), chaque contrat a douze mois de loyers (le dernier en
+attente, 5 % des autres en retard) et chaque bien reçoit en moyenne une demande
+de maintenance tous les deux ans. La génération est déterministe (`--seed`).
+"""
+import argparse
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, create_db_engine
+from app.core.security import get_password_hash
+from app.models import (
+    Contract, ContractStatus, ContractType, MaintenanceRequest, MaintenanceStatus,
+    MaintenanceType, Payment, PaymentStatus, PaymentType, Property, PropertyStatus,
+    PropertyType, User, UserRole
+)
+
+# Mot de passe commun à tous les utilisateurs générés
+PASSWORD = "benchmark-password"
+
+ROLE_RATIOS = ((UserRole.ADMIN, 0.01), (UserRole.AGENT, 0.04), (UserRole.OWNER, 0.20))
+MIN_USERS = len(ROLE_RATIOS) + 1  # un utilisateur par rôle, locataires compris
+PROPERTIES_PER_OWNER = 2
+OCCUPANCY = 0.8
+PAYMENT_MONTHS = 12
+OVERDUE_RATIO = 0.05
+MAINTENANCE_PER_PROPERTY = 0.5
+
+CITIES = (("Paris", "75001"), ("Lyon", "69001"), ("Marseille", "13001"), ("Lille", "59000"), ("Nantes", "44000"))
+
+
+class Dataset:
+    """Identifiants des lignes générées, utilisés par les scénarios de charge."""
+
+    def __init__(self):
+        self.users: Dict[UserRole, List[int]] = {role: [] for role in UserRole}
+        self.emails: Dict[int, str] = {}
+        self.properties: List[int] = []
+        self.contracts: List[int] = []
+        self.payments: List[int] = []
+        self.maintenance_requests: List[int] = []
+        # Locataire -> bien loué
+        self.tenant_properties: Dict[int, int] = {}
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "users": len(self.emails),
+            "properties": len(self.properties),
+            "contracts": len(self.contracts),
+            "payments": len(self.payments),
+            "maintenance_requests": len(self.maintenance_requests),
+        }
+
+
+def _reset_sequences(connection, tables: List[str]) -> None:
+    """Aligne les séquences PostgreSQL après des insertions à identifiants explicites."""
+    for table in tables:
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+
+
+def generate(database_url: str, users: int, seed: int = 42) -> Dataset:
+    """
+    Crée le schéma et insère le jeu de données par lots.
+
+    Args:
+        database_url: URL de la base à remplir (vidée au préalable)
+        users: Nombre d'utilisateurs
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        Dataset: Identifiants générés
+
+    Raises:
+        ValueError: Si `users` ne permet pas au moins un utilisateur par rôle
+    """
+    if users < MIN_USERS:
+        raise ValueError(f"Au moins {MIN_USERS} utilisateurs requis (un par rôle)")
+    rng = random.Random(seed)
+    dataset = Dataset()
+    today = date.today()
+    hashed_password = get_password_hash(PASSWORD)
+
+    rows: Dict[Any, List[Dict[str, Any]]] = {
+        User: [], Property: [], Contract: [], Payment: [], MaintenanceRequest: []
+    }
+    # Au moins un utilisateur par rôle, même pour un petit jeu de données
+    thresholds, total = [], 0
+    for role, ratio in ROLE_RATIOS:
+        total += max(1, int(users * ratio))
+        thresholds.append((role, total))
+    for user_id in range(1, users + 1):
+        role = next((role for role, limit in thresholds if user_id <= limit), UserRole.TENANT)
+        email = f"{role.value}{user_id}@example.com"
+        dataset.users[role].append(user_id)
+        dataset.emails[user_id] = email
+        rows[User].append({
+            "id": user_id, "email": email, "hashed_password": hashed_password,
+            "full_name": f"Utilisateur {user_id}", "phone": f"+3360000{user_id:04d}",
+            "role": role, "is_active": True,
+        })
+
+    for owner_id in dataset.users[UserRole.OWNER]:
+        for _ in range(PROPERTIES_PER_OWNER):
+            property_id = len(dataset.properties) + 1
+            city, postal_code = rng.choice(CITIES)
+            surface = round(rng.uniform(18, 140), 1)
+            dataset.properties.append(property_id)
+            rows[Property].append({
+                "id": property_id, "title": f"Bien {property_id}", "description": "Généré pour les benchmarks",
+                "type": rng.choice((PropertyType.APARTMENT, PropertyType.APARTMENT, PropertyType.HOUSE)),
+                "status": PropertyStatus.AVAILABLE, "address": f"{property_id} rue du Benchmark",
+                "city": city, "postal_code": postal_code, "country": "France", "surface_area": surface,
+                "number_of_rooms": max(1, int(surface // 25)), "price": round(surface * 25, 2),
+                "owner_id": owner_id,
+            })
+
+    tenants = list(dataset.users[UserRole.TENANT])
+    rng.shuffle(tenants)
+    rented = rng.sample(dataset.properties, min(int(len(dataset.properties) * OCCUPANCY), len(tenants)))
+    for property_id, tenant_id in zip(rented, tenants):
+        contract_id = len(dataset.contracts) + 1
+        rent = rows[Property][property_id - 1]["price"]
+        start = today - timedelta(days=30 * PAYMENT_MONTHS + rng.randint(0, 365))
+        rows[Property][property_id - 1]["status"] = PropertyStatus.RENTED
+        dataset.contracts.append(contract_id)
+        dataset.tenant_properties[tenant_id] = property_id
+        rows[Contract].append({
+            "id": contract_id, "type": ContractType.RENTAL, "status": ContractStatus.ACTIVE,
+            "start_date": start, "end_date": start + timedelta(days=3 * 365),
+            "rent_amount": rent, "deposit_amount": rent * 2, "payment_day": 5,
+            "property_id": property_id, "tenant_id": tenant_id,
+        })
+        for month in range(PAYMENT_MONTHS, 0, -1):
+            payment_id = len(dataset.payments) + 1
+            due_date = today - timedelta(days=30 * (month - 1))
+            if month == 1:
+                status = PaymentStatus.PENDING
+            elif rng.random() < OVERDUE_RATIO:
+                status = PaymentStatus.OVERDUE
+            else:
+                status = PaymentStatus.PAID
+            dataset.payments.append(payment_id)
+            rows[Payment].append({
+                "id": payment_id, "amount": rent, "type": PaymentType.RENT, "status": status,
+                "due_date": due_date, "paid_date": due_date if status == PaymentStatus.PAID else None,
+                "contract_id": contract_id,
+            })
+
+    tenant_by_property = {property_id: tenant_id for tenant_id, property_id in dataset.tenant_properties.items()}
+    for _ in range(int(len(dataset.properties) * MAINTENANCE_PER_PROPERTY)):
+        request_id = len(dataset.maintenance_requests) + 1
+        property_id = rng.choice(dataset.properties)
+        owner_id = rows[Property][property_id - 1]["owner_id"]
+        created_at = datetime.now() - timedelta(days=rng.randint(0, 365))
+        status = rng.choice((MaintenanceStatus.PENDING, MaintenanceStatus.IN_PROGRESS, MaintenanceStatus.COMPLETED))
+        dataset.maintenance_requests.append(request_id)
+        rows[MaintenanceRequest].append({
+            "id": request_id, "title": f"Demande {request_id}", "description": "Généré pour les benchmarks",
+            "type": rng.choice(list(MaintenanceType)), "status": status, "priority": rng.randint(1, 5),
+            "request_date": created_at.date(), "created_at": created_at, "property_id": property_id,
+            "requested_by_id": tenant_by_property.get(property_id, owner_id),
+            "assigned_to_id": rng.choice(dataset.users[UserRole.AGENT] or [None]),
+        })
+
+    engine = create_db_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for model, mappings in rows.items():
+            db.bulk_insert_mappings(model, mappings)
+        if make_url(database_url).get_backend_name() == "postgresql":
+            _reset_sequences(db, [model.__tablename__ for model in rows])
+        db.commit()
+    engine.dispose()
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(json.dumps(generate(args.database_url, args.users, args.seed).counts(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
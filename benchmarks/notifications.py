@@ -0,0 +1,85 @@
+"""
+Compare le débit d'envoi d'emails avec une connexion SMTP par message
+(comportement historique de `send_email`) et avec l'envoi groupé sur des
+connexions persistantes (`send_bulk_notification`).
+
+Usage:
+    python -m benchmarks.notifications --messages 500 --latency-ms 5 --workers 4
+
+Le serveur SMTP local (aiosmtpd) applique une latence simulée sur EHLO et
+DATA, comme le ferait un aller-retour réseau vers un relais distant.
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from app.core.notifications import NotificationManager
+from app.core.smtp import SMTPConnectionPool
+from tests.fakes import LocalSMTPServer
+
+
+def _manager(server: LocalSMTPServer, workers: int, max_messages: int) -> NotificationManager:
+    manager = NotificationManager()
+    manager.smtp_pool = SMTPConnectionPool(
+        host=server.host, port=server.port, username="bench", password="bench",
+        tls=False, size=workers, max_messages=max_messages,
+    )
+    return manager
+
+
+def _recipients(count: int):
+    return [{"email": f"tenant{i}@example.com"} for i in range(count)]
+
+
+def _run_per_message(server: LocalSMTPServer, args: argparse.Namespace) -> float:
+    # Une connexion (EHLO + LOGIN) par message, envois en série
+    manager = _manager(server, 1, max_messages=1)
+    start = time.perf_counter()
+    for recipient in _recipients(args.messages):
+        manager.send_email(recipient["email"], "Rappel", "Bonjour")
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed
+
+
+def _run_pooled(server: LocalSMTPServer, args: argparse.Namespace) -> float:
+    manager = _manager(server, args.workers, max_messages=args.max_messages)
+    start = time.perf_counter()
+    manager.send_bulk_notification(
+        "Bonjour", _recipients(args.messages), subject="Rappel", max_workers=args.workers
+    )
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        "messages": args.messages,
+        "workers": args.workers,
+        "simulated_latency_ms": args.latency_ms,
+    }
+    for mode, runner in (("per_message", _run_per_message), ("pooled", _run_pooled)):
+        with LocalSMTPServer(latency=args.latency_ms / 1000.0) as server:
+            elapsed = runner(server, args)
+            results[mode] = {
+                "seconds": round(elapsed, 4),
+                "messages_per_second": round(args.messages / elapsed, 1),
+                "connections": server.connections,
+            }
+    results["speedup"] = round(results["per_message"]["seconds"] / results["pooled"]["seconds"], 2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--max-messages", type=int, default=100)
+    print(json.dumps(run(parser.parse_args()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare le coût d'une page de liste sérialisée par `response_model` et par le chemin rapide.
+
+Usage:
+    python -m benchmarks.serialization --users 2000 --limit 100 --iterations 200
+
+Chemin actuel : objets ORM, validation Pydantic de `List[Schema]` et
+`jsonable_encoder` (`fastapi.routing.serialize_response`), puis `JSONResponse`.
+Chemin rapide : requête projetée sur les colonnes du schéma (`RowSerializer`),
+dictionnaires précompilés et `ORJSONResponse`, sans revalidation. Chaque
+mesure inclut la requête ; `serialize_ms` isole la sérialisation d'une page
+déjà chargée. Sans `--database-url`, une base SQLite temporaire est remplie
+par `benchmarks.dataset`.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_db_engine
+from app.core.serialization import RowSerializer, page_response
+from app.services.contract import CONTRACT_ROWS, ContractService
+from app.services.maintenance import MAINTENANCE_ROWS, MaintenanceService
+from app.services.payment import PAYMENT_ROWS, PaymentService
+from app.services.property import PROPERTY_ROWS, PropertyService
+from benchmarks.dataset import generate
+
+# Listes mesurées : (nom, méthode de pagination, sérialiseur)
+RESOURCES = (
+    ("properties", PropertyService.get_properties_page, PROPERTY_ROWS),
+    ("contracts", ContractService.get_contracts_page, CONTRACT_ROWS),
+    ("payments", PaymentService.get_payments_page, PAYMENT_ROWS),
+    ("maintenance", MaintenanceService.get_maintenance_requests_page, MAINTENANCE_ROWS),
+)
+
+
+def _timed(fn: Callable[[], Any], iterations: int) -> float:
+    """Durée moyenne d'un appel, en millisecondes."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def _measure(db, page: Callable, rows: RowSerializer, args: argparse.Namespace) -> Dict[str, Any]:
+    field = create_response_field(name=f"Response_{rows.schema.__name__}", type_=List[rows.schema])
+    loop = asyncio.new_event_loop()
+
+    def current_body(items) -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+        return JSONResponse(content).body
+
+    def current():
+        db.expunge_all()
+        return current_body(page(db=db, limit=args.limit).items)
+
+    def fast():
+        return page_response(page(db=db, limit=args.limit, columns=rows.columns), rows).body
+
+    assert json.loads(current()) == json.loads(fast()), rows.schema.__name__
+    objects = page(db=db, limit=args.limit).items
+    projected = page(db=db, limit=args.limit, columns=rows.columns)
+    results = {
+        "current": {
+            "page_ms": round(_timed(current, args.iterations), 3),
+            "serialize_ms": round(_timed(lambda: current_body(objects), args.iterations), 3),
+        },
+        "fast": {
+            "page_ms": round(_timed(fast, args.iterations), 3),
+            "serialize_ms": round(_timed(lambda: page_response(projected, rows).body, args.iterations), 3),
+        },
+    }
+    loop.close()
+    results["speedup"] = round(results["current"]["page_ms"] / results["fast"]["page_ms"], 2)
+    results["serialize_speedup"] = round(
+        results["current"]["serialize_ms"] / results["fast"]["serialize_ms"], 2
+    )
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(tmpdir.name) / 'serialization.db'}"
+    generate(url, args.users)
+    engine = create_db_engine(url)
+    results: Dict[str, Any] = {"limit": args.limit, "iterations": args.iterations, "resources": {}}
+    with sessionmaker(bind=engine)() as db:
+        for name, page, rows in RESOURCES:
+            results["resources"][name] = _measure(db, page, rows, args)
+    engine.dispose()
+    if tmpdir:
+        tmpdir.cleanup()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=None,
+                        help="Base à utiliser ; elle est vidée puis remplie")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
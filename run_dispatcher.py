@@ -0,0 +1,42 @@
+import os
+import signal
+import sys
+import threading
+
+# Ajouter le répertoire du projet au PYTHONPATH
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+def main() -> None:
+    """Dispatcher de notifications autonome, à lancer à côté de l'API pour livrer l'outbox."""
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.logging import get_logger
+    from app.core.notifications import notification_manager
+    from app.core.outbox import notification_dispatcher
+
+    logger = get_logger("dispatcher")
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        logger.info(f"Signal {signal.Signals(signum).name} reçu, arrêt après le lot en cours")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Dispatcher de notifications démarré")
+    try:
+        while not stopping.is_set():
+            try:
+                notification_dispatcher.drain(SessionLocal)
+            except Exception as e:
+                # Base momentanément indisponible : nouvel essai au prochain intervalle
+                logger.exception(f"Échec de livraison de l'outbox : {e}")
+            stopping.wait(settings.OUTBOX_DISPATCH_INTERVAL_SECONDS)
+    finally:
+        notification_manager.close()
+        logger.info("Dispatcher de notifications arrêté")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
+import os
+
+# bcrypt au coût minimal pour que les tests ne soient pas dominés par le hachage
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+import asyncio
 import pytest
 from typing import Generator
-from sqlalchemy import create_engine
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
-from app.core.database import Base
+from app.core.database import Base, create_async_db_engine, create_db_engine
 from app.models import User, Property, Contract, Payment, MaintenanceRequest
 
 # Créer une base de données de test
@@ -37,6 +45,78 @@ def db(db_session: Session) -> Generator[Session, None, None]:
     yield db_session
     transaction.rollback()
 
+@pytest.fixture(scope="function")
+def isolated_db(tmp_path) -> Generator[Session, None, None]:
+    """
+    Crée une session sur une base SQLite vierge, propre à chaque test.
+
+    Le moteur est celui de l'application : ses requêtes sont relevées par
+    `app.core.query_budget.track_queries`.
+    """
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'isolated.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+@pytest.fixture(scope="function")
+def async_session_factory(tmp_path):
+    """Crée une base SQLite (aiosqlite) isolée pour les tests asynchrones."""
+    engine = create_async_db_engine(f"sqlite:///{tmp_path / 'async.db'}")
+
+    async def create_schema():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+@pytest.fixture
+def make_app():
+    """
+    Fabrique d'applications minimales pour tester un middleware.
+
+    `make_app(Middleware, session_factory, **options)` installe le middleware
+    (ou une liste de middlewares, du plus interne au plus externe ; les options
+    vont au premier) et les routes communes :
+    - `/items/{item_id}` : deux requêtes SQL sur une session de `session_factory` (asynchrone)
+    - `/health` : réponse immédiate
+    - `/boom` : exception non gérée
+    Les tests ajoutent leurs propres routes à l'application renvoyée.
+    """
+    def factory(middleware, session_factory=None, **options) -> FastAPI:
+        app = FastAPI()
+        first, *others = middleware if isinstance(middleware, (list, tuple)) else [middleware]
+        app.add_middleware(first, **options)
+        for other in others:
+            app.add_middleware(other)
+
+        async def get_session():
+            async with session_factory() as session:
+                yield session
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: int, db=Depends(get_session)):
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+            return {"id": item_id}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "ok"}
+
+        @app.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+
+        return app
+
+    return factory
+
 @pytest.fixture(scope="function")
 def client(db: Session):
     """Crée un client de test pour l'API."""
@@ -0,0 +1,205 @@
+"""
+Serveurs locaux remplaçant les fournisseurs externes dans les tests et les benchmarks.
+"""
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Set
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+# aiosmtpd journalise un avertissement de dépréciation à chaque authentification
+logging.getLogger("mail.log").setLevel(logging.ERROR)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class _SMTPHandler:
+    def __init__(self, server: "LocalSMTPServer"):
+        self.server = server
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.latency:
+            await asyncio.sleep(self.server.latency)
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        drop_after = self.server.drop_after
+        if drop_after and getattr(session, "delivered", 0) >= drop_after:
+            # Le serveur coupe la connexion sans prévenir
+            server.transport.close()
+            return "421 Closing connection"
+        if address in self.server.rejected:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.server.latency:
+            await asyncio.sleep(self.server.latency)
+        session.delivered = getattr(session, "delivered", 0) + 1
+        with self.server.lock:
+            self.server.messages.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+class LocalSMTPServer:
+    """
+    Serveur SMTP local (aiosmtpd) comptant connexions, authentifications et messages.
+
+    Args:
+        latency: Délai simulé (secondes) sur EHLO et DATA, comme un aller-retour réseau
+        drop_after: Coupe la connexion après ce nombre de messages (0 : jamais)
+        rejected: Adresses refusées au RCPT
+        reject_logins: Refuse toute authentification (535)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        drop_after: int = 0,
+        rejected: Optional[Set[str]] = None,
+        reject_logins: bool = False
+    ):
+        self.latency = latency
+        self.drop_after = drop_after
+        self.rejected = rejected or set()
+        self.reject_logins = reject_logins
+        self.connections = 0
+        self.logins = 0
+        self.messages: List[str] = []
+        self.lock = threading.Lock()
+        self.host = "127.0.0.1"
+        self.port = free_port()
+        self._controller = Controller(
+            _SMTPHandler(self),
+            hostname=self.host,
+            port=self.port,
+            authenticator=self._authenticate,
+            auth_require_tls=False
+        )
+
+    def _authenticate(self, server, session, envelope, mechanism, auth_data):
+        with self.lock:
+            self.logins += 1
+        return AuthResult(success=not self.reject_logins, handled=False)
+
+    def start(self) -> "LocalSMTPServer":
+        self._controller.start()
+        return self
+
+    def stop(self) -> None:
+        self._controller.stop()
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+class _SMSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.fake.lock:
+            self.server.fake.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if fake.latency:
+            time.sleep(fake.latency)
+        with fake.lock:
+            fake.requests.append(self.path)
+            fake.idempotency_keys.append(self.headers.get("Idempotency-Key"))
+            failing = fake.fail_next > 0
+            if failing:
+                fake.fail_next -= 1
+        if failing:
+            return self._reply(fake.fail_status, headers=fake.fail_headers)
+        if self.path == "/sms/send":
+            messages = [body]
+        elif self.path == "/sms/send-batch" and fake.batch:
+            messages = body["messages"]
+        else:
+            return self._reply(404)
+        with fake.lock:
+            fake.messages.extend(message["to"] for message in messages)
+        self._reply(200, {"accepted": len(messages)})
+
+class LocalSMSServer:
+    """
+    Fournisseur SMS local comptant connexions TCP, requêtes et messages.
+
+    Args:
+        latency: Délai simulé (secondes) par requête
+        batch: Expose l'endpoint groupé `/sms/send-batch`
+        fail_next: Nombre de requêtes à faire échouer avant de répondre normalement
+        fail_status: Statut HTTP renvoyé pour ces échecs
+        fail_headers: En-têtes renvoyés pour ces échecs (ex. Retry-After)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        batch: bool = True,
+        fail_next: int = 0,
+        fail_status: int = 503,
+        fail_headers: Optional[Dict[str, str]] = None
+    ):
+        self.latency = latency
+        self.batch = batch
+        self.fail_next = fail_next
+        self.fail_status = fail_status
+        self.fail_headers = fail_headers or {}
+        self.connections = 0
+        self.requests: List[str] = []
+        self.messages: List[str] = []
+        self.idempotency_keys: List[Optional[str]] = []
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _SMSRequestHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalSMSServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalSMSServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
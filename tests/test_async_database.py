@@ -0,0 +1,61 @@
+import asyncio
+
+from app.core.database import to_async_url
+from app.models.property import PropertyType
+from app.models.user import User, UserRole
+from app.schemas.property import PropertyCreate
+from app.services.property import PropertyService
+
+def test_to_async_url():
+    """Les URLs synchrones sont converties vers les pilotes asynchrones."""
+    assert to_async_url("postgresql://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert to_async_url("postgresql+psycopg2://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert to_async_url("sqlite+aiosqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+def test_property_service_async_variants(async_session_factory):
+    """Les variantes asynchrones appliquent les mêmes règles que les méthodes synchrones."""
+
+    async def scenario():
+        async with async_session_factory() as db:
+            owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+            db.add(owner)
+            await db.commit()
+
+            created = await PropertyService.create_property_async(
+                db,
+                property_data=PropertyCreate(
+                    title="Async Property",
+                    type=PropertyType.APARTMENT,
+                    address="1 rue du Test",
+                    city="Paris",
+                    postal_code="75000",
+                    country="France",
+                    surface_area=42.0,
+                    price=900.0,
+                    owner_id=owner.id,
+                ),
+            )
+            listed = await PropertyService.get_properties_async(
+                db, user_role=UserRole.OWNER, user_id=owner.id
+            )
+            fetched = await PropertyService.get_property_async(
+                db, property_id=created.id, user_role=UserRole.OWNER, user_id=owner.id
+            )
+            return created, listed, fetched
+
+    created, listed, fetched = asyncio.run(scenario())
+    assert [p.id for p in listed] == [created.id]
+    assert fetched.title == "Async Property"
+
+def test_concurrent_async_sessions(async_session_factory):
+    """Plusieurs sessions asynchrones peuvent s'exécuter en parallèle sur la même boucle."""
+
+    async def scenario():
+        async def list_properties():
+            async with async_session_factory() as db:
+                return await PropertyService.get_properties_async(db)
+
+        return await asyncio.gather(*(list_properties() for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [[]] * 5
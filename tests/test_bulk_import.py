@@ -0,0 +1,159 @@
+import io
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_async_db
+from app.core.query_budget import track_queries
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.payment import Payment
+from app.models.property import Property, PropertyStatus, PropertyType
+from app.models.user import User, UserRole
+from app.schemas.user import Principal
+from app.services.auth import AuthService
+from app.services.bulk_import import BulkImportService
+
+PROPERTY_HEADER = "title,type,address,city,postal_code,country,surface_area,price,owner_id,number_of_rooms\n"
+
+def property_csv(rows) -> io.BytesIO:
+    return io.BytesIO((PROPERTY_HEADER + "".join(rows)).encode())
+
+def ndjson(rows) -> io.BytesIO:
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+@pytest.fixture
+def owner(isolated_db):
+    owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+    isolated_db.add(owner)
+    isolated_db.commit()
+    return owner
+
+def add_property(db, owner, status=PropertyStatus.AVAILABLE) -> Property:
+    property = Property(
+        title="Bien", type=PropertyType.APARTMENT, address="1 rue du Test", city="Paris",
+        postal_code="75000", country="France", surface_area=30.0, price=800.0,
+        status=status, owner=owner
+    )
+    db.add(property)
+    db.commit()
+    return property
+
+def test_csv_rows_are_validated_and_reported(isolated_db, owner):
+    source = property_csv([
+        f"T2,apartment,1 rue A,Paris,75001,France,40,900,{owner.id},\n",
+        f"Maison,castle,2 rue B,Lyon,69001,France,90,1500,{owner.id},4\n",
+        "Studio,apartment,3 rue C,Lille,59000,France,18,500,999,1\n",
+        f"T3,apartment,4 rue D,Nantes,44000,France,abc,1100,{owner.id},3,extra\n",
+    ])
+
+    report = BulkImportService.import_properties(isolated_db, source, "csv")
+
+    assert (report.total, report.imported, report.failed) == (4, 1, 3)
+    assert [error.row for error in report.errors] == [2, 4, 3]
+    assert report.errors[0].errors[0].startswith("type:")
+    assert report.errors[1].errors == ["unexpected extra columns"]
+    assert report.errors[2].errors == ["owner_id: Owner not found"]
+    property = isolated_db.query(Property).one()
+    assert (property.title, property.number_of_rooms, property.status) == ("T2", None, PropertyStatus.AVAILABLE)
+
+def test_rows_are_inserted_in_chunks(isolated_db, owner):
+    """Chaque lot coûte une vérification des propriétaires et une insertion, quelle que soit sa taille."""
+    source = property_csv(
+        f"Bien {i},apartment,{i} rue A,Paris,75001,France,30,800,{owner.id},1\n" for i in range(25)
+    )
+    with track_queries() as reports:
+        report = BulkImportService.import_properties(isolated_db, source, "csv", chunk_size=10)
+
+    assert (report.imported, report.failed) == (25, 0)
+    assert reports[0].executions("INSERT") == 3
+    assert reports[0].executions("SELECT") == 3
+
+def test_contracts_rent_each_property_once(isolated_db, owner):
+    available = add_property(isolated_db, owner)
+    rented = add_property(isolated_db, owner, status=PropertyStatus.RENTED)
+    tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+    isolated_db.add(tenant)
+    isolated_db.commit()
+    contract = {
+        "type": "rental", "start_date": "2025-01-01", "rent_amount": 800,
+        "payment_day": 5, "tenant_id": tenant.id,
+    }
+    source = ndjson([
+        {**contract, "property_id": available.id},
+        {**contract, "property_id": available.id},
+        {**contract, "property_id": rented.id},
+    ])
+
+    report = BulkImportService.import_contracts(isolated_db, source, "ndjson")
+
+    assert (report.imported, report.failed) == (1, 2)
+    assert {error.errors[0] for error in report.errors} == {"property_id: Property is not available"}
+    isolated_db.expire_all()
+    assert isolated_db.get(Property, available.id).status == PropertyStatus.RENTED
+    assert isolated_db.query(Contract).one().status == ContractStatus.PENDING
+
+def test_payments_require_an_active_contract(isolated_db, owner):
+    tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+    property = add_property(isolated_db, owner, status=PropertyStatus.RENTED)
+    contracts = [
+        Contract(
+            type=ContractType.RENTAL, status=status, start_date=date(2025, 1, 1),
+            rent_amount=800.0, property=property, tenant=tenant
+        )
+        for status in (ContractStatus.ACTIVE, ContractStatus.TERMINATED)
+    ]
+    isolated_db.add_all(contracts)
+    isolated_db.commit()
+    payment = {"amount": 800, "type": "rent", "due_date": "2025-02-05"}
+    source = io.BytesIO(
+        (json.dumps({**payment, "contract_id": contracts[0].id}) + "\n\n"
+         + json.dumps({**payment, "contract_id": contracts[1].id}) + "\n"
+         + "{not json\n").encode()
+    )
+
+    report = BulkImportService.import_payments(isolated_db, source, "ndjson")
+
+    assert (report.total, report.imported, report.failed) == (3, 1, 2)
+    assert report.errors[0].errors[0].startswith("invalid JSON")
+    assert report.errors[1].errors == ["contract_id: Contract is not active"]
+    assert isolated_db.query(Payment).one().contract_id == contracts[0].id
+
+@pytest.fixture
+def import_client(async_session_factory):
+    from app.main import app
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=1, email="admin@example.com", role=UserRole.ADMIN, is_active=True
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_import_endpoint_checks_content_type_and_role(import_client):
+    from app.main import app
+
+    response = import_client.post(
+        "/api/v1/properties/import", content=PROPERTY_HEADER + "T2,apartment,1 rue A,Paris,75001,France,40,900,1,2\n",
+        headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 1, "imported": 0, "failed": 1,
+        "errors": [{"row": 1, "errors": ["owner_id: Owner not found"]}],
+    }
+    assert import_client.post(
+        "/api/v1/properties/import", json=[], headers={"Content-Type": "application/json"}
+    ).status_code == 415
+
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=2, email="tenant@example.com", role=UserRole.TENANT, is_active=True
+    )
+    assert import_client.post(
+        "/api/v1/payments/import", content="", headers={"Content-Type": "application/x-ndjson"}
+    ).status_code == 403
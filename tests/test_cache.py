@@ -0,0 +1,89 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.core.cache import TTLCache, principal_cache
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.schemas.user import UserUpdate
+from app.services.auth import AuthService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+def test_ttl_expiration():
+    """Une entrée expirée est considérée comme absente."""
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, timer=clock)
+    cache.set(1, "a")
+    assert cache.get(1) == "a"
+    clock.now = 5
+    assert cache.get(1) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_lru_eviction():
+    """L'entrée la moins récemment utilisée est évincée en premier."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats()["evictions"] == 1
+
+def test_current_user_served_from_cache(async_session_factory):
+    """Le second appel ne recharge pas l'utilisateur et une mise à jour invalide l'entrée."""
+
+    async def scenario():
+        async with async_session_factory() as db:
+            owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+            tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+            db.add_all([owner, tenant])
+            await db.flush()
+            property = Property(
+                title="Cached", type=PropertyType.APARTMENT, address="1 rue du Test",
+                city="Paris", postal_code="75000", country="France",
+                surface_area=30.0, price=800.0, owner_id=owner.id
+            )
+            db.add(property)
+            await db.flush()
+            contract = Contract(
+                type=ContractType.RENTAL, status=ContractStatus.ACTIVE,
+                start_date=date(2024, 1, 1), property_id=property.id, tenant_id=tenant.id
+            )
+            db.add(contract)
+            await db.commit()
+
+            token = AuthService.create_access_token({"sub": str(tenant.id)})
+            first = await AuthService.get_current_user_async(token=token, db=db)
+            second = await AuthService.get_current_user_async(token=token, db=db)
+            await AuthService.update_user_async(
+                db, user_id=tenant.id, user_data=UserUpdate(full_name="Renamed")
+            )
+            third = await AuthService.get_current_user_async(token=token, db=db)
+            return first, second, third, contract, property
+
+    first, second, third, contract, property = asyncio.run(scenario())
+    assert second is first
+    assert first.tenant_contract_ids == [contract.id]
+    assert first.tenant_property_ids == [property.id]
+    assert third.full_name == "Renamed"
+    stats = principal_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 1
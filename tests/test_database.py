@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core import database
+from app.core.database import InstrumentedQueuePool, create_db_engine, get_pool_status
+from app.db import session as legacy_session
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    """Crée un moteur SQLite avec le pool instrumenté (1 connexion + 1 débordement)."""
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+def test_single_engine_shared():
+    """Les deux modules de session partagent le même moteur."""
+    assert legacy_session.engine is database.engine
+    assert legacy_session.SessionLocal is database.SessionLocal
+    assert legacy_session.get_db is database.get_db
+
+def test_pool_counters(pooled_engine):
+    """Les emprunts, restitutions et débordements sont comptés."""
+    first = pooled_engine.connect()
+    second = pooled_engine.connect()
+    second.execute(text("SELECT 1"))
+    second.close()
+    first.close()
+
+    status = get_pool_status(pooled_engine)
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert status["checkouts"] == 2
+    assert status["checkins"] == 2
+    assert status["wait_count"] == 0
+    assert status["overflow_checkouts"] == 1
+    assert status["checked_out"] == 0
+
+def test_pool_reuse_is_not_counted_as_overflow(pooled_engine):
+    """Une connexion reprise dans la file n'est ni un débordement ni une attente."""
+    first = pooled_engine.connect()
+    second = pooled_engine.connect()
+    first.close()
+    # Le débordement est toujours ouvert, mais la connexion vient de la file
+    third = pooled_engine.connect()
+    third.close()
+    second.close()
+
+    status = get_pool_status(pooled_engine)
+    assert status["checkouts"] == 3
+    assert status["overflow_checkouts"] == 1
+    assert status["wait_count"] == 0
+
+def test_slow_connect_is_not_counted_as_wait(pooled_engine):
+    """L'ouverture d'une connexion, même lente, n'est pas une attente sur le pool."""
+    event.listen(pooled_engine, "connect", lambda *args: time.sleep(0.02))
+    first = pooled_engine.connect()
+    second = pooled_engine.connect()
+    second.close()
+    first.close()
+
+    status = get_pool_status(pooled_engine)
+    assert status["connects"] == 2
+    assert status["wait_count"] == 0
+    assert status["wait_time_total"] == 0.0
+
+def test_pool_wait_counted(tmp_path):
+    """Seuls les emprunts bloqués par un pool épuisé comptent comme des attentes."""
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'wait.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    held = engine.connect()
+    timer = threading.Timer(0.05, held.close)
+    timer.start()
+    try:
+        engine.connect().close()
+    finally:
+        timer.join()
+        engine.dispose()
+
+    status = get_pool_status(engine)
+    assert status["wait_count"] == 1
+    assert status["wait_time_max"] >= 0.04
+
+def test_pool_timeout_counted(pooled_engine):
+    """Un pool épuisé incrémente le compteur de timeouts."""
+    connections = [pooled_engine.connect(), pooled_engine.connect()]
+    with pytest.raises(PoolTimeoutError):
+        pooled_engine.connect()
+    for connection in connections:
+        connection.close()
+
+    assert get_pool_status(pooled_engine)["timeouts"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import get_async_db
+from app.core.export import ExportFormat, export_statement, stream_export
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.schemas.user import Principal
+from app.services.auth import AuthService
+from app.services.payment import PaymentService
+
+def seed(session_factory) -> None:
+    """Deux locataires, un contrat chacun, trois loyers par contrat."""
+    def populate(db):
+        owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+        for i in (1, 2):
+            tenant = User(email=f"tenant{i}@example.com", hashed_password="x", role=UserRole.TENANT)
+            property = Property(
+                title=f"Bien {i}", type=PropertyType.APARTMENT, address="1, rue du \"Test\"",
+                city="Paris", postal_code="75000", country="France",
+                surface_area=30.0, price=800.0, owner=owner
+            )
+            contract = Contract(
+                type=ContractType.RENTAL, status=ContractStatus.ACTIVE, start_date=date(2025, 1, 1),
+                rent_amount=800.0, property=property, tenant=tenant
+            )
+            for month in (1, 2, 3):
+                db.add(Payment(
+                    amount=800.0, type=PaymentType.RENT, status=PaymentStatus.PAID,
+                    due_date=date(2025, month, 5), contract=contract
+                ))
+        db.commit()
+
+    async def scenario():
+        async with session_factory() as db:
+            await db.run_sync(populate)
+
+    asyncio.run(scenario())
+
+@pytest.fixture
+def export_client(async_session_factory):
+    from app.main import app
+
+    seed(async_session_factory)
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=1, email="owner@example.com", role=UserRole.ADMIN, is_active=True
+    )
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_payments_are_streamed_in_batches(async_session_factory):
+    seed(async_session_factory)
+
+    async def scenario():
+        async with async_session_factory() as db:
+            query = PaymentService.payments_query(db.sync_session, status=PaymentStatus.PAID)
+            statement = export_statement(query, ["id", "due_date", "status"])
+            return [chunk async for chunk in stream_export(db, statement, ExportFormat.NDJSON, batch_size=4)]
+
+    chunks = asyncio.run(scenario())
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [4, 2]
+    assert json.loads(chunks[0].splitlines()[0]) == {"id": 1, "due_date": "2025-01-05", "status": "paid"}
+
+def test_csv_export_has_a_header_and_quotes_values(export_client):
+    response = export_client.get("/api/v1/properties/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="properties.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in rows] == ["Bien 1", "Bien 2"]
+    assert rows[0]["address"] == "1, rue du \"Test\""
+    assert rows[0]["type"] == "apartment"
+    assert rows[0]["number_of_rooms"] == ""
+
+def test_tenants_only_export_their_own_rows(export_client):
+    from app.main import app
+
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=2, email="tenant1@example.com", role=UserRole.TENANT, is_active=True,
+        tenant_contract_ids=[1], tenant_property_ids=[1]
+    )
+
+    payments = export_client.get("/api/v1/payments/export", params={"format": "ndjson", "contract_id": 2})
+    contracts = export_client.get("/api/v1/contracts/export", params={"format": "ndjson"})
+    properties = export_client.get("/api/v1/properties/export", params={"format": "ndjson"})
+    own = export_client.get("/api/v1/payments/export", params={"format": "ndjson"})
+
+    assert payments.text == ""
+    assert [json.loads(line)["tenant_id"] for line in contracts.text.splitlines()] == [2]
+    assert [json.loads(line)["id"] for line in properties.text.splitlines()] == [1]
+    assert {json.loads(line)["contract_id"] for line in own.text.splitlines()} == {1}
+    assert export_client.get("/api/v1/payments/export", params={"format": "xml"}).status_code == 422
@@ -0,0 +1,131 @@
+from contextlib import contextmanager
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.models.contract import ContractStatus
+from app.models.maintenance import MaintenanceStatus
+from app.models.payment import PaymentStatus
+from app.models.property import PropertyStatus, PropertyType
+from app.models.user import UserRole
+from app.services.contract import ContractService
+from app.services.maintenance import MaintenanceService
+from app.services.payment import PaymentService
+from app.services.property import PropertyService
+
+@contextmanager
+def capture_statements(db) -> List[Tuple[str, tuple]]:
+    """Enregistre les requêtes SELECT émises sur la session."""
+    statements = []
+    engine = db.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def query_plan(db, statement: str, parameters) -> str:
+    connection = db.connection()
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+@pytest.mark.parametrize("index_name, call", [
+    (
+        "ix_contracts_tenant_id_status",
+        lambda db: ContractService.get_contracts(db=db, tenant_id=1, status=ContractStatus.ACTIVE),
+    ),
+    (
+        "ix_contracts_property_id_status",
+        lambda db: ContractService.get_contracts(db=db, property_id=1, status=ContractStatus.ACTIVE),
+    ),
+    (
+        "ix_payments_contract_id",
+        lambda db: PaymentService.get_payments(db=db, contract_id=1),
+    ),
+    (
+        "ix_payments_status_due_date",
+        lambda db: PaymentService.get_payments_page(db=db, status=PaymentStatus.PAID, sort="due_date"),
+    ),
+    (
+        "ix_payments_status_due_date",
+        lambda db: PaymentService.check_overdue_payments(db=db),
+    ),
+    (
+        "ix_maintenance_requests_property_id",
+        lambda db: MaintenanceService.get_maintenance_requests(db=db, property_id=1),
+    ),
+    (
+        "ix_maintenance_requests_status_priority",
+        lambda db: MaintenanceService.get_maintenance_requests(
+            db=db, status=MaintenanceStatus.PENDING, priority=5
+        ),
+    ),
+    (
+        "ix_maintenance_requests_status_type",
+        lambda db: MaintenanceService.get_maintenance_requests(
+            db=db, status=MaintenanceStatus.PENDING, type="EMERGENCY"
+        ),
+    ),
+    (
+        "ix_properties_owner_id_status_type",
+        lambda db: PropertyService.get_properties(
+            db=db, user_role=UserRole.OWNER, user_id=1,
+            status=PropertyStatus.AVAILABLE, type=PropertyType.APARTMENT
+        ),
+    ),
+])
+def test_service_queries_use_indexes(isolated_db, index_name, call):
+    """Chaque requête filtrée des services est servie par l'index prévu."""
+    with capture_statements(isolated_db) as statements:
+        call(isolated_db)
+
+    assert statements
+    plans = [query_plan(isolated_db, statement, parameters) for statement, parameters in statements]
+    assert any(index_name in plan for plan in plans), plans
+
+def test_pending_payments_partial_index(isolated_db):
+    """Le prédicat de l'index partiel couvre la requête des paiements en retard."""
+    from datetime import date
+
+    from app.models.payment import Payment
+
+    # INDEXED BY échoue si SQLite ne peut pas prouver que l'index partiel s'applique
+    query = isolated_db.query(Payment).filter(
+        Payment.status == PaymentStatus.PENDING,
+        Payment.due_date < date(2024, 1, 1)
+    )
+    statement = str(query.statement.compile(
+        dialect=isolated_db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )).replace("FROM payments", "FROM payments INDEXED BY ix_payments_pending_due_date")
+    assert "ix_payments_pending_due_date" in query_plan(isolated_db, statement, ())
+
+def test_migrations_match_models(tmp_path):
+    """Les migrations Alembic produisent les mêmes index que les modèles."""
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, inspect
+
+    from app.core.database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = Config("alembic.ini")
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        migrated = {index["name"] for index in inspector.get_indexes(table.name)}
+        modeled = {index.name for index in table.indexes}
+        assert modeled <= migrated, (table.name, modeled - migrated)
+        assert {column.name for column in table.columns} == {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+    engine.dispose()
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.metrics import Counter, MetricsRegistry
+from app.core.middleware import MetricsMiddleware, RequestLoggingMiddleware
+from app.core.scheduler import job_run
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+def test_histogram_exposition_is_cumulative():
+    """Les intervalles d'un histogramme sont cumulés et suivis de la somme et du total."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latence", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 5.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("errors_total", "Erreurs", ("reason",)))
+    counter.inc(reason='bad "quote"\n')
+
+    assert 'errors_total{reason="bad \\"quote\\"\\n"} 1' in registry.render()
+
+def test_requests_are_measured_per_route(async_session_factory, make_app):
+    """Latence, statut et requêtes SQL sont agrégés par modèle de route, pas par chemin."""
+    client = TestClient(make_app([MetricsMiddleware, RequestLoggingMiddleware], async_session_factory))
+    client.get("/items/1")
+    client.get("/items/2")
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    assert metrics.http_requests_total.value(status="200", **labels) == 2
+    assert metrics.http_request_duration_seconds.count(**labels) == 2
+    assert metrics.http_request_db_queries.sum(route="/items/{item_id}") == 4
+    assert metrics.http_request_db_duration_seconds.count(route="/items/{item_id}") == 2
+    assert metrics.db_queries_total.value() >= 4
+    assert metrics.http_requests_in_progress.value(method="GET") == 0
+
+def test_unhandled_error_is_counted_as_500(make_app):
+    client = TestClient(make_app([MetricsMiddleware, RequestLoggingMiddleware]))
+    client.get("/boom")
+
+    assert metrics.http_requests_total.value(method="GET", route="/boom", status="500") == 1
+    assert metrics.http_requests_in_progress.value(method="GET") == 0
+
+def test_metrics_endpoint_exposes_pool_and_request_metrics():
+    """L'endpoint renvoie le format texte Prometheus, état des pools compris."""
+    from app.main import app
+
+    client = TestClient(app)
+    client.get("/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/",status="200"} 1' in body
+    assert "# TYPE db_pool_checked_out gauge" in body
+    assert 'db_pool_checkouts{engine="async"}' in body
+
+def test_job_runs_are_timed(isolated_db):
+    """Chaque exécution de tâche alimente la durée, les lignes et les échecs par tâche."""
+    with job_run("reminders", isolated_db) as run:
+        run.rows = 3
+    with pytest.raises(RuntimeError):
+        with job_run("reminders", isolated_db):
+            raise RuntimeError("boom")
+
+    assert metrics.scheduler_job_duration_seconds.count(job="reminders") == 2
+    assert metrics.scheduler_job_rows_total.value(job="reminders") == 3
+    assert metrics.scheduler_job_failures_total.value(job="reminders") == 1
@@ -0,0 +1,215 @@
+import smtplib
+import time
+
+import pytest
+
+from app.core.exceptions import NotificationException
+from app.core.notifications import NotificationManager
+from app.core.sms import SMSClient, SMSDeliveryError, SMSDeliveryUncertain
+from app.core.smtp import SMTPConnectionPool
+from tests.fakes import LocalSMSServer, LocalSMTPServer
+
+@pytest.fixture
+def smtp_server():
+    with LocalSMTPServer() as server:
+        yield server
+
+def make_manager(server: LocalSMTPServer, **pool_options) -> NotificationManager:
+    """Gestionnaire dont le pool SMTP pointe vers le serveur local."""
+    manager = NotificationManager()
+    options = dict(
+        host=server.host, port=server.port, username="user", password="secret",
+        tls=False, size=2, timeout=5
+    )
+    options.update(pool_options)
+    manager.smtp_pool = SMTPConnectionPool(**options)
+    return manager
+
+def recipients(count: int):
+    return [{"email": f"tenant{i}@example.com"} for i in range(count)]
+
+def test_send_email_reuses_connection(smtp_server):
+    """Les envois successifs réutilisent la même connexion authentifiée."""
+    manager = make_manager(smtp_server)
+    for i in range(5):
+        manager.send_email(f"tenant{i}@example.com", "Rappel", "Bonjour")
+    manager.close()
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.logins == 1
+
+def test_bulk_notification_is_batched(smtp_server):
+    """Un envoi groupé n'ouvre pas plus de connexions que la taille du pool."""
+    manager = make_manager(smtp_server, size=2)
+    report = manager.send_bulk_notification("Bonjour", recipients(120), subject="Info", max_workers=4)
+    manager.close()
+
+    assert report == {"emails_sent": 120, "emails_failed": 0, "sms_sent": 0, "sms_failed": 0}
+    assert sorted(smtp_server.messages) == sorted(r["email"] for r in recipients(120))
+    assert smtp_server.connections <= 2
+
+def test_connection_renewed_after_max_messages(smtp_server):
+    """La connexion est renouvelée après `max_messages` envois."""
+    manager = make_manager(smtp_server, size=1, max_messages=10)
+    report = manager.send_bulk_notification("Bonjour", recipients(25), subject="Info")
+
+    assert report["emails_sent"] == 25
+    assert smtp_server.connections == 3
+
+def test_reconnects_when_server_drops_connection():
+    """Une connexion coupée par le serveur est rouverte et l'envoi reprend."""
+    with LocalSMTPServer(drop_after=7) as server:
+        manager = make_manager(server, size=1)
+        report = manager.send_bulk_notification("Bonjour", recipients(20), subject="Info")
+        # La troisième connexion a servi 6 messages : le 8e envoi est coupé puis rejoué
+        manager.send_email("late1@example.com", "Rappel", "Bonjour")
+        manager.send_email("late2@example.com", "Rappel", "Bonjour")
+
+    assert report["emails_sent"] == 20
+    assert len(server.messages) == 22
+    assert server.connections == 4
+
+def test_rejected_recipient_does_not_stop_batch():
+    """Un destinataire refusé est signalé sans interrompre le lot ni la connexion."""
+    with LocalSMTPServer(rejected={"tenant3@example.com"}) as server:
+        manager = make_manager(server, size=1)
+        report = manager.send_bulk_notification("Bonjour", recipients(6), subject="Info")
+
+    assert report["emails_sent"] == 5
+    assert report["emails_failed"] == 1
+    assert "tenant3@example.com" not in server.messages
+    assert server.connections == 1
+
+def test_unreachable_server_fails_fast():
+    """Sans serveur joignable, les messages restants sont abandonnés sans boucler."""
+    manager = NotificationManager()
+    manager.smtp_pool = SMTPConnectionPool(host="127.0.0.1", port=1, tls=False, size=1, timeout=1)
+    report = manager.send_bulk_notification("Bonjour", recipients(10), subject="Info")
+
+    assert report["emails_failed"] == 10
+
+@pytest.mark.parametrize("server_options, pool_options", [
+    ({}, {"tls": True}),  # STARTTLS non pris en charge par le serveur
+    ({"reject_logins": True}, {}),  # 535 : identifiants refusés
+])
+def test_connection_setup_errors_are_returned_as_failures(server_options, pool_options):
+    """Un refus à l'ouverture de la connexion est renvoyé pour chaque message, sans être levé."""
+    with LocalSMTPServer(**server_options) as server:
+        manager = make_manager(server, **pool_options)
+        messages = [manager.create_email_message(f"tenant{i}@example.com", "Info", "Bonjour") for i in range(3)]
+        failures = manager.smtp_pool.send_many(messages)
+
+    assert [message for message, _ in failures] == messages
+    assert all(isinstance(error, smtplib.SMTPException) for _, error in failures)
+    assert server.messages == []
+
+def make_sms_manager(server: LocalSMSServer, delays=None, **client_options) -> NotificationManager:
+    """Gestionnaire dont le client SMS pointe vers le fournisseur local."""
+    manager = NotificationManager()
+    options = dict(base_url=server.url, api_key="key", pool_size=4, backoff=0.01, sleep=(delays if delays is not None else []).append)
+    options.update(client_options)
+    manager.sms_client = SMSClient(**options)
+    return manager
+
+def phones(count: int):
+    return [{"phone": f"+3360000{i:04d}"} for i in range(count)]
+
+def test_send_sms_reuses_http_connection():
+    """Les SMS successifs partagent une connexion HTTP keep-alive."""
+    with LocalSMSServer() as server:
+        manager = make_sms_manager(server)
+        for i in range(10):
+            manager.send_sms(f"+336000000{i:02d}", "Rappel")
+        manager.close()
+
+    assert len(server.messages) == 10
+    assert server.connections == 1
+
+def test_send_sms_retries_with_jittered_backoff():
+    """Les réponses 503 sont rejouées avec un délai aléatoire croissant borné."""
+    delays = []
+    with LocalSMSServer(fail_next=2) as server:
+        manager = make_sms_manager(server, delays, backoff=1.0, backoff_max=1.5)
+        manager.send_sms("+33600000000", "Rappel")
+
+    assert server.messages == ["+33600000000"]
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 1.0
+    assert 0 <= delays[1] <= 1.5
+
+def test_send_sms_honours_retry_after():
+    """Un 429 avec Retry-After attend le délai demandé par le fournisseur."""
+    delays = []
+    with LocalSMSServer(fail_next=1, fail_status=429, fail_headers={"Retry-After": "2"}) as server:
+        manager = make_sms_manager(server, delays)
+        manager.send_sms("+33600000000", "Rappel")
+
+    assert delays == [2.0]
+
+def test_send_sms_gives_up_after_max_retries():
+    """Après épuisement des tentatives, l'échec est remonté."""
+    with LocalSMSServer(fail_next=10) as server:
+        manager = make_sms_manager(server, max_retries=2)
+        with pytest.raises(NotificationException):
+            manager.send_sms("+33600000000", "Rappel")
+
+    assert len(server.requests) == 3
+
+def test_send_sms_times_out_on_slow_provider():
+    """Un fournisseur trop lent n'immobilise pas l'appelant au-delà du délai de lecture."""
+    with LocalSMSServer(latency=0.5) as server:
+        manager = make_sms_manager(server, read_timeout=0.1, max_retries=0)
+        start = time.perf_counter()
+        with pytest.raises(NotificationException):
+            manager.send_sms("+33600000000", "Rappel")
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+
+def test_send_sms_read_timeout_is_not_replayed():
+    """Un délai de lecture dépassé n'est pas rejoué : le fournisseur a pu accepter le SMS."""
+    with LocalSMSServer(latency=0.3) as server:
+        client = make_sms_manager(server, read_timeout=0.1, max_retries=2).sms_client
+        with pytest.raises(SMSDeliveryUncertain):
+            client.send({"to": "+33600000000", "idempotency_key": "rappel-1:sms"})
+        time.sleep(0.4)
+
+    assert server.requests == ["/sms/send"]
+
+def test_send_sms_read_timeout_replayed_with_idempotency_key():
+    """Avec une clé d'idempotence honorée par le fournisseur, la même clé accompagne chaque tentative."""
+    with LocalSMSServer(latency=0.3) as server:
+        client = make_sms_manager(
+            server, read_timeout=0.1, max_retries=2, idempotency_header="Idempotency-Key"
+        ).sms_client
+        with pytest.raises(SMSDeliveryError) as error:
+            client.send({"to": "+33600000000", "idempotency_key": "rappel-1:sms"})
+        time.sleep(0.5)
+
+    # Le fournisseur déduplique : l'outbox pourra retenter plus tard
+    assert not isinstance(error.value, SMSDeliveryUncertain)
+
+    assert server.idempotency_keys == ["rappel-1:sms"] * 3
+
+def test_bulk_sms_uses_batch_endpoint():
+    """Avec un endpoint groupé, les SMS partent par lots."""
+    with LocalSMSServer() as server:
+        manager = make_sms_manager(server, batch_path="/sms/send-batch", batch_size=100)
+        report = manager.send_bulk_notification("Rappel", phones(250))
+
+    assert report["sms_sent"] == 250
+    assert server.requests == ["/sms/send-batch"] * 3
+    assert len(server.messages) == 250
+
+def test_bulk_sms_falls_back_without_batch_endpoint():
+    """Si l'endpoint groupé n'existe pas, les SMS sont envoyés un par un en parallèle bornée."""
+    with LocalSMSServer(batch=False, latency=0.01) as server:
+        manager = make_sms_manager(server, batch_path="/sms/send-batch", batch_size=10, pool_size=4)
+        report = manager.send_bulk_notification("Rappel", phones(40))
+        manager.send_bulk_notification("Rappel", phones(5))
+
+    assert report["sms_sent"] == 40
+    assert sorted(server.messages) == sorted([p["phone"] for p in phones(40)] + [p["phone"] for p in phones(5)])
+    assert server.connections <= 4
+    assert manager.sms_client.batch_path is None
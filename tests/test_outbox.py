@@ -0,0 +1,182 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.notifications import NotificationManager
+from app.core.outbox import NotificationDispatcher, enqueue_notifications, notification_rows
+from app.core.sms import SMSClient
+from app.core.smtp import SMTPConnectionPool
+from app.models.notification import NotificationChannel, OutboxNotification, OutboxStatus
+from tests.fakes import LocalSMSServer, LocalSMTPServer
+
+@pytest.fixture
+def smtp_server():
+    with LocalSMTPServer(rejected={"bounce@example.com"}) as server:
+        yield server
+
+@pytest.fixture
+def sms_server():
+    with LocalSMSServer() as server:
+        yield server
+
+@pytest.fixture
+def dispatcher(smtp_server, sms_server):
+    manager = NotificationManager()
+    manager.smtp_pool = SMTPConnectionPool(host=smtp_server.host, port=smtp_server.port, tls=False, size=2)
+    manager.sms_client = SMSClient(base_url=sms_server.url, max_retries=0)
+    yield NotificationDispatcher(
+        manager=manager, batch_size=10, email_concurrency=2, sms_concurrency=2,
+        max_attempts=2, retry_backoff=0, retry_backoff_max=0
+    )
+    manager.close()
+
+def factory(db) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+
+def test_enqueue_is_idempotent(isolated_db):
+    """Une notification déjà en file n'est pas insérée une seconde fois."""
+    rows = notification_rows("reminder:1", "Bonjour", "a@example.com", "+33600000000", "Rappel")
+    enqueue_notifications(isolated_db, rows)
+    enqueue_notifications(isolated_db, rows)
+    isolated_db.commit()
+
+    stored = isolated_db.query(OutboxNotification).order_by(OutboxNotification.id).all()
+    assert [(n.channel, n.idempotency_key) for n in stored] == [
+        (NotificationChannel.EMAIL, "reminder:1:email"),
+        (NotificationChannel.SMS, "reminder:1:sms"),
+    ]
+
+def test_dispatcher_drains_in_batches(isolated_db, dispatcher, smtp_server, sms_server):
+    """Le dispatcher vide l'outbox par lots, emails et SMS confondus."""
+    rows = []
+    for i in range(15):
+        rows += notification_rows(f"reminder:{i}", "Bonjour", f"t{i}@example.com", f"+3360000{i:04d}", "Rappel")
+    enqueue_notifications(isolated_db, rows)
+    isolated_db.commit()
+
+    totals = dispatcher.drain(factory(isolated_db))
+
+    assert totals == {"processed": 30, "sent": 30, "retried": 0, "dead": 0}
+    assert len(smtp_server.messages) == 15
+    assert len(sms_server.messages) == 15
+    assert isolated_db.query(OutboxNotification).filter(
+        OutboxNotification.status != OutboxStatus.SENT
+    ).count() == 0
+    assert dispatcher.drain(factory(isolated_db))["processed"] == 0
+
+def test_failed_notification_is_retried_then_dead_lettered(isolated_db, dispatcher, smtp_server):
+    """Un échec n'empêche pas les autres envois ; il est rejoué puis mis en lettre morte."""
+    rows = notification_rows("bounce", "Bonjour", "bounce@example.com", subject="Rappel")
+    rows += notification_rows("ok", "Bonjour", "ok@example.com", subject="Rappel")
+    enqueue_notifications(isolated_db, rows)
+    isolated_db.commit()
+
+    first = dispatcher.dispatch_batch(factory(isolated_db)())
+    assert first == {"processed": 2, "sent": 1, "retried": 1, "dead": 0}
+
+    second = dispatcher.dispatch_batch(factory(isolated_db)())
+    assert second == {"processed": 1, "sent": 0, "retried": 0, "dead": 1}
+
+    isolated_db.expire_all()
+    dead = isolated_db.query(OutboxNotification).filter_by(status=OutboxStatus.DEAD).one()
+    assert dead.recipient == "bounce@example.com"
+    assert dead.attempts == 2
+    assert "Mailbox unavailable" in dead.last_error
+    assert smtp_server.messages == ["ok@example.com"]
+
+def test_retry_waits_for_backoff(isolated_db, dispatcher):
+    """Une notification reprogrammée n'est pas relivrée avant son échéance."""
+    rows = notification_rows("later", "Bonjour", "later@example.com", subject="Rappel")
+    rows[0]["next_attempt_at"] = datetime.utcnow() + timedelta(minutes=5)
+    enqueue_notifications(isolated_db, rows)
+    isolated_db.commit()
+
+    assert dispatcher.dispatch_batch(factory(isolated_db)())["processed"] == 0
+
+def test_possibly_sent_sms_is_not_retried(isolated_db):
+    """Un SMS dont la réponse n'est pas arrivée à temps est mis en lettre morte, pas renvoyé."""
+    enqueue_notifications(isolated_db, notification_rows("slow", "Bonjour", to_number="+33600000000"))
+    isolated_db.commit()
+
+    with LocalSMSServer(latency=0.3) as server:
+        manager = NotificationManager()
+        manager.sms_client = SMSClient(base_url=server.url, read_timeout=0.1, max_retries=2)
+        dispatcher = NotificationDispatcher(manager=manager, max_attempts=5, retry_backoff=0, retry_backoff_max=0)
+        report = dispatcher.dispatch_batch(factory(isolated_db)())
+        manager.close()
+        time.sleep(0.3)
+
+    assert report == {"processed": 1, "sent": 0, "retried": 0, "dead": 1}
+    assert server.requests == ["/sms/send"]
+
+def test_batch_is_claimed_before_delivery(isolated_db, dispatcher):
+    """La réservation est validée avant l'envoi : aucune transaction n'est ouverte pendant la livraison."""
+    enqueue_notifications(isolated_db, notification_rows("claim", "Bonjour", to_number="+33600000000"))
+    isolated_db.commit()
+    db = factory(isolated_db)()
+    seen = []
+    send_many = dispatcher.manager.sms_client.send_many
+
+    def observe(payloads, **options):
+        seen.append(db.in_transaction())
+        with factory(isolated_db)() as other:
+            seen.append(other.query(OutboxNotification.status).scalar())
+        return send_many(payloads, **options)
+
+    dispatcher.manager.sms_client.send_many = observe
+    assert dispatcher.dispatch_batch(db)["sent"] == 1
+    assert seen == [False, OutboxStatus.SENDING]
+
+def test_expired_lease_is_reclaimed(isolated_db, dispatcher, sms_server):
+    """Un lot réservé par un dispatcher arrêté est repris à l'expiration du bail, pas avant."""
+    rows = notification_rows("crashed", "Bonjour", to_number="+33600000000")
+    rows += notification_rows("in-flight", "Bonjour", to_number="+33600000001")
+    enqueue_notifications(isolated_db, rows)
+    isolated_db.commit()
+    for notification, expires in zip(
+        isolated_db.query(OutboxNotification).order_by(OutboxNotification.id),
+        (datetime.utcnow() - timedelta(seconds=1), datetime.utcnow() + timedelta(minutes=5))
+    ):
+        notification.status = OutboxStatus.SENDING
+        notification.attempts = 1
+        notification.next_attempt_at = expires
+    isolated_db.commit()
+
+    assert dispatcher.dispatch_batch(factory(isolated_db)()) == {"processed": 1, "sent": 1, "retried": 0, "dead": 0}
+    assert sms_server.messages == ["+33600000000"]
+
+def test_channel_exception_does_not_lose_other_channel(isolated_db, dispatcher, smtp_server, sms_server):
+    """Une exception d'un canal n'empêche pas d'enregistrer les SMS livrés, qui ne sont pas renvoyés."""
+    enqueue_notifications(isolated_db, notification_rows("both", "Bonjour", "a@example.com", "+33600000000", "Rappel"))
+    isolated_db.commit()
+
+    def broken(messages):
+        raise RuntimeError("pool SMTP indisponible")
+
+    dispatcher.manager.smtp_pool.send_many = broken
+    first = dispatcher.dispatch_batch(factory(isolated_db)())
+    second = dispatcher.dispatch_batch(factory(isolated_db)())
+
+    assert first == {"processed": 2, "sent": 1, "retried": 1, "dead": 0}
+    assert second == {"processed": 1, "sent": 0, "retried": 0, "dead": 1}
+    statuses = dict(isolated_db.query(OutboxNotification.channel, OutboxNotification.status))
+    assert statuses == {NotificationChannel.EMAIL: OutboxStatus.DEAD, NotificationChannel.SMS: OutboxStatus.SENT}
+    assert sms_server.messages == ["+33600000000"]
+    assert smtp_server.messages == []
+
+def test_exhausted_lease_is_dead_lettered(isolated_db, dispatcher, sms_server):
+    """Une ligne dont chaque livraison arrête le dispatcher finit en lettre morte, sans nouvel envoi."""
+    enqueue_notifications(isolated_db, notification_rows("poison", "Bonjour", to_number="+33600000000"))
+    isolated_db.commit()
+    notification = isolated_db.query(OutboxNotification).one()
+    notification.status = OutboxStatus.SENDING
+    notification.attempts = dispatcher.max_attempts
+    notification.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    isolated_db.commit()
+
+    assert dispatcher.dispatch_batch(factory(isolated_db)()) == {"processed": 1, "sent": 0, "retried": 0, "dead": 1}
+    isolated_db.expire_all()
+    assert isolated_db.query(OutboxNotification.status, OutboxNotification.attempts).one() == (OutboxStatus.DEAD, 2)
+    assert sms_server.requests == []
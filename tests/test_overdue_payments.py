@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.core.query_budget import track_queries
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.services.payment import PaymentService
+
+TODAY = date(2025, 6, 15)
+
+@pytest.fixture
+def contract(isolated_db):
+    owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+    tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+    property = Property(
+        title="Bien", type=PropertyType.APARTMENT, address="1 rue du Test",
+        city="Paris", postal_code="75000", country="France",
+        surface_area=30.0, price=800.0, owner=owner
+    )
+    contract = Contract(
+        type=ContractType.RENTAL, status=ContractStatus.ACTIVE, start_date=date(2025, 1, 1),
+        rent_amount=800.0, payment_day=1, property=property, tenant=tenant
+    )
+    isolated_db.add(contract)
+    isolated_db.commit()
+    return contract
+
+def add_payment(db, contract, days_late: int, status=PaymentStatus.PENDING, type=PaymentType.RENT) -> Payment:
+    payment = Payment(
+        contract_id=contract.id, amount=800.0, type=type, status=status,
+        due_date=TODAY - timedelta(days=days_late)
+    )
+    db.add(payment)
+    db.commit()
+    return payment
+
+def test_overdue_payments_are_marked_and_penalized(isolated_db, contract):
+    """Seuls les retards au-delà du délai de grâce donnent lieu à une pénalité."""
+    late = add_payment(isolated_db, contract, settings.PAYMENT_GRACE_PERIOD_DAYS + 1)
+    recent = add_payment(isolated_db, contract, 1)
+    upcoming = add_payment(isolated_db, contract, -3)
+    paid = add_payment(isolated_db, contract, 30, status=PaymentStatus.PAID)
+
+    report = PaymentService.process_overdue_payments(isolated_db, as_of=TODAY)
+
+    assert report == {"marked_overdue": 2, "late_fees": 1}
+    isolated_db.expire_all()
+    assert late.status == recent.status == PaymentStatus.OVERDUE
+    assert upcoming.status == PaymentStatus.PENDING
+    assert paid.status == PaymentStatus.PAID
+    [fee] = isolated_db.query(Payment).filter(Payment.type == PaymentType.LATE_FEE).all()
+    assert fee.late_fee_for_id == late.id
+    assert fee.contract_id == contract.id
+    assert fee.amount == pytest.approx(800.0 * settings.PAYMENT_LATE_FEE_PERCENTAGE / 100)
+    assert fee.status == PaymentStatus.PENDING
+    assert fee.due_date == TODAY
+
+def test_processing_is_safe_to_rerun(isolated_db, contract):
+    add_payment(isolated_db, contract, 10)
+    PaymentService.process_overdue_payments(isolated_db, as_of=TODAY)
+
+    report = PaymentService.process_overdue_payments(isolated_db, as_of=TODAY + timedelta(days=30))
+
+    # La pénalité, échue à son tour, passe en retard mais n'est pas pénalisée
+    assert report == {"marked_overdue": 1, "late_fees": 0}
+    assert isolated_db.query(Payment).filter(Payment.type == PaymentType.LATE_FEE).count() == 1
+
+def test_statements_are_batched(isolated_db, contract):
+    """Le nombre d'instructions dépend du nombre de lots, pas du nombre de paiements."""
+    isolated_db.add_all(
+        Payment(contract_id=contract.id, amount=800.0, type=PaymentType.RENT,
+                status=PaymentStatus.PENDING, due_date=TODAY - timedelta(days=10 + i))
+        for i in range(25)
+    )
+    isolated_db.commit()
+    with track_queries() as reports:
+        report = PaymentService.process_overdue_payments(isolated_db, as_of=TODAY, batch_size=10)
+
+    assert report == {"marked_overdue": 25, "late_fees": 25}
+    assert reports[0].executions("UPDATE") == 3
+    assert reports[0].executions("INSERT") == 3
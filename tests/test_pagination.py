@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.services.property import PropertyService
+
+@pytest.fixture
+def properties(isolated_db: Session):
+    """Crée sept propriétés dont plusieurs partagent le même prix."""
+    owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+    isolated_db.add(owner)
+    isolated_db.flush()
+    rows = [
+        Property(
+            title=f"Property {i}", type=PropertyType.APARTMENT, address=f"{i} rue du Test",
+            city="Paris", postal_code="75000", country="France",
+            surface_area=40.0, price=float(1000 + (i % 3) * 100), owner_id=owner.id
+        )
+        for i in range(7)
+    ]
+    isolated_db.add_all(rows)
+    isolated_db.commit()
+    return rows
+
+def collect(db: Session, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = PropertyService.get_properties_page(db=db, limit=3, cursor=cursor, **kwargs)
+        ids.extend(p.id for p in page.items)
+        cursor = page.next_cursor
+        if not cursor:
+            return ids
+
+def test_cursor_roundtrip():
+    """Un curseur encodé se décode à l'identique."""
+    cursor = encode_cursor("price", 1200.0, 42)
+    assert decode_cursor(cursor) == {"s": "price", "v": 1200.0, "id": 42}
+
+def test_keyset_pages_cover_all_rows(isolated_db: Session, properties):
+    """Les pages successives couvrent toutes les lignes, sans doublon, dans l'ordre."""
+    assert collect(isolated_db) == sorted(p.id for p in properties)
+
+def test_keyset_by_sort_key_breaks_ties_on_id(isolated_db: Session, properties):
+    """Le tri par prix départage les égalités par identifiant."""
+    expected = [p.id for p in sorted(properties, key=lambda p: (p.price, p.id))]
+    assert collect(isolated_db, sort="price") == expected
+
+def test_total_only_when_requested(isolated_db: Session, properties):
+    """Le total n'est calculé que sur demande."""
+    assert PropertyService.get_properties_page(db=isolated_db, limit=2).total is None
+    page = PropertyService.get_properties_page(db=isolated_db, limit=2, include_total=True)
+    assert page.total == 7
+    assert len(page.items) == 2
+
+def test_offset_mode_still_supported(isolated_db: Session, properties):
+    """Le mode offset reste disponible pour la compatibilité."""
+    items = PropertyService.get_properties(db=isolated_db, skip=5, limit=10)
+    assert [p.id for p in items] == sorted(p.id for p in properties)[5:]
+
+def test_invalid_cursor_rejected(isolated_db: Session, properties):
+    """Un curseur corrompu ou émis pour un autre tri est refusé."""
+    with pytest.raises(HTTPException) as exc_info:
+        PropertyService.get_properties_page(db=isolated_db, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        PropertyService.get_properties_page(
+            db=isolated_db, sort="price", cursor=encode_cursor("id", 1, 1)
+        )
@@ -0,0 +1,126 @@
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import (
+    ProfileStore, ProfilingMiddleware, SamplingProfiler, collapse_stack, profile_store
+)
+from app.models.user import UserRole
+from app.schemas.user import Principal
+from app.services.auth import AuthService
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def spin(seconds: float) -> None:
+    busy(seconds)
+
+@pytest.fixture
+def profiled_app(make_app):
+    """
+    Application de test profilée : `/busy` occupe le processeur 100 ms dans la
+    boucle d'événements, `/spin` 300 ms dans le pool de threads.
+    """
+    def factory(store: ProfileStore, **options) -> FastAPI:
+        app = make_app(ProfilingMiddleware, profiler=SamplingProfiler(interval=0.001), store=store, **options)
+
+        @app.get("/busy/{item_id}")
+        async def busy_endpoint(item_id: int):
+            busy(0.1)
+            return {"id": item_id}
+
+        @app.get("/spin")
+        def spin_endpoint():
+            spin(0.3)
+            return {}
+
+        return app
+
+    return factory
+
+def test_collapse_stack_is_root_first():
+    stack = collapse_stack(sys._getframe())
+    frames = stack.split(";")
+    assert frames[-1] == f"{__name__}.test_collapse_stack_is_root_first"
+    assert " " not in stack
+
+def test_header_with_token_forces_profiling(tmp_path, profiled_app):
+    """Un administrateur muni du jeton obtient le profil de sa requête, agrégé par route."""
+    store = ProfileStore(tmp_path)
+    client = TestClient(profiled_app(store, sample_rate=0.0, token="secret"))
+
+    client.get("/busy/1", headers={"X-Profile": "secret"})
+    client.get("/busy/2", headers={"X-Profile": "wrong"})
+
+    [path] = tmp_path.glob("*.folded")
+    assert path.name.startswith("GET_busy_item_id.")
+    profile = store.load("GET /busy/{item_id}")
+    assert sum(count for stack, count in profile.items() if stack.endswith(f"{__name__}.busy")) > 10
+    assert all(stack.startswith("GET_/busy/{item_id};") for stack in profile)
+    [summary] = store.summary()
+    assert summary["route"] == "GET /busy/{item_id}"
+
+def test_concurrent_requests_are_not_charged_to_the_profiled_route(tmp_path, profiled_app):
+    """Une requête non profilée servie en même temps n'apparaît pas dans le profil."""
+    store = ProfileStore(tmp_path)
+    with TestClient(profiled_app(store, sample_rate=0.0, token="secret")) as client:
+        other = threading.Thread(target=client.get, args=("/spin",))
+        other.start()
+        time.sleep(0.05)
+        client.get("/busy/1", headers={"X-Profile": "secret"})
+        other.join()
+
+    profile = store.load("GET /busy/{item_id}")
+    assert any(stack.endswith(f"busy_endpoint;{__name__}.busy") for stack in profile)
+    assert not [stack for stack in profile if f"{__name__}.spin" in stack]
+
+def test_requests_are_not_profiled_by_default(tmp_path, profiled_app):
+    client = TestClient(profiled_app(ProfileStore(tmp_path), sample_rate=0.0, token=""))
+    client.get("/busy/1", headers={"X-Profile": ""})
+
+    assert list(tmp_path.glob("*")) == []
+
+def test_profiles_of_all_workers_are_merged(tmp_path):
+    store = ProfileStore(tmp_path)
+    store.add("GET /items", {"app.main.handler": 3})
+    (tmp_path / "GET_items.1.folded").write_text("GET_/items;app.main.handler 2\n")
+
+    assert store.load("GET /items") == {"GET_/items;app.main.handler": 5}
+    assert store.load("GET /other") == {}
+
+@pytest.fixture
+def admin_client(tmp_path, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(profile_store, "directory", tmp_path)
+    principal = Principal(id=1, email="admin@example.com", role=UserRole.ADMIN, is_active=True)
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: principal
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_admin_can_download_profiles(admin_client, tmp_path):
+    (tmp_path / "GET_items.1.folded").write_text("GET_/items;app.main.handler 2\n")
+
+    listing = admin_client.get("/api/v1/admin/profiles")
+    download = admin_client.get("/api/v1/admin/profiles/download", params={"route": "GET /items"})
+
+    assert listing.json() == [{"route": "GET /items", "samples": 2}]
+    assert download.text == "GET_/items;app.main.handler 2\n"
+    assert "GET_items.folded" in download.headers["content-disposition"]
+    assert admin_client.get(
+        "/api/v1/admin/profiles/download", params={"route": "GET /missing"}
+    ).status_code == 404
+
+def test_profiles_are_reserved_to_admins(admin_client):
+    from app.main import app
+
+    tenant = Principal(id=2, email="tenant@example.com", role=UserRole.TENANT, is_active=True)
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: tenant
+
+    assert admin_client.get("/api/v1/admin/profiles").status_code == 403
@@ -0,0 +1,203 @@
+import asyncio
+import importlib
+from datetime import date, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.database import Base, create_db_engine, get_async_db
+from app.core.query_budget import (
+    QueryBudget, QueryBudgetExceeded, QueryBudgetMiddleware, statement_shape, track_queries
+)
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.maintenance import MaintenanceRequest, MaintenanceType
+from app.models.payment import Payment, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.services.auth import AuthService
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Base SQLite isolée dont le moteur impute ses requêtes à la requête en cours."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'budget.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+        property = Property(
+            title="Bien", type=PropertyType.APARTMENT, address="1 rue du Test",
+            city="Paris", postal_code="75000", country="France",
+            surface_area=30.0, price=800.0, owner=owner
+        )
+        for i in range(6):
+            db.add(Contract(
+                type=ContractType.RENTAL, status=ContractStatus.ACTIVE,
+                start_date=date.today(), end_date=date.today() + timedelta(days=365),
+                property=property,
+                tenant=User(email=f"tenant{i}@example.com", hashed_password="x", role=UserRole.TENANT)
+            ))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+@pytest.fixture
+def budget_app(make_app, session_factory):
+    """Application de test dont les routes chargent les locataires des contrats."""
+    def factory(**options) -> FastAPI:
+        app = make_app(QueryBudgetMiddleware, **options)
+
+        def get_session():
+            with session_factory() as db:
+                yield db
+
+        @app.get("/contracts/lazy")
+        def lazy_contracts(db=Depends(get_session)):
+            return [contract.tenant.email for contract in db.query(Contract).all()]
+
+        @app.get("/contracts/joined")
+        def joined_contracts(db=Depends(get_session)):
+            contracts = db.query(Contract).options(joinedload(Contract.tenant)).all()
+            return [contract.tenant.email for contract in contracts]
+
+        return app
+
+    return factory
+
+def test_statement_shape_ignores_values():
+    """Deux requêtes ne différant que par leurs valeurs ont la même forme."""
+    assert statement_shape("SELECT * FROM users WHERE id = 4 AND email = 'a@b.c'") == \
+        statement_shape("SELECT *\n FROM users WHERE id = 12 AND email = 'x'")
+    assert statement_shape("SELECT * FROM users WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT * FROM users WHERE id IN (%(id_1)s)")
+
+def test_lazy_loads_in_a_loop_are_flagged(budget_app):
+    """Un chargement paresseux par ligne fait échouer la requête en mode strict."""
+    client = TestClient(budget_app(budget=QueryBudget({}, None, 5), strict=True))
+
+    with pytest.raises(QueryBudgetExceeded) as error:
+        client.get("/contracts/lazy")
+
+    assert error.value.report.route == "/contracts/lazy"
+    assert error.value.report.count == 7
+    [(shape, count)] = error.value.report.repeated(5)
+    assert count == 6
+    assert "FROM users" in shape
+
+def test_eager_loading_stays_within_budget(budget_app):
+    client = TestClient(budget_app(
+        budget=QueryBudget({"/contracts/joined": 1}, 0, 5), strict=True
+    ))
+
+    assert len(client.get("/contracts/joined").json()) == 6
+
+def test_route_budget_is_enforced(budget_app):
+    """Le budget propre à la route prévaut sur le budget par défaut."""
+    client = TestClient(budget_app(
+        budget=QueryBudget({"/contracts/lazy": 3}, 100, 0), strict=True
+    ))
+
+    with pytest.raises(QueryBudgetExceeded, match="7 requêtes SQL pour un budget de 3"):
+        client.get("/contracts/lazy")
+
+def test_violations_are_only_logged_outside_strict_mode(budget_app, caplog):
+    client = TestClient(budget_app(budget=QueryBudget({}, 1, 5), strict=False))
+
+    assert client.get("/contracts/lazy").status_code == 200
+    [record] = [r for r in caplog.records if r.message == "query budget exceeded"]
+    assert record.route == "/contracts/lazy"
+    assert record.db_queries == 7
+
+def test_track_queries_outside_requests(session_factory):
+    with session_factory() as db, track_queries() as reports:
+        db.query(Contract).options(joinedload(Contract.tenant)).all()
+
+    assert reports[0].count == 1
+    assert QueryBudget({}, 1, 5).violations(reports[0]) == []
+
+@pytest.fixture
+def strict_api(monkeypatch, async_session_factory):
+    """
+    Application `app.main` construite avec `QUERY_BUDGET_ENABLED` et
+    `QUERY_BUDGET_STRICT`, sur une base peuplée de trois biens loués.
+
+    Renvoie le client et un jeton d'accès par rôle.
+    """
+    def populate(db) -> None:
+        admin = User(email="admin@example.com", hashed_password="x", role=UserRole.ADMIN)
+        owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+        tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+        for i in range(3):
+            property = Property(
+                title=f"Bien {i}", type=PropertyType.HOUSE, address="1 rue du Test", city="Paris",
+                postal_code="75000", country="France", surface_area=42.5, price=800.0, owner=owner
+            )
+            contract = Contract(
+                type=ContractType.RENTAL, status=ContractStatus.ACTIVE, start_date=date(2025, 1, 1),
+                rent_amount=800.0, property=property, tenant=tenant
+            )
+            db.add_all([
+                Payment(amount=800.0, type=PaymentType.RENT, due_date=date(2025, 2, 5), contract=contract),
+                MaintenanceRequest(
+                    title="Fuite", description="Fuite", type=MaintenanceType.REPAIR,
+                    request_date=date(2025, 2, 1), property=property, requested_by=tenant,
+                    assigned_to=admin
+                ),
+            ])
+        db.commit()
+        return {user.role: user.id for user in (admin, owner, tenant)}
+
+    async def seed():
+        async with async_session_factory() as db:
+            return await db.run_sync(populate)
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    users = asyncio.run(seed())
+    monkeypatch.setattr(settings, "QUERY_BUDGET_ENABLED", True)
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", True)
+    main = importlib.reload(importlib.import_module("app.main"))
+    main.app.dependency_overrides[get_async_db] = override_db
+    tokens = {role: AuthService.create_access_token({"sub": str(user_id)}) for role, user_id in users.items()}
+    yield TestClient(main.app), tokens
+    monkeypatch.undo()
+    importlib.reload(main)
+
+@pytest.mark.parametrize("role", [UserRole.ADMIN, UserRole.OWNER, UserRole.TENANT])
+def test_v1_read_routes_stay_within_budget(strict_api, role):
+    """Listes et détails v1 respectent les budgets livrés, pire cas compris."""
+    client, tokens = strict_api
+    reads = [
+        "/api/v1/properties/?include_total=true",
+        "/api/v1/properties/1",
+        "/api/v1/contracts/?include_total=true&include=property,tenant,payments",
+        "/api/v1/contracts/1?include=property,tenant,payments",
+        "/api/v1/payments/?include_total=true&include=contract",
+        "/api/v1/payments/1?include=contract",
+        "/api/v1/maintenance/?include_total=true&include=property,requested_by,assigned_to",
+        "/api/v1/maintenance/1?include=property,requested_by,assigned_to",
+    ]
+    for url in reads:
+        # Principal absent du cache : son chargement compte dans le budget
+        principal_cache.clear()
+        response = client.get(url, headers={"Authorization": f"Bearer {tokens[role]}"})
+        assert response.status_code == 200, url
+
+def test_v1_updates_stay_within_budget(strict_api):
+    """Les budgets d'un modèle de route couvrent aussi ses écritures."""
+    client, tokens = strict_api
+    updates = [
+        ("/api/v1/properties/1", {"title": "Bien rénové"}),
+        ("/api/v1/contracts/1", {"rent_amount": 850.0}),
+        ("/api/v1/payments/1", {"amount": 850.0}),
+        ("/api/v1/maintenance/1", {"title": "Fuite réparée"}),
+    ]
+    for url, body in updates:
+        principal_cache.clear()
+        response = client.put(url, json=body, headers={"Authorization": f"Bearer {tokens[UserRole.ADMIN]}"})
+        assert response.status_code == 200, url
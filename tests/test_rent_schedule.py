@@ -0,0 +1,77 @@
+from datetime import date
+
+from app.core.query_budget import track_queries
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.services.payment import PaymentService, month_index, rent_due_date
+
+def seed_contracts(db, count: int, **fields) -> None:
+    owner = User(email=f"owner{count}@example.com", hashed_password="x", role=UserRole.OWNER)
+    property = Property(
+        title="Bien", type=PropertyType.APARTMENT, address="1 rue du Test",
+        city="Paris", postal_code="75000", country="France",
+        surface_area=30.0, price=800.0, owner=owner
+    )
+    for i in range(count):
+        tenant = User(email=f"tenant{count}-{i}@example.com", hashed_password="x", role=UserRole.TENANT)
+        values = {
+            "type": ContractType.RENTAL, "status": ContractStatus.ACTIVE,
+            "start_date": date(2024, 1, 1), "end_date": None,
+            "rent_amount": 800.0, "payment_day": 31,
+        }
+        values.update(fields)
+        db.add(Contract(property=property, tenant=tenant, **values))
+    db.commit()
+
+def rent_due_dates(db):
+    return sorted(due_date for (due_date,) in db.query(Payment.due_date).filter(Payment.type == PaymentType.RENT))
+
+def test_payment_day_is_clamped_to_month_length():
+    assert rent_due_date(month_index(date(2025, 2, 1)), 31) == date(2025, 2, 28)
+    assert rent_due_date(month_index(date(2024, 2, 1)), 30) == date(2024, 2, 29)
+    assert rent_due_date(month_index(date(2024, 12, 1)) + 1, 5) == date(2025, 1, 5)
+
+def test_schedules_cross_year_boundary(isolated_db):
+    """Décembre est suivi de janvier, le jour de paiement ramené à la fin des mois courts."""
+    seed_contracts(isolated_db, 1)
+
+    report = PaymentService.generate_rent_schedules(isolated_db, months_ahead=3, as_of=date(2024, 12, 15))
+
+    assert report == {"contracts": 1, "created": 3}
+    assert rent_due_dates(isolated_db) == [date(2024, 12, 31), date(2025, 1, 31), date(2025, 2, 28)]
+    payment = isolated_db.query(Payment).first()
+    assert payment.status == PaymentStatus.PENDING
+    assert payment.amount == 800.0
+
+def test_generation_is_idempotent(isolated_db):
+    """Une seconde exécution ne crée que les mois qui manquent."""
+    seed_contracts(isolated_db, 4)
+    PaymentService.generate_rent_schedules(isolated_db, months_ahead=2, as_of=date(2025, 3, 1))
+
+    report = PaymentService.generate_rent_schedules(isolated_db, months_ahead=3, as_of=date(2025, 3, 1))
+
+    assert report == {"contracts": 4, "created": 4}
+    assert isolated_db.query(Payment).count() == 12
+
+def test_contract_bounds_and_status_are_respected(isolated_db):
+    seed_contracts(isolated_db, 1, start_date=date(2025, 3, 10), end_date=date(2025, 5, 20), payment_day=15)
+    seed_contracts(isolated_db, 2, status=ContractStatus.TERMINATED)
+    seed_contracts(isolated_db, 3, payment_day=None)
+
+    PaymentService.generate_rent_schedules(isolated_db, months_ahead=6, as_of=date(2025, 2, 1))
+
+    assert rent_due_dates(isolated_db) == [date(2025, 3, 15), date(2025, 4, 15), date(2025, 5, 15)]
+
+def test_query_count_depends_on_batches_not_contracts(isolated_db):
+    """Chaque lot coûte une lecture des contrats, une des loyers existants et une insertion."""
+    seed_contracts(isolated_db, 25)
+    with track_queries() as reports:
+        report = PaymentService.generate_rent_schedules(
+            isolated_db, months_ahead=12, as_of=date(2025, 1, 1), batch_size=10
+        )
+
+    assert report == {"contracts": 25, "created": 300}
+    assert reports[0].executions("INSERT") == 3
+    assert reports[0].executions("SELECT") == 7
@@ -0,0 +1,99 @@
+import json
+import logging
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.logging import JsonFormatter, queue_handler
+from app.core.middleware import RequestLoggingMiddleware
+
+def request_records(caplog):
+    return [record for record in caplog.records if record.name == "property_management.api"]
+
+@pytest.fixture(autouse=True)
+def capture_api_logs(caplog):
+    caplog.set_level(logging.INFO, logger="property_management.api")
+
+def test_request_record_is_structured(caplog, async_session_factory, make_app):
+    """L'enregistrement porte l'identifiant, le modèle de route, le statut, la latence et le temps SQL."""
+    client = TestClient(make_app(RequestLoggingMiddleware, async_session_factory))
+    response = client.get("/items/42")
+
+    [record] = request_records(caplog)
+    assert response.headers["X-Request-ID"] == record.request_id
+    assert record.route == "/items/{item_id}"
+    assert record.path == "/items/42"
+    assert record.status == 200
+    assert record.latency_ms > 0
+    assert record.db_queries == 2
+    assert record.db_time_ms >= 0
+
+def test_incoming_request_id_is_kept(caplog, make_app):
+    """Un identifiant fourni par l'appelant est conservé de bout en bout."""
+    client = TestClient(make_app(RequestLoggingMiddleware))
+    response = client.get("/health", headers={"X-Request-ID": "abc-123"})
+
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert request_records(caplog)[0].request_id == "abc-123"
+
+def test_unhandled_error_is_logged_with_traceback(caplog, make_app):
+    """Une exception non gérée produit une réponse 500 et un enregistrement d'erreur."""
+    client = TestClient(make_app(RequestLoggingMiddleware))
+    response = client.get("/boom")
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Internal server error"
+    [record] = request_records(caplog)
+    assert record.levelno == logging.ERROR
+    assert record.status == 500
+    assert record.route == "/boom"
+    assert isinstance(record.exc_info[1], RuntimeError)
+
+def test_sampling_skips_successful_requests_only(caplog, make_app):
+    """Une route échantillonnée à 0 n'est plus journalisée, sauf en cas d'erreur."""
+    client = TestClient(make_app(RequestLoggingMiddleware, sampling_rates={"/health": 0.0, "/boom": 0.0}))
+    for _ in range(5):
+        client.get("/health")
+    client.get("/boom")
+
+    assert [record.route for record in request_records(caplog)] == ["/boom"]
+
+def test_unmatched_routes_share_a_template(caplog, make_app):
+    """Les URL inconnues ne créent pas une valeur de route par chemin."""
+    client = TestClient(make_app(RequestLoggingMiddleware))
+    client.get("/nope/1")
+
+    assert request_records(caplog)[0].route == "<unmatched>"
+    assert request_records(caplog)[0].status == 404
+
+def test_json_formatter_includes_extra_fields():
+    """Le formateur JSON inclut les champs `extra` et la traceback."""
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info(),
+            extra={"request_id": "r1", "status": 500}
+        )
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "failed x"
+    assert payload["request_id"] == "r1"
+    assert payload["status"] == 500
+    assert "ValueError: bad" in payload["exception"]
+
+def test_queue_handler_defers_formatting():
+    """Le dépôt dans la file ne formate ni le message JSON ni la traceback."""
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info()
+        )
+    prepared = queue_handler.prepare(record)
+
+    assert prepared.msg == "failed x"
+    assert prepared.args is None
+    assert prepared.exc_info is not None
+    assert prepared.exc_text is None
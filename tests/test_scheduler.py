@@ -0,0 +1,156 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.outbox import notification_rows
+from app.core.scheduler import task_scheduler
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.maintenance import MaintenanceRequest, MaintenanceStatus, MaintenanceType
+from app.models.notification import OutboxNotification
+from app.models.payment import Payment, PaymentStatus, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+
+def seed(db, start: int, count: int) -> None:
+    """Crée `count` locataires ayant chacun un contrat, un paiement et une demande."""
+    today = date.today()
+    owner = User(email=f"owner{start}@example.com", hashed_password="x", role=UserRole.OWNER)
+    db.add(owner)
+    for i in range(start, start + count):
+        tenant = User(email=f"tenant{i}@example.com", hashed_password="x", role=UserRole.TENANT)
+        property = Property(
+            title=f"Bien {i}", type=PropertyType.APARTMENT, address=f"{i} rue du Test",
+            city="Paris", postal_code="75000", country="France",
+            surface_area=30.0, price=800.0, owner=owner
+        )
+        contract = Contract(
+            type=ContractType.RENTAL, status=ContractStatus.ACTIVE,
+            start_date=today - timedelta(days=300), end_date=today + timedelta(days=10),
+            property=property, tenant=tenant
+        )
+        db.add_all([
+            tenant, property, contract,
+            Payment(
+                amount=800.0, type=PaymentType.RENT, status=PaymentStatus.PENDING,
+                due_date=today + timedelta(days=3), contract=contract
+            ),
+            MaintenanceRequest(
+                title="Fuite", description="Fuite d'eau", type=MaintenanceType.REPAIR,
+                status=MaintenanceStatus.PENDING, request_date=today, priority=3,
+                created_at=datetime.now() - timedelta(days=2), property=property,
+                requested_by=tenant
+            ),
+        ])
+    db.commit()
+    db.expunge_all()
+
+def count_selects(db, job) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        job(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+@pytest.mark.parametrize("job, notifications_per_row", [
+    (task_scheduler.schedule_payment_reminders, 1),
+    (task_scheduler.check_contract_renewals, 2),
+    (task_scheduler.check_maintenance_requests, 1),
+])
+def test_jobs_issue_constant_number_of_queries(isolated_db, job, notifications_per_row):
+    """Le nombre de requêtes d'une tâche ne dépend pas du nombre de lignes traitées."""
+    seed(isolated_db, 0, 3)
+    few = count_selects(isolated_db, job)
+    assert isolated_db.query(OutboxNotification).count() == 3 * notifications_per_row
+
+    seed(isolated_db, 3, 30)
+    many = count_selects(isolated_db, job)
+    assert many == few == 1
+
+    # Les notifications déjà en file pour la période ne sont pas dupliquées
+    assert isolated_db.query(OutboxNotification).count() == 33 * notifications_per_row
+
+@pytest.fixture
+def scheduler(isolated_db):
+    """Planificateur dont les sessions sont ouvertes sur la base isolée."""
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.scheduler import TaskScheduler
+
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=isolated_db.get_bind())
+    instance = TaskScheduler(session_factory=factory)
+    yield instance
+    instance.shutdown()
+
+def test_each_run_gets_its_own_session(scheduler, isolated_db):
+    """Chaque exécution reçoit une session neuve, validée puis fermée."""
+    sessions = []
+
+    def job(db):
+        sessions.append(db)
+        db.add(User(email=f"job{len(sessions)}@example.com", hashed_password="x", role=UserRole.AGENT))
+
+    scheduler.run_job(job)
+    scheduler.run_job(job)
+
+    assert sessions[0] is not sessions[1]
+    assert all(not session.in_transaction() for session in sessions)
+    assert isolated_db.query(User).count() == 2
+
+def test_failed_run_is_rolled_back(scheduler, isolated_db):
+    """Une exécution en erreur n'écrit rien et rend sa connexion."""
+
+    def job(db):
+        db.add(User(email="rollback@example.com", hashed_password="x", role=UserRole.AGENT))
+        db.flush()
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        scheduler.run_job(job)
+    assert isolated_db.query(User).count() == 0
+
+def test_jobs_are_not_run_concurrently(scheduler):
+    """Les tâches ne se chevauchent pas et se partagent un nombre borné de threads."""
+    from app.core.config import settings
+
+    scheduler.schedule_all_tasks()
+    jobs = scheduler.scheduler.get_jobs()
+
+    assert {job.id for job in jobs} == {
+        "payment_reminders", "contract_renewals", "maintenance_requests", "overdue_payments",
+        "rent_schedules", "notification_dispatch"
+    }
+    assert all(job.max_instances == settings.SCHEDULER_JOB_MAX_INSTANCES for job in jobs)
+    assert all(job.coalesce for job in jobs)
+    assert scheduler.scheduler._lookup_executor("default")._pool._max_workers == settings.SCHEDULER_MAX_WORKERS
+
+def test_job_failing_halfway_enqueues_nothing(scheduler, isolated_db, monkeypatch):
+    """Une tâche en erreur après avoir mis des notifications en file est annulée et comptée en échec."""
+    from app.core import metrics, scheduler as scheduler_module
+
+    seed(isolated_db, 0, 3)
+    monkeypatch.setattr(scheduler_module.settings, "SCHEDULER_BATCH_SIZE", 1)
+    calls = []
+
+    def failing_rows(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError("boom")
+        return notification_rows(*args)
+
+    monkeypatch.setattr(scheduler_module, "notification_rows", failing_rows)
+    failures = metrics.scheduler_job_failures_total.value(job="payment_reminders")
+
+    with pytest.raises(RuntimeError):
+        scheduler.run_job(scheduler.schedule_payment_reminders)
+
+    assert isolated_db.query(OutboxNotification).count() == 0
+    assert metrics.scheduler_job_failures_total.value(job="payment_reminders") == failures + 1
@@ -0,0 +1,96 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.query_budget import track_queries
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.maintenance import MaintenanceRequest, MaintenanceType
+from app.models.payment import Payment, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.services.maintenance import MaintenanceService
+from app.services.payment import PAYMENT_ROWS, PaymentService
+from app.services.property import PROPERTY_ROWS, PropertyService
+from app.services.scoping import AccessScope
+
+@pytest.fixture
+def rentals(isolated_db):
+    """Deux biens d'un même propriétaire, loués chacun par un locataire (le second contrat est résilié)."""
+    owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+    tenants = []
+    for i, status in enumerate((ContractStatus.ACTIVE, ContractStatus.TERMINATED), start=1):
+        tenant = User(email=f"tenant{i}@example.com", hashed_password="x", role=UserRole.TENANT)
+        property = Property(
+            title=f"Bien {i}", type=PropertyType.APARTMENT, address="1 rue du Test", city="Paris",
+            postal_code="75000", country="France", surface_area=30.0, price=800.0, owner=owner
+        )
+        contract = Contract(
+            type=ContractType.RENTAL, status=status, start_date=date(2025, 1, 1),
+            rent_amount=800.0, property=property, tenant=tenant
+        )
+        isolated_db.add_all([
+            Payment(amount=800.0, type=PaymentType.RENT, due_date=date(2025, 2, 5), contract=contract),
+            MaintenanceRequest(
+                title="Fuite", description="Fuite", type=MaintenanceType.REPAIR,
+                request_date=date(2025, 2, 1), property=property, requested_by=tenant
+            ),
+        ])
+        tenants.append(tenant)
+    isolated_db.commit()
+    return owner, tenants
+
+def test_tenant_contract_filter_is_not_dropped(isolated_db, rentals):
+    """Filtrer sur le contrat d'un autre locataire ne renvoie rien (au lieu de tous les paiements)."""
+    _, (first, second) = rentals
+    scope = AccessScope(UserRole.TENANT, first.id)
+    other_contract = second.tenant_contracts[0].id
+
+    foreign = PaymentService.get_payments_page(db=isolated_db, contract_id=other_contract, scope=scope)
+    own = PaymentService.get_payments_page(db=isolated_db, scope=scope)
+
+    assert foreign.items == []
+    assert [payment.contract.tenant_id for payment in own.items] == [first.id]
+
+def test_visibility_by_role(isolated_db, rentals):
+    owner, (first, second) = rentals
+
+    def property_titles(role, user_id):
+        return [p.title for p in PropertyService.get_properties(isolated_db, user_role=role, user_id=user_id)]
+
+    assert property_titles(UserRole.OWNER, owner.id) == ["Bien 1", "Bien 2"]
+    assert property_titles(UserRole.TENANT, first.id) == ["Bien 1"]
+    # Contrat résilié : le bien n'est plus visible, l'historique des demandes l'est
+    assert property_titles(UserRole.TENANT, second.id) == []
+    requests = MaintenanceService.get_maintenance_requests_page(
+        db=isolated_db, scope=AccessScope(UserRole.TENANT, second.id)
+    ).items
+    assert [request.requested_by_id for request in requests] == [second.id]
+    admin = AccessScope(UserRole.ADMIN, owner.id)
+    assert len(MaintenanceService.get_maintenance_requests_page(db=isolated_db, scope=admin).items) == 2
+
+def test_tenant_listing_is_a_single_statement(isolated_db, rentals):
+    _, (first, _) = rentals
+    tenant_id = first.id
+    with track_queries() as reports:
+        PropertyService.get_properties_page(db=isolated_db, user_role=UserRole.TENANT, user_id=tenant_id)
+
+    assert reports[0].count == 1
+    assert "EXISTS" in reports[0].describe()
+
+def test_batch_fetch_separates_missing_and_forbidden_ids(isolated_db, rentals):
+    owner, (first, second) = rentals
+    tenant_id = first.id
+    with track_queries() as reports:
+        batch = AccessScope(UserRole.TENANT, tenant_id).fetch(db=isolated_db, rows=PROPERTY_ROWS, ids=[99, 2, 1, 2])
+
+    assert [row.title for row in batch.rows] == ["Bien 1"]
+    assert batch.forbidden == [2]
+    assert batch.missing == [99]
+    assert reports[0].count == 1
+
+    payments = AccessScope(UserRole.ADMIN, owner.id).fetch(db=isolated_db, rows=PAYMENT_ROWS, ids=[2, 1])
+    assert [row.id for row in payments.rows] == [2, 1]
+    assert payments.forbidden == []
+    with pytest.raises(HTTPException):
+        AccessScope(UserRole.ADMIN, owner.id).fetch(db=isolated_db, rows=PAYMENT_ROWS, ids=[])
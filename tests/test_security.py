@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.security import PasswordHasher, pwd_context
+
+def test_hash_rounds_from_settings():
+    """Le coût bcrypt suit la configuration de l'environnement."""
+    hashed = pwd_context.hash("password123")
+    assert settings.PASSWORD_HASH_ROUNDS == 4
+    assert hashed.split("$")[2] == "04"
+
+def test_hash_and_verify_off_loop():
+    """Le hachage et la vérification s'exécutent dans le pool dédié."""
+    hasher = PasswordHasher(workers=2, queue_limit=4)
+
+    async def scenario():
+        hashed = await hasher.hash("password123")
+        return (
+            await hasher.verify("password123", hashed),
+            await hasher.verify("wrong-password", hashed),
+        )
+
+    try:
+        assert asyncio.run(scenario()) == (True, False)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+def test_queue_limit_applies_backpressure():
+    """Au-delà de la limite de file, une erreur 503 est levée immédiatement."""
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(hasher._submit(release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ServiceUnavailableException) as exc_info:
+            await hasher.hash("password123")
+        release.set()
+        await blocked
+        return exc_info.value
+
+    try:
+        error = asyncio.run(scenario())
+        assert error.status_code == 503
+        assert "Retry-After" in error.headers
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
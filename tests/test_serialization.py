@@ -0,0 +1,266 @@
+import asyncio
+import json
+from datetime import date
+from typing import List
+
+import orjson
+import pytest
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import parse_obj_as
+
+from app.core.database import get_async_db
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.query_budget import track_queries
+from app.core.serialization import Includes
+from app.models.contract import Contract, ContractStatus, ContractType
+from app.models.maintenance import MaintenanceRequest, MaintenanceType
+from app.models.payment import Payment, PaymentType
+from app.models.property import Property, PropertyType
+from app.models.user import User, UserRole
+from app.schemas.user import Principal
+from app.services.auth import AuthService
+from app.services.contract import CONTRACT_ROWS, ContractService
+from app.services.maintenance import MAINTENANCE_ROWS, MaintenanceService
+from app.services.payment import PAYMENT_ROWS, PaymentService
+from app.services.property import PROPERTY_ROWS, PropertyService
+from app.services.scoping import AccessScope
+
+def populate(db) -> None:
+    owner = User(email="owner@example.com", hashed_password="x", role=UserRole.OWNER)
+    tenant = User(email="tenant@example.com", hashed_password="x", role=UserRole.TENANT)
+    for i in range(3):
+        property = Property(
+            title=f"Bien {i}", type=PropertyType.HOUSE, address="1 rue du Test", city="Paris",
+            postal_code="75000", country="France", surface_area=42.5, price=800, owner=owner,
+            has_parking=bool(i % 2)
+        )
+        contract = Contract(
+            type=ContractType.RENTAL, status=ContractStatus.ACTIVE, start_date=date(2025, 1, 1),
+            rent_amount=800.0, property=property, tenant=tenant
+        )
+        db.add_all([
+            Payment(amount=800.0, type=PaymentType.RENT, due_date=date(2025, 2, 5), contract=contract),
+            MaintenanceRequest(
+                title="Fuite", description="Fuite", type=MaintenanceType.REPAIR,
+                request_date=date(2025, 2, 1), property=property, requested_by=tenant
+            ),
+        ])
+    db.commit()
+
+@pytest.mark.parametrize("page, rows", [
+    (PropertyService.get_properties_page, PROPERTY_ROWS),
+    (ContractService.get_contracts_page, CONTRACT_ROWS),
+    (PaymentService.get_payments_page, PAYMENT_ROWS),
+    (MaintenanceService.get_maintenance_requests_page, MAINTENANCE_ROWS),
+])
+def test_fast_path_matches_response_model(isolated_db, page, rows):
+    """Les lignes projetées encodées par orjson donnent le même JSON que la validation Pydantic."""
+    populate(isolated_db)
+
+    objects = page(db=isolated_db, limit=2).items
+    projected = page(db=isolated_db, limit=2, columns=rows.columns)
+
+    expected = jsonable_encoder(parse_obj_as(List[rows.schema], objects))
+    assert json.loads(orjson.dumps(rows.to_dicts(projected.items))) == expected
+    assert projected.next_cursor is not None
+
+def test_list_endpoint_keeps_pagination_headers(async_session_factory):
+    from app.main import app
+
+    async def seed():
+        async with async_session_factory() as db:
+            await db.run_sync(populate)
+
+    asyncio.run(seed())
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=1, email="owner@example.com", role=UserRole.OWNER, is_active=True
+    )
+    try:
+        response = TestClient(app).get(
+            "/api/v1/properties/", params={"limit": 2, "sort": "price", "include_total": True}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()] == ["Bien 0", "Bien 1"]
+    assert response.json()[1]["has_parking"] is True
+    assert response.headers[TOTAL_COUNT_HEADER] == "3"
+    assert NEXT_CURSOR_HEADER in response.headers
+
+def test_fields_are_validated_and_ordered_like_the_schema():
+    rows = PROPERTY_ROWS.select("price, id,title")
+
+    assert rows.fields == ("title", "price", "id")
+    assert PROPERTY_ROWS.select(None) is PROPERTY_ROWS
+    with pytest.raises(HTTPException) as error:
+        PROPERTY_ROWS.select("id,hashed_password")
+    assert error.value.status_code == 400
+
+def test_sparse_page_reads_only_requested_columns(isolated_db):
+    """La clé de tri et l'id sont lus pour le curseur, mais absents de la réponse."""
+    populate(isolated_db)
+    rows = PROPERTY_ROWS.select("title")
+    with track_queries() as reports:
+        first = PropertyService.get_properties_page(db=isolated_db, limit=2, sort="price", columns=rows.columns)
+        second = PropertyService.get_properties_page(
+            db=isolated_db, limit=2, sort="price", cursor=first.next_cursor, columns=rows.columns
+        )
+
+    assert rows.to_dicts(first.items) == [{"title": "Bien 0"}, {"title": "Bien 1"}]
+    assert rows.to_dicts(second.items) == [{"title": "Bien 2"}]
+    assert all("description" not in shape for shape in reports[0].shapes)
+
+def test_read_endpoints_accept_fields(async_session_factory):
+    from app.main import app
+
+    async def seed():
+        async with async_session_factory() as db:
+            await db.run_sync(populate)
+
+    asyncio.run(seed())
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=1, email="owner@example.com", role=UserRole.OWNER, is_active=True
+    )
+    client = TestClient(app)
+    try:
+        single = client.get("/api/v1/properties/2", params={"fields": "title,price"})
+        export = client.get("/api/v1/properties/export", params={"fields": "id,city"})
+        unknown = client.get("/api/v1/contracts/", params={"fields": "secret"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert single.json() == {"title": "Bien 1", "price": 800.0}
+    assert export.text.splitlines() == ["city,id", "Paris,1", "Paris,2", "Paris,3"]
+    assert unknown.status_code == 400
+
+def test_includes_cost_one_query_per_relation(isolated_db):
+    from app.api.v1.endpoints.contracts import CONTRACT_RELATIONS
+
+    populate(isolated_db)
+    includes = Includes(CONTRACT_RELATIONS, "property,tenant,payments")
+    rows = CONTRACT_ROWS.select("id", extra=includes.keys)
+    page = ContractService.get_contracts_page(db=isolated_db, columns=rows.columns)
+    with track_queries() as reports:
+        includes.load(db=isolated_db, rows=page.items, scope=AccessScope())
+    items = includes.embed(page.items, rows.to_dicts(page.items))
+
+    assert reports[0].count == 3
+    assert [item["property"]["title"] for item in items] == ["Bien 0", "Bien 1", "Bien 2"]
+    assert items[0]["tenant"] == {"id": 2, "full_name": None, "role": UserRole.TENANT}
+    assert [[payment["contract_id"] for payment in item["payments"]] for item in items] == [[1], [2], [3]]
+
+def test_read_endpoints_accept_include(async_session_factory):
+    from app.main import app
+
+    async def seed():
+        async with async_session_factory() as db:
+            await db.run_sync(populate)
+
+    asyncio.run(seed())
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=2, email="tenant@example.com", role=UserRole.TENANT, is_active=True,
+        tenant_contract_ids=[1, 2, 3], tenant_property_ids=[1, 2, 3]
+    )
+    client = TestClient(app)
+    try:
+        payment = client.get("/api/v1/payments/1", params={"fields": "amount", "include": "contract"})
+        requests = client.get("/api/v1/maintenance/", params={"include": "property,requested_by,assigned_to"})
+        unknown = client.get("/api/v1/contracts/1", params={"include": "owner"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert payment.json()["amount"] == 800.0
+    assert payment.json()["contract"]["tenant_id"] == 2
+    assert [item["property"]["id"] for item in requests.json()] == [1, 2, 3]
+    # Les comptes inclus n'exposent ni email ni téléphone
+    assert requests.json()[0]["requested_by"] == {"id": 2, "full_name": None, "role": "tenant"}
+    assert requests.json()[0]["assigned_to"] is None
+    assert unknown.status_code == 400
+
+def test_included_resources_follow_the_reader_scope(async_session_factory):
+    """Une ressource liée que le lecteur ne peut pas lire directement est incluse comme absente."""
+    from app.main import app
+
+    def terminate_first_contract(db) -> None:
+        populate(db)
+        db.get(Contract, 1).status = ContractStatus.TERMINATED
+        db.commit()
+
+    async def seed():
+        async with async_session_factory() as db:
+            await db.run_sync(terminate_first_contract)
+
+    asyncio.run(seed())
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=2, email="tenant@example.com", role=UserRole.TENANT, is_active=True,
+        tenant_contract_ids=[2, 3], tenant_property_ids=[2, 3]
+    )
+    client = TestClient(app)
+    try:
+        direct = client.get("/api/v1/properties/1")
+        contract = client.get("/api/v1/contracts/1", params={"include": "property"})
+        requests = client.get("/api/v1/maintenance/", params={"include": "property"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert direct.status_code == 403
+    assert contract.json()["property"] is None
+    assert [item["property"] and item["property"]["id"] for item in requests.json()] == [None, 2, 3]
+
+def test_batch_endpoint_returns_rows_in_requested_order(async_session_factory):
+    from app.main import app
+
+    async def seed():
+        async with async_session_factory() as db:
+            await db.run_sync(populate)
+
+    asyncio.run(seed())
+
+    async def override_db():
+        async with async_session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[AuthService.get_current_user_async] = lambda: Principal(
+        id=1, email="owner@example.com", role=UserRole.OWNER, is_active=True
+    )
+    try:
+        response = TestClient(app).post(
+            "/api/v1/contracts/batch", params={"fields": "id", "include": "property"},
+            json={"ids": [3, 42, 1]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [3, 1]
+    assert response.json()["items"][0]["property"]["title"] == "Bien 2"
+    assert response.json()["missing"] == [42]
+    assert response.json()["forbidden"] == []